@@ -70,7 +70,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'src.infrastructure.middleware.security_headers.SecurityHeadersMiddleware',
-    'src.infrastructure.middleware.security_headers.XSSProtectionMiddleware',
+    'src.infrastructure.middleware.xss_protection.XSSProtectionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Static files en producción
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,6 +85,13 @@ MIDDLEWARE = [
     'axes.middleware.AxesMiddleware',
 ]
 
+# Latencia por capa de middleware (src/infrastructure/middleware/timing.py)
+MIDDLEWARE_TIMING_ENABLED = config('MIDDLEWARE_TIMING_ENABLED', default=False, cast=bool)
+MIDDLEWARE_TIMING_PUBLISH_INTERVAL = config('MIDDLEWARE_TIMING_PUBLISH_INTERVAL', default=10, cast=int)
+if MIDDLEWARE_TIMING_ENABLED:
+    from src.infrastructure.middleware.timing import instrument
+    MIDDLEWARE = instrument(MIDDLEWARE)
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -146,6 +153,16 @@ else:
         }
     }
 
+# Caché de permisos efectivos (src/infrastructure/security/permission_cache.py)
+PERMISSIONS_CACHE_ENABLED = config('PERMISSIONS_CACHE_ENABLED', default=True, cast=bool)
+PERMISSIONS_CACHE_TIMEOUT = config('PERMISSIONS_CACHE_TIMEOUT', default=300, cast=int)
+# Índice compilado de roles: segundos entre verificaciones de versión (role_index.py)
+ROLE_INDEX_CHECK_INTERVAL = config('ROLE_INDEX_CHECK_INTERVAL', default=5, cast=int)
+# Antigüedad máxima del índice (cambios sin señales: QuerySet.update, SQL directo)
+ROLE_INDEX_MAX_AGE = config('ROLE_INDEX_MAX_AGE', default=60, cast=int)
+# Snapshot de upeu_rol_permiso/upeu_permiso en permissions_service.py (segundos)
+PERMISSION_TABLES_SNAPSHOT_TTL = config('PERMISSION_TABLES_SNAPSHOT_TTL', default=300, cast=int)
+
 # Celery (asynchronous tasks)
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=config('REDIS_URL', default='redis://localhost:6379/0'))
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=CELERY_BROKER_URL)
@@ -219,8 +236,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        # Mismo motor de ventana deslizante que RateLimitMiddleware
+        'src.infrastructure.security.throttling.AnonRateThrottle',
+        'src.infrastructure.security.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',           # Usuarios anónimos
@@ -269,6 +287,55 @@ SIMPLE_JWT = {
 }
 
 # JWT Authentication Settings (configuración ya está en SIMPLE_JWT arriba)
+# Principal ligero desde claims del JWT (src/infrastructure/security/principal.py)
+JWT_CLAIMS_PRINCIPAL = config('JWT_CLAIMS_PRINCIPAL', default=False, cast=bool)
+JWT_USER_STATE_CACHE_TTL = config('JWT_USER_STATE_CACHE_TTL', default=30, cast=int)
+# Escritura diferida de ultimo_acceso (src/infrastructure/security/last_seen.py)
+LAST_SEEN_WRITE_BEHIND = config('LAST_SEEN_WRITE_BEHIND', default=True, cast=bool)
+LAST_SEEN_GRANULARITY = config('LAST_SEEN_GRANULARITY', default=300, cast=int)
+LAST_SEEN_FLUSH_INTERVAL = config('LAST_SEEN_FLUSH_INTERVAL', default=60, cast=int)
+# Filtro en memoria de JTIs en blacklist (src/infrastructure/security/jti_blacklist.py)
+JWT_BLACKLIST_SYNC_INTERVAL = config('JWT_BLACKLIST_SYNC_INTERVAL', default=1, cast=float)
+# Motor de rate limiting (src/infrastructure/security/rate_limiter.py)
+# 'auto' usa Redis (script Lua) si la caché es django_redis; 'local' en memoria
+RATE_LIMIT_BACKEND = config('RATE_LIMIT_BACKEND', default='auto')
+RATE_LIMIT_LOCAL_PRECHECK = config('RATE_LIMIT_LOCAL_PRECHECK', default=False, cast=bool)
+RATE_LIMIT_PRECHECK_SYNC_INTERVAL = config('RATE_LIMIT_PRECHECK_SYNC_INTERVAL', default=1, cast=float)
+# Caché LRU de documentos GraphQL validados (graphql_api/document_cache.py); 0 la desactiva
+GRAPHQL_DOCUMENT_CACHE_SIZE = config('GRAPHQL_DOCUMENT_CACHE_SIZE', default=256, cast=int)
+# Automatic Persisted Queries (graphql_api/persisted_queries.py)
+GRAPHQL_APQ_ENABLED = config('GRAPHQL_APQ_ENABLED', default=True, cast=bool)
+GRAPHQL_APQ_TTL = config('GRAPHQL_APQ_TTL', default=86400, cast=int)  # segundos en la caché compartida
+# Solo ejecutar documentos del manifiesto del frontend (GRAPHQL_APQ_MANIFEST)
+GRAPHQL_APQ_ALLOWLIST_ONLY = config('GRAPHQL_APQ_ALLOWLIST_ONLY', default=False, cast=bool)
+# Manifiesto JSON ({hash: query} o Apollo) leído al iniciar cada proceso; allowlist durable
+GRAPHQL_APQ_MANIFEST = config('GRAPHQL_APQ_MANIFEST', default='')
+# Cache-Control: private, max-age para persisted queries por GET; 0 no añade cabeceras
+GRAPHQL_APQ_GET_MAX_AGE = config('GRAPHQL_APQ_GET_MAX_AGE', default=0, cast=int)
+# Snapshot de estadísticas del dashboard GraphQL (graphql_api/statistics.py); 0 sin caché
+GRAPHQL_STATISTICS_CACHE_TTL = config('GRAPHQL_STATISTICS_CACHE_TTL', default=60, cast=int)
+# Trazas por campo GraphQL: tiempo y SQL por resolver (graphql_api/tracing.py)
+GRAPHQL_TRACING_ENABLED = config('GRAPHQL_TRACING_ENABLED', default=False, cast=bool)
+GRAPHQL_TRACING_TOP_N = config('GRAPHQL_TRACING_TOP_N', default=20, cast=int)  # campos en extensions
+GRAPHQL_TRACING_PUBLISH_INTERVAL = config('GRAPHQL_TRACING_PUBLISH_INTERVAL', default=10, cast=int)
+# Batching: un POST con una lista de operaciones (graphql_api/urls.py)
+GRAPHQL_BATCH_ENABLED = config('GRAPHQL_BATCH_ENABLED', default=True, cast=bool)
+GRAPHQL_BATCH_MAX_OPERATIONS = config('GRAPHQL_BATCH_MAX_OPERATIONS', default=10, cast=int)
+# Coste y profundidad de operaciones GraphQL (graphql_api/cost.py)
+GRAPHQL_MAX_DEPTH = config('GRAPHQL_MAX_DEPTH', default=10, cast=int)  # 0 sin límite
+GRAPHQL_COST_DEFAULT_LIST_SIZE = config('GRAPHQL_COST_DEFAULT_LIST_SIZE', default=20, cast=int)
+# Unidades de rate limiting por operación = ceil(coste / GRAPHQL_COST_PER_RATE_UNIT)
+GRAPHQL_COST_PER_RATE_UNIT = config('GRAPHQL_COST_PER_RATE_UNIT', default=100, cast=int)
+# Coste máximo por operación según rol (claves DEFAULT y ANONYMOUS incluidas)
+GRAPHQL_COST_BUDGETS = {
+    'ADMINISTRADOR': config('GRAPHQL_COST_BUDGET_ADMIN', default=50000, cast=int),
+    'COORDINADOR': 20000,
+    'SECRETARIA': 20000,
+    'SUPERVISOR': 5000,
+    'PRACTICANTE': 5000,
+    'DEFAULT': config('GRAPHQL_COST_BUDGET_DEFAULT', default=5000, cast=int),
+    'ANONYMOUS': config('GRAPHQL_COST_BUDGET_ANONYMOUS', default=1000, cast=int),
+}
 
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
@@ -327,6 +394,11 @@ SECURE_CROSS_ORIGIN_OPENER_POLICY = 'same-origin'
 
 # Configuración de sanitización
 XSS_LOG_ATTEMPTS = config('XSS_LOG_ATTEMPTS', default=True, cast=bool)
+# Detección XSS en requests (src/infrastructure/security/xss_screening.py)
+XSS_PROTECTION_BLOCK = config('XSS_PROTECTION_BLOCK', default=False, cast=bool)
+XSS_SCREEN_JSON_BODY = config('XSS_SCREEN_JSON_BODY', default=False, cast=bool)
+XSS_SCAN_MAX_LENGTH = config('XSS_SCAN_MAX_LENGTH', default=4096, cast=int)
+XSS_SCAN_JSON_MAX_BYTES = config('XSS_SCAN_JSON_MAX_BYTES', default=65536, cast=int)
 
 # Sistema JWT PURO - Desactivado temporalmente
 JWT_PURE_ENABLED = False  # Desactivado para permitir acceso libre
@@ -356,6 +428,13 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = config('MAX_FILE_SIZE', default=5242880, cast=int)
 DATA_UPLOAD_MAX_MEMORY_SIZE = FILE_UPLOAD_MAX_MEMORY_SIZE
 
 # Logging configuration
+# Logger 'security': pipeline asíncrono y muestreo por tipo de evento
+SECURITY_LOG_ASYNC = config('SECURITY_LOG_ASYNC', default=True, cast=bool)
+SECURITY_LOG_JSON = config('SECURITY_LOG_JSON', default=True, cast=bool)
+SECURITY_LOG_SAMPLE_RATES = {
+    'jwt_session_created': config('SECURITY_LOG_SAMPLE_JWT_SESSION', default=0.1, cast=float),
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -376,7 +455,14 @@ LOGGING = {
             'filename': BASE_DIR / 'logs' / 'django.log',
             'formatter': 'verbose',
         },
+        # Escritura asíncrona (cola + hilo escritor) en JSON
+        # (src/infrastructure/security/log_handlers.py)
         'security': {
+            'level': 'WARNING',
+            'class': 'src.infrastructure.security.log_handlers.AsyncSecurityFileHandler',
+            'filename': BASE_DIR / 'logs' / 'security.log',
+            'json_format': SECURITY_LOG_JSON,
+        } if SECURITY_LOG_ASYNC else {
             'level': 'WARNING',
             'class': 'logging.FileHandler',
             'filename': BASE_DIR / 'logs' / 'security.log',
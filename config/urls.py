@@ -162,6 +162,7 @@ urlpatterns = [
     path('api/v1/companies/', include('src.adapters.primary.rest_api.companies.urls')),
     path('api/v1/reports/', include('src.adapters.primary.rest_api.reports.urls')),
     path('api/v1/c4/', include('src.adapters.primary.rest_api.urls.c4_urls')),
+    path('api/v1/diagnostics/', include('src.adapters.primary.rest_api.urls.diagnostics_urls')),
     
     # ========================================================================
     # REST API v2 (ViewSets completos - Fase 3)
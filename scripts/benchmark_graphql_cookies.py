@@ -0,0 +1,88 @@
+"""
+Benchmark de la gestión de cookies JWT en CustomGraphQLView.
+
+Compara, por request, el costo del camino anterior (json.loads del cuerpo de
+la request y de toda la respuesta + búsqueda de tokenAuth/refreshToken/logout
+en el query) contra el canal de tokens (``security/token_channel.py``), que
+no toca la respuesta.
+
+No requiere base de datos. Ejecutar:
+    python scripts/benchmark_graphql_cookies.py --rows 5000 --iterations 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from src.infrastructure.security.token_channel import apply_token_cookies
+
+
+def legacy_cookie_handling(request, response):
+    """Reproduce el parseo que hacía CustomGraphQLView.dispatch."""
+    body = json.loads(request.body.decode('utf-8'))
+    query = (body.get('query') or '').replace('\n', ' ')
+    op_name = body.get('operationName') or ''
+    data = json.loads(response.content.decode('utf-8'))
+    payload = (data or {}).get('data') or {}
+    if 'tokenAuth' in query.lower() or op_name == 'TokenAuth':
+        payload.get('tokenAuth')
+    if 'refreshtoken' in query.lower() or op_name == 'RefreshToken':
+        payload.get('refreshToken')
+    if 'logout' in query.lower() or op_name == 'Logout':
+        pass
+
+
+def build_case(rows):
+    query = 'query { practices { id titulo status empresa { razonSocial } } }'
+    request = RequestFactory().post(
+        '/graphql/', data=json.dumps({'query': query}), content_type='application/json'
+    )
+    items = [
+        {'id': str(i), 'titulo': f'Práctica {i}', 'status': 'ACTIVE',
+         'empresa': {'razonSocial': f'Empresa {i % 50}'}}
+        for i in range(rows)
+    ]
+    content = json.dumps({'data': {'practices': items}}).encode('utf-8')
+    return request, content
+
+
+def measure(fn, request, content, iterations):
+    timings = []
+    for _ in range(iterations):
+        response = HttpResponse(content, content_type='application/json')
+        start = time.perf_counter()
+        fn(request, response)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000, help='Filas en la respuesta simulada')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    request, content = build_case(args.rows)
+    print(f"Respuesta: {len(content) / 1024:.1f} KiB, {args.iterations} iteraciones")
+
+    for label, fn in (('anterior (parseo)', legacy_cookie_handling),
+                      ('canal de tokens', apply_token_cookies)):
+        timings = measure(fn, request, content, args.iterations)
+        print(f"  {label:<18} media={statistics.mean(timings):8.3f} ms  "
+              f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
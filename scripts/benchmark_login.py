@@ -0,0 +1,122 @@
+"""
+Benchmark del login REST: camino anterior vs camino rápido.
+
+Compara, contra la BD configurada, consultas SQL y latencia por login:
+
+- anterior: get(correo__iexact) sin select_related + accesos a user.rol_id
+  + get_or_create de OutstandingToken + save(ultimo_acceso)
+- rápido:   CustomTokenObtainPairSerializer (una consulta usuario+rol+perfiles,
+  INSERT de OutstandingToken y UPDATE de ultimo_acceso en una transacción)
+
+Ejecutar:
+    python scripts/benchmark_login.py --email admin@upeu.edu.pe --password xxx --iterations 50
+
+Cada iteración emite un refresh token real (queda en OutstandingToken).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from src.adapters.primary.rest_api.auth.views import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+def legacy_login(email, password):
+    """Reproduce el flujo de login previo al camino rápido."""
+    user = User.objects.get(correo__iexact=email)
+    if not user.check_password(password) or not user.activo:
+        raise RuntimeError('Credenciales inválidas')
+
+    refresh = RefreshToken.for_user(user)
+    OutstandingToken.objects.get_or_create(
+        jti=refresh['jti'],
+        defaults={
+            'user': user,
+            'token': str(refresh),
+            'expires_at': timezone.datetime.fromtimestamp(refresh['exp']),
+        },
+    )
+    user.ultimo_acceso = timezone.now()
+    user.save(update_fields=['ultimo_acceso'])
+
+    role = user.rol_id.nombre if user.rol_id else 'PRACTICANTE'
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+        'role': role,
+        'is_staff': user.rol_id.nombre in ['ADMINISTRADOR', 'COORDINADOR'] if user.rol_id else False,
+    }
+
+
+def fast_login(email, password):
+    """Camino rápido actual (serializer del endpoint /api/v1/auth/login/)."""
+    serializer = CustomTokenObtainPairSerializer(data={'email': email, 'password': password})
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def run(label, func, email, password, iterations):
+    """Ejecuta el login N veces y retorna (latencias_ms, consultas_por_login)."""
+    # Calentamiento (conexión, índice de roles, caches)
+    func(email, password)
+
+    latencies = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func(email, password)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(ctx.captured_queries))
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"\n{label}")
+    print(f"  • Consultas por login: {statistics.mean(queries):.1f}")
+    print(f"  • Latencia p50: {statistics.median(latencies):.1f} ms")
+    print(f"  • Latencia p95: {p95:.1f} ms")
+    print(f"  • Throughput:   {1000 / statistics.mean(latencies):.1f} logins/s (un hilo)")
+    return latencies, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de login REST')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--iterations', type=int, default=30)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE LOGIN")
+    print("=" * 80)
+
+    legacy = run("📉 Camino anterior", legacy_login, args.email, args.password, args.iterations)
+    fast = run("🚀 Camino rápido", fast_login, args.email, args.password, args.iterations)
+
+    gain = statistics.mean(legacy[0]) / statistics.mean(fast[0])
+    saved = statistics.mean(legacy[1]) - statistics.mean(fast[1])
+    print(f"\n✅ Consultas ahorradas por login: {saved:.1f}")
+    print(f"✅ Mejora de throughput: x{gain:.2f}")
+    print("\nNota: el hash de contraseña (PBKDF2) domina la latencia; la ganancia")
+    print("en consultas se nota más con la BD remota o bajo concurrencia.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Microbenchmark del escáner XSS por request.
+
+Compara (ns/request) los dos escáneres anteriores ejecutados en cadena
+(substring en minúsculas + diez regex por valor) contra el motor de
+``security/xss_screening.py`` (prefiltro + regex anclados en el disparador).
+
+No requiere base de datos. Ejecutar:
+    python scripts/benchmark_xss_screening.py --iterations 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.test import RequestFactory
+
+from src.infrastructure.security.xss_screening import (
+    HEADERS_TO_CHECK,
+    screen_headers,
+    screen_query_params,
+)
+
+LEGACY_SUBSTRINGS = [
+    '<script', '</script>', 'javascript:', 'onload=', 'onerror=',
+    'onclick=', 'onmouseover=', 'onfocus=', 'onblur=', 'eval(',
+    'alert(', 'confirm(', 'prompt('
+]
+LEGACY_REGEXES = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in [
+        r'<script[^>]*>.*?</script>', r'javascript:', r'on\w+\s*=',
+        r'<iframe[^>]*>', r'<object[^>]*>', r'<embed[^>]*>', r'<link[^>]*>',
+        r'<meta[^>]*>', r'vbscript:', r'data:text/html',
+    ]
+]
+
+
+def legacy_screen(request):
+    """Ambos middlewares anteriores sobre la misma request."""
+    found = False
+    for value in request.GET.values():
+        value_lower = value.lower()
+        found |= any(pattern in value_lower for pattern in LEGACY_SUBSTRINGS)
+    for name in HEADERS_TO_CHECK:
+        value = request.META.get(name, '')
+        if value:
+            found |= any(pattern.search(value) for pattern in LEGACY_REGEXES)
+    for value in request.GET.values():
+        found |= any(pattern.search(value) for pattern in LEGACY_REGEXES)
+    return found
+
+
+def single_pass_screen(request):
+    return bool(screen_headers(request)) or bool(screen_query_params(request))
+
+
+def build_requests():
+    factory = RequestFactory()
+    headers = {
+        'HTTP_USER_AGENT': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+        'HTTP_ACCEPT': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'HTTP_ACCEPT_LANGUAGE': 'es-PE,es;q=0.9,en;q=0.8',
+        'HTTP_ACCEPT_ENCODING': 'gzip, deflate, br',
+        'HTTP_REFERER': 'https://practicas.upeu.edu.pe/dashboard/',
+    }
+    clean = factory.get('/api/v2/practices/', {
+        'page': '3', 'search': 'ingeniería de sistemas', 'ordering': '-fecha_inicio', 'status': 'ACTIVE',
+    }, **headers)
+    hostile = factory.get('/api/v2/practices/', {
+        'page': '1', 'search': '"><img src=x onerror=alert(1)>',
+    }, **headers)
+    return {'limpia': clean, 'maliciosa': hostile}
+
+
+def measure(fn, request, iterations):
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn(request)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    for label, request in build_requests().items():
+        legacy = measure(legacy_screen, request, args.iterations)
+        single = measure(single_pass_screen, request, args.iterations)
+        print(f"Request {label:<10} anterior={legacy:9.0f} ns  motor nuevo={single:9.0f} ns  "
+              f"({legacy / single:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Análisis estático de coste y profundidad de operaciones GraphQL.
+
+Se ejecuta sobre el documento ya validado, antes de resolver nada:
+
+- cada campo de tipo objeto cuesta 1 (los escalares no cuestan)
+- un campo con argumento de tamaño (``pageSize``, ``limit``, ``first``,
+  ``last``) multiplica el coste de todo lo que hay debajo por su valor (o
+  por el default del argumento); la primera lista interna (``items``,
+  ``edges``) ya no vuelve a multiplicar
+- una lista sin argumento de tamaño multiplica por
+  ``GRAPHQL_COST_DEFAULT_LIST_SIZE``
+- la introspección (``__schema``, ``__type``, ``__typename``) es gratuita
+
+Así ``users(pageSize: 500) { items { practicas { ... } } }`` cuesta
+500 veces lo que cuesta un usuario con sus prácticas.
+
+``CustomGraphQLView`` rechaza las operaciones que superan
+``GRAPHQL_MAX_DEPTH`` o el presupuesto del rol (``GRAPHQL_COST_BUDGETS``),
+devuelve el coste en ``extensions.cost`` y lo cobra al rate limiter en
+unidades de ``GRAPHQL_COST_PER_RATE_UNIT``.
+"""
+
+import math
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from graphql import (
+    FieldNode, FragmentDefinitionNode, FragmentSpreadNode, GraphQLError, GraphQLList,
+    GraphQLNonNull, InlineFragmentNode, IntValueNode, VariableNode, get_named_type,
+    is_composite_type,
+)
+from graphql.pyutils import Undefined
+
+from src.infrastructure.security.permission_helpers import get_user_role
+
+SIZE_ARGUMENTS = ('pageSize', 'limit', 'first', 'last')
+
+TOO_DEEP = 'QUERY_TOO_DEEP'
+COST_EXCEEDED = 'QUERY_COST_EXCEEDED'
+RATE_LIMITED = 'RATE_LIMITED'
+
+DEFAULT_BUDGETS = {
+    'ADMINISTRADOR': 50000,
+    'COORDINADOR': 20000,
+    'SECRETARIA': 20000,
+    'SUPERVISOR': 5000,
+    'PRACTICANTE': 5000,
+    'DEFAULT': 5000,
+    'ANONYMOUS': 1000,
+}
+
+
+class QueryCost(NamedTuple):
+    """Coste estimado y profundidad máxima de una operación."""
+    cost: int
+    depth: int
+
+
+def _is_list(gql_type) -> bool:
+    while isinstance(gql_type, GraphQLNonNull):
+        gql_type = gql_type.of_type
+    return isinstance(gql_type, GraphQLList)
+
+
+def _size_argument(field_node: FieldNode, gql_field, variables) -> Optional[int]:
+    """Valor del argumento de tamaño del campo (literal o variable; si no, default)."""
+    values = {argument.name.value: argument.value for argument in field_node.arguments or ()}
+    names = [name for name in SIZE_ARGUMENTS if name in gql_field.args]
+    candidates = []
+    for name in names:
+        node = values.get(name)
+        if isinstance(node, IntValueNode):
+            candidates.append(int(node.value))
+        elif isinstance(node, VariableNode):
+            candidates.append((variables or {}).get(node.name.value))
+    # Sin tamaño explícito: default del primer argumento que lo tenga
+    candidates.extend(gql_field.args[name].default_value for name in names)
+    for value in candidates:
+        if value is not None and value is not Undefined:
+            try:
+                # Igual que pagination.paginate: un tamaño <= 0 pide 1 fila,
+                # así que no puede abaratar (anular) el subárbol
+                return max(int(value), 1)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class _Analyzer:
+    def __init__(self, schema, fragments, variables, default_list_size):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+        self.default_list_size = default_list_size
+
+    def selection_cost(self, parent_type, selection_set, depth, sized, visited=frozenset()):
+        """(coste, profundidad) de un selection set sobre ``parent_type``."""
+        cost = 0
+        max_depth = depth
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_cost, field_depth = self.field_cost(parent_type, selection, depth + 1, sized)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value) or parent_type
+                field_cost, field_depth = self.selection_cost(
+                    fragment_type, selection.selection_set, depth, sized, visited
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited:
+                    continue
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value) or parent_type
+                field_cost, field_depth = self.selection_cost(
+                    fragment_type, fragment.selection_set, depth, sized, visited | {name}
+                )
+            else:
+                continue
+            cost += field_cost
+            max_depth = max(max_depth, field_depth)
+        return cost, max_depth
+
+    def field_cost(self, parent_type, node: FieldNode, depth, sized):
+        name = node.name.value
+        if name.startswith('__'):
+            return 0, depth - 1
+        gql_field = getattr(parent_type, 'fields', {}).get(name)
+        if gql_field is None:
+            return 0, depth
+        named_type = get_named_type(gql_field.type)
+        if not is_composite_type(named_type) or node.selection_set is None:
+            return 0, depth
+
+        size = _size_argument(node, gql_field, self.variables)
+        if size is not None:
+            multiplier, child_sized = size, True
+        elif _is_list(gql_field.type):
+            multiplier, child_sized = (1 if sized else self.default_list_size), False
+        else:
+            multiplier, child_sized = 1, sized
+
+        children, child_depth = self.selection_cost(named_type, node.selection_set, depth, child_sized)
+        return multiplier * (1 + children), child_depth
+
+
+def analyze(schema, document, operation, variables=None) -> QueryCost:
+    """
+    Calcula coste y profundidad de ``operation`` (OperationDefinitionNode).
+
+    Args:
+        schema: GraphQLSchema
+        document: DocumentNode validado (para resolver fragments)
+        operation: operación seleccionada del documento
+        variables: variables de la request
+    """
+    root_type = schema.get_root_type(operation.operation)
+    if root_type is None:
+        return QueryCost(0, 0)
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    analyzer = _Analyzer(
+        schema, fragments, variables,
+        int(getattr(settings, 'GRAPHQL_COST_DEFAULT_LIST_SIZE', 20)),
+    )
+    cost, depth = analyzer.selection_cost(root_type, operation.selection_set, 0, False)
+    return QueryCost(cost, depth)
+
+
+# ============================================================================
+# LÍMITES
+# ============================================================================
+
+def max_depth() -> int:
+    return int(getattr(settings, 'GRAPHQL_MAX_DEPTH', 10))
+
+
+def budget_for(user) -> int:
+    """Coste máximo por operación para el rol del usuario."""
+    budgets = {**DEFAULT_BUDGETS, **getattr(settings, 'GRAPHQL_COST_BUDGETS', {})}
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return budgets['ANONYMOUS']
+    return budgets.get(get_user_role(user) or 'DEFAULT', budgets['DEFAULT'])
+
+
+def rate_units(cost: int) -> int:
+    """Unidades de rate limiting que consume una operación (mínimo 1)."""
+    per_unit = int(getattr(settings, 'GRAPHQL_COST_PER_RATE_UNIT', 100))
+    if per_unit <= 0:
+        return 1
+    return max(1, math.ceil(cost / per_unit))
+
+
+def check(query_cost: QueryCost, budget: int) -> Optional[GraphQLError]:
+    """Error GraphQL si la operación excede profundidad o presupuesto."""
+    limit = max_depth()
+    if limit and query_cost.depth > limit:
+        return GraphQLError(
+            f'La consulta excede la profundidad máxima ({query_cost.depth} > {limit})',
+            extensions={'code': TOO_DEEP},
+        )
+    if query_cost.cost > budget:
+        return GraphQLError(
+            f'La consulta excede el coste máximo permitido ({query_cost.cost} > {budget})',
+            extensions={'code': COST_EXCEEDED},
+        )
+    return None
+
+
+def cost_extensions(query_cost: QueryCost, budget: int, units: int) -> dict:
+    """Bloque ``extensions.cost`` de la respuesta."""
+    return {
+        'requestedQueryCost': query_cost.cost,
+        'maximumAvailable': budget,
+        'depth': query_cost.depth,
+        'maxDepth': max_depth(),
+        'rateLimitUnits': units,
+    }
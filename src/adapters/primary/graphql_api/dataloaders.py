@@ -0,0 +1,289 @@
+"""
+DataLoaders por request para los resolvers GraphQL.
+
+La ejecución de graphene en la vista es síncrona y recorre las listas en
+profundidad (todos los campos del elemento 1, luego los del elemento 2...),
+así que no hay un "tick" en el que acumular claves. El batching se hace con
+hermanos:
+
+1. ``BatchingExecutionContext`` registra cada lista de objetos que completa
+   (o los ``node`` de una conexión relay) como grupo de hermanos.
+2. El primer ``loader.load(key, parent=obj)`` que no está en memo calcula la
+   clave de todos los hermanos de ``obj`` y las resuelve en una sola query.
+3. Los objetos devueltos por un batch forman a su vez un grupo de hermanos,
+   de modo que ``practices { student { user { ... } } }`` cuesta una query
+   por nivel y no una por práctica.
+
+Los loaders viven en ``request._graphql_loaders`` (el contexto de graphene es
+la request de Django). Sin contexto, o ejecutando el schema sin este
+ExecutionContext, los loaders siguen funcionando con memo pero sin hermanos.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from django.db.models import Count, Model
+from graphql import ExecutionContext
+from graphql.pyutils import is_iterable
+
+from src.adapters.secondary.database.models import (
+    User, Role, Permission, UserPermission, Company, Practice,
+    StudentProfile, SupervisorProfile,
+)
+
+_REQUEST_ATTR = '_graphql_loaders'
+
+BatchFn = Callable[[List[Hashable]], Dict[Hashable, Any]]
+
+
+class DataLoader:
+    """
+    Loader síncrono con memo por request.
+
+    Args:
+        registry: ``Loaders`` propietario (grupos de hermanos)
+        batch_fn: Recibe una lista de claves y devuelve {clave: valor}
+        key_of: Calcula la clave de un objeto padre (para los hermanos)
+        many: Las claves sin resultado valen ``[]`` en lugar de None
+    """
+
+    def __init__(self, registry: 'Loaders', batch_fn: BatchFn,
+                 key_of: Optional[Callable[[Any], Hashable]] = None, many: bool = False):
+        self.registry = registry
+        self.batch_fn = batch_fn
+        self.key_of = key_of
+        self.many = many
+        self._memo: Dict[Hashable, Any] = {}
+        self.batches = 0
+
+    def _missing(self):
+        return [] if self.many else None
+
+    def load(self, key: Hashable, parent: Any = None) -> Any:
+        """Valor de ``key``; si falta, se resuelve junto con los hermanos de ``parent``."""
+        if key is None:
+            return self._missing()
+        if key in self._memo:
+            return self._memo[key]
+
+        keys = [key]
+        if parent is not None and self.key_of is not None:
+            seen = {key}
+            for sibling in self.registry.siblings_of(parent):
+                sibling_key = self.key_of(sibling)
+                if sibling_key is not None and sibling_key not in seen and sibling_key not in self._memo:
+                    seen.add(sibling_key)
+                    keys.append(sibling_key)
+        self._dispatch(keys)
+        return self._memo[key]
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Valores de varias claves (en orden) con un único batch para las que faltan."""
+        keys = [key for key in keys if key is not None]
+        pending = list(dict.fromkeys(key for key in keys if key not in self._memo))
+        if pending:
+            self._dispatch(pending)
+        return [self._memo[key] for key in keys]
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Guarda un valor ya conocido (no sobrescribe el memo)."""
+        if key is not None:
+            self._memo.setdefault(key, value)
+
+    def _dispatch(self, keys: List[Hashable]) -> None:
+        self.batches += 1
+        results = self.batch_fn(keys)
+        loaded = []
+        for key in keys:
+            value = results.get(key, self._missing())
+            self._memo[key] = value
+            if self.many:
+                loaded.extend(value)
+            elif value is not None:
+                loaded.append(value)
+        self.registry.register_siblings(loaded)
+
+
+def _group_by(objects: Iterable[Any], attr: str) -> Dict[Hashable, List[Any]]:
+    grouped = defaultdict(list)
+    for obj in objects:
+        grouped[getattr(obj, attr)].append(obj)
+    return grouped
+
+
+def cached_related(instance: Model, field_name: str) -> Any:
+    """Objeto relacionado si Django ya lo tiene cargado (select_related), si no None."""
+    field = instance._meta.get_field(field_name)
+    return field.get_cached_value(instance) if field.is_cached(instance) else None
+
+
+class Loaders:
+    """Loaders de una request y grupos de hermanos de la ejecución."""
+
+    def __init__(self):
+        self._siblings: Dict[int, tuple] = {}
+
+        # Entidades por id
+        self.roles = DataLoader(self, self._load_roles, key_of=lambda user: user.rol_id_id)
+        self.users = DataLoader(self, self._load_users, key_of=lambda profile: profile.usuario_id)
+        self.students = DataLoader(self, self._load_students, key_of=lambda practice: practice.practicante_id)
+        self.companies = DataLoader(self, self._load_companies, key_of=lambda practice: practice.empresa_id)
+
+        # Roles y permisos
+        self.roles_by_code = DataLoader(self, self._load_roles_by_code)
+        self.users_count_by_role = DataLoader(self, self._load_users_count_by_role, key_of=lambda role: role.pk)
+        self.permissions_by_code = DataLoader(self, self._load_permissions_by_code)
+        self.permissions_by_role = DataLoader(
+            self, self._load_permissions_by_role, key_of=_role_key, many=True
+        )
+        self.custom_permissions_by_user = DataLoader(
+            self, self._load_custom_permissions_by_user, key_of=lambda user: user.pk, many=True
+        )
+
+        # Perfiles por usuario
+        self.student_profiles = DataLoader(self, self._load_student_profiles, key_of=lambda user: user.pk)
+        self.supervisor_profiles = DataLoader(self, self._load_supervisor_profiles, key_of=lambda user: user.pk)
+
+        # Prácticas por estudiante / empresa / supervisor
+        self.practices_by_student = DataLoader(
+            self, self._load_practices_by('practicante_id'), key_of=lambda student: student.pk, many=True
+        )
+        self.practices_by_company = DataLoader(
+            self, self._load_practices_by('empresa_id'), key_of=lambda company: company.pk, many=True
+        )
+        self.practices_by_supervisor = DataLoader(
+            self, self._load_practices_by('supervisor_id'), key_of=lambda supervisor: supervisor.pk, many=True
+        )
+
+    # ---- Hermanos ----
+
+    def register_siblings(self, objects: List[Any]) -> None:
+        """Registra ``objects`` como grupo de hermanos (solo instancias de modelos)."""
+        if len(objects) < 2 or not isinstance(objects[0], Model):
+            return
+        group = tuple(objects)
+        for obj in group:
+            self._siblings[id(obj)] = group
+
+    def siblings_of(self, obj: Any) -> tuple:
+        return self._siblings.get(id(obj), ())
+
+    # ---- Batch functions ----
+
+    @staticmethod
+    def _load_roles(keys):
+        return Role.objects.in_bulk(keys)
+
+    @staticmethod
+    def _load_users(keys):
+        return User.objects.in_bulk(keys)
+
+    @staticmethod
+    def _load_students(keys):
+        return StudentProfile.objects.in_bulk(keys)
+
+    @staticmethod
+    def _load_companies(keys):
+        return Company.objects.in_bulk(keys)
+
+    def _load_roles_by_code(self, keys):
+        roles = {role.nombre: role for role in Role.objects.filter(nombre__in=keys)}
+        for role in roles.values():
+            self.roles.prime(role.pk, role)
+        return roles
+
+    @staticmethod
+    def _load_users_count_by_role(keys):
+        rows = (
+            User.objects.filter(rol_id__in=keys, activo=True)
+            .values('rol_id')
+            .annotate(total=Count('id'))
+        )
+        counts = {row['rol_id']: row['total'] for row in rows}
+        return {key: counts.get(key, 0) for key in keys}
+
+    @staticmethod
+    def _load_permissions_by_code(keys):
+        return {
+            permission.codigo: permission
+            for permission in Permission.objects.filter(codigo__in=keys, is_active=True)
+        }
+
+    def _load_permissions_by_role(self, keys):
+        codes_by_role = {
+            role.pk: role.get_permissions_codes()
+            for role in self.roles.load_many(keys) if role is not None
+        }
+        if any('all' in codes for codes in codes_by_role.values()):
+            everything = list(Permission.objects.filter(is_active=True).order_by('module', 'codigo'))
+            for permission in everything:
+                self.permissions_by_code.prime(permission.codigo, permission)
+        else:
+            everything = []
+
+        all_codes = {code for codes in codes_by_role.values() for code in codes if code != 'all'}
+        self.permissions_by_code.load_many(all_codes)
+
+        result = {}
+        for role_id, codes in codes_by_role.items():
+            if 'all' in codes:
+                result[role_id] = everything
+            else:
+                permissions = self.permissions_by_code.load_many(codes)
+                result[role_id] = [permission for permission in permissions if permission is not None]
+        return result
+
+    @staticmethod
+    def _load_custom_permissions_by_user(keys):
+        queryset = UserPermission.objects.filter(
+            usuario_id__in=keys, permiso__is_active=True
+        ).select_related('permiso')
+        return _group_by(queryset, 'usuario_id')
+
+    @staticmethod
+    def _load_student_profiles(keys):
+        return {profile.usuario_id: profile for profile in StudentProfile.objects.filter(usuario_id__in=keys)}
+
+    @staticmethod
+    def _load_supervisor_profiles(keys):
+        return {profile.usuario_id: profile for profile in SupervisorProfile.objects.filter(usuario_id__in=keys)}
+
+    @staticmethod
+    def _load_practices_by(column):
+        def batch(keys):
+            return _group_by(Practice.objects.filter(**{f'{column}__in': keys}), column)
+        return batch
+
+
+def _role_key(obj):
+    """Clave de rol para un padre que puede ser un Role o un User."""
+    if isinstance(obj, Role):
+        return obj.pk
+    return getattr(obj, 'rol_id_id', None)
+
+
+def get_loaders(context) -> Loaders:
+    """Loaders de la request (se crean en el primer uso)."""
+    if context is None:
+        return Loaders()
+    request = getattr(context, '_request', context)
+    loaders = getattr(request, _REQUEST_ATTR, None)
+    if loaders is None:
+        loaders = Loaders()
+        try:
+            setattr(request, _REQUEST_ATTR, loaders)
+        except AttributeError:
+            pass
+    return loaders
+
+
+class BatchingExecutionContext(ExecutionContext):
+    """Registra las listas completadas como grupos de hermanos para los loaders."""
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        if is_iterable(result):
+            result = list(result)
+            if result:
+                items = [getattr(item, 'node', item) for item in result]
+                get_loaders(self.context_value).register_siblings(items)
+        return super().complete_list_value(return_type, field_nodes, info, path, result)
@@ -0,0 +1,127 @@
+"""
+Caché LRU de documentos GraphQL ya parseados y validados.
+
+El frontend envía siempre las mismas operaciones; ``CustomGraphQLView``
+guarda aquí el ``DocumentNode`` de cada query que pasa la validación para
+ejecutar directamente en las siguientes requests.
+
+La clave combina:
+
+- la versión del schema (hash del SDL, calculado una vez por objeto schema)
+- las reglas de validación de la vista
+- el hash SHA-256 del texto de la query
+
+Si el schema se reconstruye (recarga en DEBUG, tests) cambia el objeto y,
+si cambió el SDL, también la versión: las entradas antiguas dejan de
+coincidir y salen por LRU. Solo se guardan documentos válidos.
+
+La caché es por proceso; ``stats()`` expone hits/misses/evictions.
+"""
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from django.conf import settings
+from graphql import DocumentNode, GraphQLSchema, print_schema
+
+DEFAULT_MAX_SIZE = 256
+
+_schema_versions: 'weakref.WeakKeyDictionary[GraphQLSchema, str]' = weakref.WeakKeyDictionary()
+_versions_lock = threading.Lock()
+
+
+def schema_version(schema: GraphQLSchema) -> str:
+    """Hash corto del SDL del schema (memorizado por objeto schema)."""
+    version = _schema_versions.get(schema)
+    if version is None:
+        with _versions_lock:
+            version = _schema_versions.get(schema)
+            if version is None:
+                version = hashlib.sha256(print_schema(schema).encode('utf-8')).hexdigest()[:16]
+                _schema_versions[schema] = version
+    return version
+
+
+def _rules_key(validation_rules) -> str:
+    if not validation_rules:
+        return 'default'
+    return ','.join(f"{rule.__module__}.{rule.__qualname__}" for rule in validation_rules)
+
+
+def document_key(schema: GraphQLSchema, query: str, validation_rules=None) -> Tuple[str, str, str]:
+    """Clave (versión de schema, reglas, hash de la query)."""
+    return (
+        schema_version(schema),
+        _rules_key(validation_rules),
+        hashlib.sha256(query.encode('utf-8')).hexdigest(),
+    )
+
+
+class DocumentCache:
+    """LRU acotada y thread-safe de ``DocumentNode`` validados."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[tuple, DocumentNode]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key) -> Optional[DocumentNode]:
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def put(self, key, document: DocumentNode) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache: Optional[DocumentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Caché del proceso (tamaño desde ``GRAPHQL_DOCUMENT_CACHE_SIZE``)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DocumentCache(int(getattr(settings, 'GRAPHQL_DOCUMENT_CACHE_SIZE', DEFAULT_MAX_SIZE)))
+    return _cache
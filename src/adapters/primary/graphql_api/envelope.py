@@ -0,0 +1,239 @@
+"""
+Envelope GraphQL compartido por request.
+
+El cuerpo de una petición GraphQL se decodifica una sola vez y queda cacheado
+en ``request._graphql_envelope``. Lo consumen:
+
+- ``RateLimitMiddleware`` (detección de login para el bucket 'login')
+- ``CustomGraphQLView`` (parse_body de graphene y gestión de cookies)
+
+El documento GraphQL (AST) se parsea de forma perezosa solo si alguien pide
+``operation_type`` o ``root_fields``; los campos raíz se resuelven a través
+de fragment spreads y fragmentos inline. Las requests que solo envían el hash de
+una persisted query (APQ) exponen en ``query`` el texto registrado.
+"""
+
+import json
+from typing import Optional, Tuple
+
+from graphql import (
+    FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode,
+    OperationType, parse,
+)
+from graphql.error import GraphQLSyntaxError
+from graphql.utilities import get_operation_ast
+
+from .persisted_queries import peek_query
+
+_REQUEST_ATTR = '_graphql_envelope'
+
+# Campos raíz / operationName que cuentan como login para el rate limiting
+LOGIN_ROOT_FIELDS = frozenset({'jwtLogin', 'tokenAuth'})
+LOGIN_OPERATION_NAMES = frozenset({'JWTLogin', 'JwtLogin', 'TokenAuth', 'Login'})
+
+_UNSET = object()
+
+
+def collect_root_fields(document, operation) -> Tuple[str, ...]:
+    """
+    Nombres de los campos raíz de ``operation``, expandiendo los fragment
+    spreads (con las definiciones de ``document``) y los fragmentos inline.
+    """
+    fragments = {
+        definition.name.value: definition
+        for definition in getattr(document, 'definitions', ())
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    fields = []
+    visited = set()
+
+    def walk(selection_set):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                fields.append(selection.name.value)
+            elif isinstance(selection, InlineFragmentNode):
+                walk(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = fragments.get(name)
+                if fragment is not None and name not in visited:
+                    # Un ciclo de fragmentos es inválido; aquí solo se evita recursión infinita
+                    visited.add(name)
+                    walk(fragment.selection_set)
+
+    walk(operation.selection_set)
+    return tuple(fields)
+
+
+def _mentions_login(query) -> bool:
+    return isinstance(query, str) and any(name in query for name in LOGIN_ROOT_FIELDS)
+
+
+class GraphQLEnvelope:
+    """Vista de solo lectura del cuerpo GraphQL de una request."""
+
+    def __init__(self, request):
+        self._request = request
+        self._data = _UNSET
+        self._document = _UNSET
+        self._operation = _UNSET
+        self._query = _UNSET
+        self.error: Optional[str] = None
+
+    # ---- Cuerpo ----
+
+    @property
+    def content_type(self) -> str:
+        return (self._request.META.get('CONTENT_TYPE') or '').split(';')[0].strip().lower()
+
+    @property
+    def raw_body(self) -> bytes:
+        if self._request.method != 'POST':
+            return b''
+        try:
+            return self._request.body or b''
+        except Exception:
+            return b''
+
+    @property
+    def data(self):
+        """Cuerpo decodificado: dict, lista (batch) o None si es inválido."""
+        if self._data is _UNSET:
+            self._data = self._decode()
+        return self._data
+
+    def _decode(self):
+        request = self._request
+        if request.method == 'GET':
+            return request.GET
+
+        content_type = self.content_type
+        if content_type == 'application/graphql':
+            return {'query': self.raw_body.decode('utf-8', errors='replace')}
+
+        if content_type == 'application/json':
+            try:
+                return json.loads(self.raw_body.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError) as exc:
+                self.error = str(exc)
+                return None
+
+        if content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            return request.POST
+
+        return {}
+
+    @property
+    def is_batch(self) -> bool:
+        return isinstance(self.data, list)
+
+    def _get(self, key):
+        data = self.data
+        if not isinstance(data, dict):
+            # Batch, cuerpo inválido o un escalar JSON (``123``, ``"x"``)
+            return None
+        return self._request.GET.get(key) or data.get(key)
+
+    @property
+    def query(self) -> Optional[str]:
+        """Texto de la query (o el registrado para su hash APQ)."""
+        if self._query is _UNSET:
+            query = self._get('query')
+            if not query and not self.is_batch:
+                query = peek_query(self.data)
+            self._query = query
+        return self._query
+
+    @property
+    def operation_name(self) -> Optional[str]:
+        name = self._get('operationName')
+        return None if name == 'null' else name
+
+    # ---- Documento (perezoso) ----
+
+    @property
+    def document(self):
+        """AST del query o None si no hay query / error de sintaxis."""
+        if self._document is _UNSET:
+            query = self.query
+            try:
+                self._document = parse(query, no_location=True) if query else None
+            except GraphQLSyntaxError:
+                self._document = None
+        return self._document
+
+    @property
+    def operation(self):
+        if self._operation is _UNSET:
+            document = self.document
+            self._operation = get_operation_ast(document, self.operation_name) if document else None
+        return self._operation
+
+    @property
+    def operation_type(self) -> Optional[str]:
+        """'query', 'mutation', 'subscription' o None."""
+        operation = self.operation
+        return operation.operation.value if operation is not None else None
+
+    @property
+    def is_mutation(self) -> bool:
+        operation = self.operation
+        return operation is not None and operation.operation == OperationType.MUTATION
+
+    @property
+    def root_fields(self) -> Tuple[str, ...]:
+        """Nombres de los campos raíz de la operación seleccionada."""
+        operation = self.operation
+        if operation is None:
+            return ()
+        return collect_root_fields(self.document, operation)
+
+    # ---- Detección de login ----
+
+    @property
+    def is_login(self) -> bool:
+        """
+        True si la operación es un login (en un batch, si alguna lo es).
+
+        Busca los campos de login sobre el query completo ya decodificado
+        (el escape JSON o el percent-encoding ocultarían el nombre en los
+        bytes crudos) y solo parsea si aparece alguno. El cuerpo decodificado
+        queda cacheado para la vista, así que no se decodifica dos veces.
+        """
+        if self.is_batch:
+            return any(_entry_is_login(entry) for entry in self.data)
+
+        if self.operation_name in LOGIN_OPERATION_NAMES:
+            return True
+        if not _mentions_login(self.query):
+            return False
+        return bool(LOGIN_ROOT_FIELDS.intersection(self.root_fields))
+
+
+def _entry_is_login(entry) -> bool:
+    """Detección de login para una operación de un batch."""
+    if not isinstance(entry, dict):
+        return False
+    operation_name = entry.get('operationName')
+    if operation_name in LOGIN_OPERATION_NAMES:
+        return True
+    query = entry.get('query') or peek_query(entry)
+    if not _mentions_login(query):
+        return False
+    try:
+        document = parse(query, no_location=True)
+    except GraphQLSyntaxError:
+        return False
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return False
+    return bool(LOGIN_ROOT_FIELDS.intersection(collect_root_fields(document, operation)))
+
+
+def get_graphql_envelope(request) -> GraphQLEnvelope:
+    """Envelope de la request (se crea una sola vez y se cachea en ella)."""
+    envelope = getattr(request, _REQUEST_ATTR, None)
+    if envelope is None:
+        envelope = GraphQLEnvelope(request)
+        setattr(request, _REQUEST_ATTR, envelope)
+    return envelope
@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 from graphql import GraphQLError
 from src.infrastructure.security.jwt_auth import JWTAuthenticationService
 from src.infrastructure.security.logging import security_event_logger, get_client_ip
+from src.infrastructure.security.token_channel import publish_clear, publish_tokens
 
 User = get_user_model()
 
@@ -113,8 +114,7 @@ class JWTLogin(graphene.Mutation):
             )
             
             # Marcar tokens para cookies
-            setattr(request, '_jwt_access_token', access_token)
-            setattr(request, '_jwt_refresh_token', refresh_token)
+            publish_tokens(request, access=access_token, refresh=refresh_token)
             
             return JWTLoginResponse(
                 success=response_data['success'],
@@ -184,9 +184,7 @@ class JWTRefresh(graphene.Mutation):
                 )
             
             # Marcar nuevos tokens para cookies
-            setattr(request, '_jwt_access_token', new_access_token)
-            if new_refresh_token:
-                setattr(request, '_jwt_refresh_token', new_refresh_token)
+            publish_tokens(request, access=new_access_token, refresh=new_refresh_token)
             
             return JWTRefreshResponse(
                 success=True,
@@ -234,7 +232,7 @@ class JWTLogout(graphene.Mutation):
                 )
             
             # Marcar para limpiar cookies
-            setattr(request, '_jwt_clear_cookies', True)
+            publish_clear(request)
             
             return JWTLogoutResponse(
                 success=True,
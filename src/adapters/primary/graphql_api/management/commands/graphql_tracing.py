@@ -0,0 +1,73 @@
+"""
+Comando de gestión para el reporte de campos GraphQL lentos.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.adapters.primary.graphql_api import tracing
+
+
+class Command(BaseCommand):
+    help = 'Muestra los campos GraphQL más lentos (tiempo, consultas SQL y duplicados)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Número de campos a mostrar (default: 20)'
+        )
+
+        parser.add_argument(
+            '--order',
+            choices=['total_ms', 'max_ms', 'p95_ms', 'queries', 'duplicate_queries'],
+            default='total_ms',
+            help='Columna de ordenamiento (default: total_ms)'
+        )
+
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Salida en JSON'
+        )
+
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reiniciar los datos publicados'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            tracing.reset_all()
+            self.stdout.write(self.style.SUCCESS('✅ Trazas GraphQL reiniciadas'))
+            return
+
+        if not getattr(settings, 'GRAPHQL_TRACING_ENABLED', False):
+            self.stdout.write(self.style.WARNING(
+                'GRAPHQL_TRACING_ENABLED está desactivado: solo se muestran datos ya publicados'
+            ))
+
+        rows = tracing.report(tracing.collect(include_local=False), options['limit'], options['order'])
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        if not rows:
+            self.stdout.write('Sin datos. ¿La caché es compartida entre procesos (Redis)?')
+            return
+
+        header = (
+            f"{'Campo':<50} {'llamadas':>9} {'total ms':>10} {'max ms':>9} "
+            f"{'p95 ms':>9} {'SQL':>6} {'dup':>5}"
+        )
+        self.stdout.write(self.style.SUCCESS(header))
+        for row in rows:
+            self.stdout.write(
+                f"{row['field'][-50:]:<50} {row['calls']:>9} {row['total_ms']:>10.2f} "
+                f"{row['max_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['queries']:>6} "
+                f"{row['duplicate_queries']:>5}"
+            )
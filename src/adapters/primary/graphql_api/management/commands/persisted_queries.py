@@ -0,0 +1,48 @@
+"""
+Comando de gestión para precargar un manifiesto de persisted queries en la caché.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from src.adapters.primary.graphql_api import persisted_queries
+
+
+class Command(BaseCommand):
+    help = (
+        'Precarga un manifiesto de persisted queries (APQ) en la caché compartida; '
+        'el modo allowlist lee GRAPHQL_APQ_MANIFEST'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'manifest',
+            type=str,
+            help='JSON {hash: query} o manifiesto Apollo {"operations": [{"id", "body"}]}'
+        )
+
+    def handle(self, *args, **options):
+        if (
+            getattr(settings, 'GRAPHQL_APQ_ALLOWLIST_ONLY', False)
+            and not getattr(settings, 'GRAPHQL_APQ_MANIFEST', '')
+        ):
+            # La caché puede evictar entradas o ser local a este proceso
+            raise CommandError(
+                'GRAPHQL_APQ_ALLOWLIST_ONLY requiere GRAPHQL_APQ_MANIFEST: la allowlist '
+                'se lee de ese archivo al iniciar cada proceso, no de la caché'
+            )
+
+        try:
+            entries = persisted_queries.read_manifest(options['manifest'])
+        except persisted_queries.PersistedQueryError:
+            raise CommandError('El manifiesto contiene hashes que no coinciden con su query')
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise CommandError(f'No se pudo leer el manifiesto: {exc}')
+
+        count = persisted_queries.register_many(entries.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ {count} persisted queries cargadas'))
+
+        if not getattr(settings, 'GRAPHQL_APQ_ALLOWLIST_ONLY', False):
+            self.stdout.write('GRAPHQL_APQ_ALLOWLIST_ONLY está desactivado: también se registran queries nuevas')
+        else:
+            self.stdout.write('Modo allowlist: se ejecutan solo los documentos de GRAPHQL_APQ_MANIFEST')
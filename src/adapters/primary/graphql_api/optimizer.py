@@ -0,0 +1,238 @@
+"""
+Optimizador de querysets a partir del selection set de GraphQL.
+
+``optimize(queryset, info)`` recorre los campos que el cliente pidió y
+deriva para el queryset:
+
+- ``select_related`` para FKs / OneToOne seleccionados (a cualquier
+  profundidad)
+- ``prefetch_related`` (con ``Prefetch`` optimizado) para relaciones
+  inversas / M2M expuestas como lista sin resolver propio
+- ``only()`` con las columnas que realmente se usan
+
+El tipo del modelo se busca dentro del resultado del campo, así que sirve
+igual para listas, detalles, envoltorios paginados (``items``) y conexiones
+relay (``edges.node``).
+
+Los nombres legacy de los tipos (``student`` -> ``practicante``,
+``email`` -> ``correo``...) se declaran en el atributo ``optimizer_hints``
+de cada ``DjangoObjectType``::
+
+    optimizer_hints = {
+        'student': 'practicante',              # relación o columna
+        'duracion_dias': ('fecha_inicio', 'fecha_fin'),
+        'practicas': None,                     # resuelto por DataLoader
+    }
+
+Si algún campo seleccionado no se puede mapear a columnas (propiedad o
+resolver desconocido) no se aplica ``only()``: se prefiere cargar de más a
+provocar consultas diferidas por fila.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from graphene.utils.str_converters import to_camel_case
+from graphql import (
+    FieldNode, FragmentSpreadNode, GraphQLObjectType, InlineFragmentNode, get_named_type,
+)
+
+# Profundidad máxima al buscar el tipo del modelo dentro de envoltorios
+_MAX_WRAPPER_DEPTH = 3
+
+_field_names_cache: Dict[type, Dict[str, str]] = {}
+
+
+def _model_of(gql_type) -> Optional[type]:
+    graphene_type = getattr(gql_type, 'graphene_type', None)
+    return getattr(getattr(graphene_type, '_meta', None), 'model', None)
+
+
+def _python_names(graphene_type) -> Dict[str, str]:
+    """Nombre GraphQL -> nombre Python de los campos del tipo."""
+    names = _field_names_cache.get(graphene_type)
+    if names is None:
+        names = {
+            (getattr(field, 'name', None) or to_camel_case(name)): name
+            for name, field in graphene_type._meta.fields.items()
+        }
+        _field_names_cache[graphene_type] = names
+    return names
+
+
+def _selected_fields(info, field_nodes: List[FieldNode]) -> Dict[str, List[FieldNode]]:
+    """Campos seleccionados bajo ``field_nodes`` (con fragments), agrupados por nombre."""
+    selected: Dict[str, List[FieldNode]] = {}
+
+    def _walk(selection_set):
+        if selection_set is None:
+            return
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                if not name.startswith('__'):
+                    selected.setdefault(name, []).append(selection)
+            elif isinstance(selection, InlineFragmentNode):
+                _walk(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = info.fragments.get(selection.name.value)
+                if fragment is not None:
+                    _walk(fragment.selection_set)
+
+    for node in field_nodes:
+        _walk(node.selection_set)
+    return selected
+
+
+class _Plan:
+    """select_related / prefetch_related / only acumulados."""
+
+    def __init__(self):
+        self.select: Set[str] = set()
+        self.prefetch: List = []
+        self.only: Set[str] = set()
+        self.full: Set[str] = set()  # relaciones cargadas completas
+        self.restricted = True
+
+    def apply(self, queryset):
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        if self.restricted and self.only:
+            only = {
+                path for path in self.only
+                if not any(path.startswith(full + '__') for full in self.full)
+            }
+            queryset = queryset.only(*sorted(only))
+        return queryset
+
+
+def _collect(plan: _Plan, info, gql_type: GraphQLObjectType,
+             field_nodes: List[FieldNode], model, prefix: str = '') -> None:
+    """Añade al plan lo que necesitan los campos seleccionados de ``gql_type``."""
+    graphene_type = gql_type.graphene_type
+    names = _python_names(graphene_type)
+    hints = getattr(graphene_type, 'optimizer_hints', {})
+
+    for gql_name, nodes in _selected_fields(info, field_nodes).items():
+        python_name = names.get(gql_name)
+        gql_field = gql_type.fields.get(gql_name)
+        if python_name is None or gql_field is None:
+            plan.restricted = False
+            continue
+
+        if python_name in hints:
+            targets = hints[python_name]
+            targets = () if targets is None else (targets,) if isinstance(targets, str) else targets
+        else:
+            targets = (python_name,)
+
+        sub_type = get_named_type(gql_field.type)
+        for target in targets:
+            _apply_path(plan, info, model, prefix, target, sub_type, nodes)
+
+
+def _apply_path(plan: _Plan, info, model, prefix: str, path: str, sub_type, nodes) -> None:
+    """Traduce un camino ``a__b__c`` del modelo a select_related/only/prefetch."""
+    current = model
+    walked = prefix
+    parts = path.split('__')
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            # Propiedad o atributo calculado: no se sabe qué columnas usa
+            plan.restricted = False
+            return
+        full_path = walked + part
+
+        if not field.is_relation:
+            if last:
+                plan.only.add(full_path)
+            else:
+                plan.restricted = False
+            return
+
+        if field.many_to_one or (field.one_to_one and field.concrete):
+            plan.select.add(full_path)
+            plan.only.add(full_path)
+            related = field.related_model
+            if last:
+                if _model_of(sub_type) is related and any(node.selection_set for node in nodes):
+                    _collect(plan, info, sub_type, nodes, related, full_path + '__')
+                else:
+                    plan.full.add(full_path)
+                return
+            current = related
+            walked = full_path + '__'
+            continue
+
+        if field.one_to_one:
+            # OneToOne inverso: se une, pero only() no puede restringirlo
+            plan.select.add(full_path)
+            plan.restricted = False
+            if last:
+                return
+            current = field.related_model
+            walked = full_path + '__'
+            continue
+
+        # Relación inversa / M2M: prefetch con su propio queryset optimizado
+        if last:
+            related = field.related_model
+            if _model_of(sub_type) is related:
+                nested = _Plan()
+                _collect(nested, info, sub_type, nodes, related)
+                remote = getattr(field, 'field', None)
+                if field.one_to_many and remote is not None:
+                    nested.only.add(remote.name)
+                queryset = nested.apply(related._default_manager.all())
+                plan.prefetch.append(Prefetch(full_path, queryset=queryset))
+            # Las conexiones relay filtran/paginan por su cuenta: sin prefetch
+        else:
+            plan.restricted = False
+        return
+
+
+def _find_model_type(info, gql_type, field_nodes, model, depth=0):
+    """Busca el tipo del modelo dentro del resultado (listas, ``items``, ``edges.node``)."""
+    gql_type = get_named_type(gql_type)
+    if not isinstance(gql_type, GraphQLObjectType):
+        return None
+    if _model_of(gql_type) is model:
+        return gql_type, field_nodes
+    if depth >= _MAX_WRAPPER_DEPTH or _model_of(gql_type) is not None:
+        return None
+    for gql_name, nodes in _selected_fields(info, field_nodes).items():
+        gql_field = gql_type.fields.get(gql_name)
+        if gql_field is None:
+            continue
+        found = _find_model_type(info, gql_field.type, nodes, model, depth + 1)
+        if found is not None:
+            return found
+    return None
+
+
+def optimize(queryset, info):
+    """
+    Aplica select_related / prefetch_related / only según la selección de ``info``.
+
+    Args:
+        queryset: QuerySet base (antes de paginar o hacer slicing)
+        info: ``GraphQLResolveInfo`` del resolver
+
+    Returns:
+        QuerySet optimizado (o el mismo si no se encontró el tipo del modelo)
+    """
+    if info is None:
+        return queryset
+    found = _find_model_type(info, info.return_type, info.field_nodes, queryset.model)
+    if found is None:
+        return queryset
+    gql_type, field_nodes = found
+    plan = _Plan()
+    _collect(plan, info, gql_type, field_nodes, queryset.model)
+    return plan.apply(queryset)
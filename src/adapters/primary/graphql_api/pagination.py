@@ -0,0 +1,214 @@
+"""
+Paginación de listas GraphQL: keyset (cursor) y offset.
+
+Las listas paginadas (``users``, ``students``, ``companies``,
+``practices``) aceptan dos modos:
+
+- Keyset: ``first`` + ``after``. Se ordena por la tupla estable
+  ``(clave de orden, id)`` y la página siguiente se pide con
+  ``WHERE (clave, id) > (cursor)``: el coste no crece con la profundidad.
+  Los cursores son opacos (base64 de la clave, su valor y el id).
+- Offset (compatibilidad): ``page`` + ``pageSize`` con ``PaginationType``
+  (sin cursores: ``startCursor``/``endCursor`` son null).
+
+``orderBy`` solo admite los nombres de la allowlist de cada lista
+(``*_ORDER_FIELDS`` en ``queries.py``): el cursor lleva el valor de la
+columna de orden, así que ordenar por cualquier otra (p. ej.
+``hash_contraseña``) la expondría.
+
+En ambos modos se lee una fila de más para saber si hay página siguiente
+y el ``COUNT(*)`` solo se ejecuta si el cliente selecciona ``totalCount``
+/ ``totalPages`` (los resolvers de graphene se llaman por campo pedido).
+
+Los valores NULL de la clave de orden van siempre al final.
+"""
+
+import base64
+import binascii
+import json
+from functools import cached_property
+from typing import Dict, Optional
+
+from django.db.models import F, Q
+from graphql import GraphQLError
+
+
+def _encode_value(value):
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(order_key: str, value, pk) -> str:
+    payload = json.dumps([order_key, _encode_value(value), pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str, order_key: str):
+    """(valor, pk) del cursor; error GraphQL si no corresponde al orden pedido."""
+    try:
+        key, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise GraphQLError('Cursor inválido')
+    if key != order_key:
+        raise GraphQLError('El cursor no corresponde al ordenamiento solicitado')
+    return value, pk
+
+
+def resolve_order(model, order_by: Optional[str], order_fields: Dict[str, str], default: str):
+    """
+    Campo del modelo y dirección para ``order_by``.
+
+    Args:
+        order_fields: allowlist nombre público (o legacy) -> campo del modelo;
+            cualquier otro nombre se rechaza
+
+    Returns:
+        (field, descending)
+    """
+    order_by = order_by or default
+    descending = order_by.startswith('-')
+    name = order_fields.get(order_by[1:] if descending else order_by)
+    try:
+        field = model._meta.get_field(name) if name else None
+    except Exception:
+        field = None
+    if field is None or not field.concrete or field.is_relation:
+        raise GraphQLError(f'Campo de ordenamiento no válido: {order_by}')
+    return field, descending
+
+
+class QuerySetPage:
+    """
+    Página de resultados. Sirve como raíz de la lista paginada
+    (``items``, ``pageInfo``, ``totalCount``) y de ``PaginationType``.
+    """
+
+    def __init__(self, queryset, items, has_next, has_previous, page=None, page_size=None,
+                 order_key=None, order_field=None):
+        self._queryset = queryset
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.page = page
+        self.page_size = page_size
+        self._order_key = order_key
+        self._order_field = order_field
+
+    # ---- PaginationType (offset) ----
+
+    @property
+    def pagination(self):
+        return self
+
+    @cached_property
+    def total_count(self) -> int:
+        return self._queryset.count()
+
+    @property
+    def total_pages(self) -> int:
+        if not self.page_size:
+            return 0
+        return (self.total_count + self.page_size - 1) // self.page_size
+
+    # ---- PageInfo (keyset) ----
+
+    @property
+    def page_info(self):
+        return self
+
+    @property
+    def has_next_page(self) -> bool:
+        return self.has_next
+
+    @property
+    def has_previous_page(self) -> bool:
+        return self.has_previous
+
+    def cursor_for(self, item) -> str:
+        value = getattr(item, self._order_field.attname)
+        return encode_cursor(self._order_key, value, item.pk)
+
+    @property
+    def start_cursor(self) -> Optional[str]:
+        # Solo en modo keyset (en offset no hay orden de cursor)
+        return self.cursor_for(self.items[0]) if self._order_key and self.items else None
+
+    @property
+    def end_cursor(self) -> Optional[str]:
+        return self.cursor_for(self.items[-1]) if self._order_key and self.items else None
+
+
+def _ordered(queryset, field, descending):
+    """Orden estable ``(campo, id)`` con NULLs al final."""
+    pk = queryset.model._meta.pk.name
+    expression = F(field.name).desc(nulls_last=True) if descending else F(field.name).asc(nulls_last=True)
+    tiebreak = f'-{pk}' if descending else pk
+    if field.primary_key:
+        return queryset.order_by(tiebreak)
+    return queryset.order_by(expression, tiebreak)
+
+
+def _with_loaded(queryset, field):
+    """Asegura que ``only()`` del optimizador carga la clave de orden."""
+    names, defer = queryset.query.deferred_loading
+    if not defer and names and field.name not in names:
+        queryset = queryset.only(*names, field.name)
+    return queryset
+
+
+def _after(queryset, field, descending, value, pk):
+    """Filtro ``(campo, id)`` posterior al cursor en el orden dado."""
+    pk_name = queryset.model._meta.pk.name
+    op = 'lt' if descending else 'gt'
+    if field.primary_key:
+        return queryset.filter(**{f'{pk_name}__{op}': pk})
+    if value is None:
+        # Cursor dentro del grupo de NULLs (al final): solo desempata el id
+        return queryset.filter(**{f'{field.name}__isnull': True, f'{pk_name}__{op}': pk})
+    value = field.to_python(value)
+    condition = (
+        Q(**{f'{field.name}__{op}': value})
+        | Q(**{field.name: value, f'{pk_name}__{op}': pk})
+    )
+    if field.null:
+        condition |= Q(**{f'{field.name}__isnull': True})
+    return queryset.filter(condition)
+
+
+def paginate(queryset, *, page=1, page_size=20, first=None, after=None,
+             order_by=None, order_fields=None, default_order='-id') -> QuerySetPage:
+    """
+    Pagina ``queryset`` (ya filtrado y optimizado).
+
+    Con ``first``/``after`` usa keyset; si no, offset con ``page``/``page_size``.
+
+    Args:
+        order_by: nombre de orden (``-`` descendente) de ``order_fields``
+        order_fields: allowlist nombre público (o legacy) -> campo del modelo
+        default_order: orden si no se indica ``order_by``
+    """
+    order_fields = order_fields or {'id': 'id'}
+    field, descending = resolve_order(queryset.model, order_by, order_fields, default_order)
+    order_key = f"{'-' if descending else ''}{field.name}"
+    base = queryset
+    queryset = _with_loaded(_ordered(queryset, field, descending), field)
+
+    if first is not None or after is not None:
+        size = max(int(first if first is not None else page_size), 1)
+        if after:
+            value, pk = decode_cursor(after, order_key)
+            queryset = _after(queryset, field, descending, value, pk)
+        rows = list(queryset[:size + 1])
+        return QuerySetPage(
+            base, rows[:size], len(rows) > size, bool(after),
+            page_size=size, order_key=order_key, order_field=field,
+        )
+
+    size = max(int(page_size or 1), 1)
+    page = max(int(page or 1), 1)
+    start = (page - 1) * size
+    rows = list(queryset[start:start + size + 1])
+    return QuerySetPage(base, rows[:size], len(rows) > size, page > 1, page=page, page_size=size)
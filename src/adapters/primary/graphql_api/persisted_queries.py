@@ -0,0 +1,255 @@
+"""
+Automatic Persisted Queries (APQ, protocolo de Apollo).
+
+El cliente envía ``extensions.persistedQuery = {version: 1, sha256Hash}``:
+
+- Solo hash: se busca el texto en el store. Si no existe se responde
+  ``PersistedQueryNotFound`` y el cliente reintenta con hash + query.
+- Hash + query: se verifica el hash, se registra la query y se ejecuta.
+
+El store es la caché compartida (``apq:<hash>``) con un memo LRU local por
+proceso delante: el hash identifica el contenido, así que el memo nunca
+queda obsoleto. Las queries persistidas también se aceptan por GET
+(``?extensions=...&variables=...``), lo que las hace cacheables por HTTP.
+
+Con ``GRAPHQL_APQ_ALLOWLIST_ONLY`` no se registra nada en runtime: solo se
+ejecutan documentos del manifiesto generado en el build del frontend, se
+envíen por hash o como texto completo. La allowlist no vive en la caché
+(que puede evictar entradas o ser local a cada proceso): cada proceso lee
+el archivo de ``GRAPHQL_APQ_MANIFEST`` en su primer uso. Sin manifiesto
+legible el modo allowlist rechaza todo. El comando ``persisted_queries``
+solo precarga manifiestos en la caché compartida para el APQ normal.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLError
+
+logger = logging.getLogger(__name__)
+
+_CACHE_PREFIX = 'apq:'
+_LOCAL_MAX = 512
+
+NOT_FOUND = 'PERSISTED_QUERY_NOT_FOUND'
+NOT_ALLOWED = 'PERSISTED_QUERY_NOT_ALLOWED'
+HASH_MISMATCH = 'PERSISTED_QUERY_HASH_MISMATCH'
+
+_MESSAGES = {
+    NOT_FOUND: 'PersistedQueryNotFound',
+    NOT_ALLOWED: 'PersistedQueryNotAllowed',
+    HASH_MISMATCH: 'provided sha does not match query',
+}
+
+_local: 'OrderedDict[str, str]' = OrderedDict()
+_local_lock = threading.Lock()
+
+# hash -> query del manifiesto (GRAPHQL_APQ_MANIFEST), leído una vez por proceso
+_allowlist: Optional[Mapping[str, str]] = None
+
+
+class PersistedQueryError(Exception):
+    """Error del protocolo APQ (se responde como error GraphQL)."""
+
+    def __init__(self, code: str):
+        super().__init__(_MESSAGES[code])
+        self.code = code
+
+    def as_graphql_error(self) -> GraphQLError:
+        return GraphQLError(str(self), extensions={'code': self.code})
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'GRAPHQL_APQ_ENABLED', True)
+
+
+def is_allowlist_only() -> bool:
+    return getattr(settings, 'GRAPHQL_APQ_ALLOWLIST_ONLY', False)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def get_persisted_hash(data) -> Optional[str]:
+    """``sha256Hash`` de ``extensions.persistedQuery`` o None."""
+    if not isinstance(data, dict) or not data:
+        return None
+    extensions = data.get('extensions')
+    if isinstance(extensions, str):
+        # GET: extensions llega como JSON en la query string
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get('persistedQuery')
+    if not isinstance(persisted, dict) or persisted.get('version', 1) != 1:
+        return None
+    sha = persisted.get('sha256Hash')
+    if isinstance(sha, str) and len(sha) == 64:
+        return sha.lower()
+    return None
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+def _remember(sha: str, query: str) -> None:
+    with _local_lock:
+        _local[sha] = query
+        _local.move_to_end(sha)
+        while len(_local) > _LOCAL_MAX:
+            _local.popitem(last=False)
+
+
+def lookup(sha: str) -> Optional[str]:
+    """Texto de la query registrada con ``sha`` (manifiesto o caché) o None."""
+    query = get_allowlist().get(sha)
+    if query is not None:
+        return query
+    with _local_lock:
+        query = _local.get(sha)
+    if query is not None:
+        return query
+    query = cache.get(_CACHE_PREFIX + sha)
+    if query is not None:
+        _remember(sha, query)
+    return query
+
+
+def register(query: str, sha: Optional[str] = None, permanent: bool = False) -> str:
+    """Registra ``query`` en el store y devuelve su hash."""
+    sha = sha or query_hash(query)
+    timeout = None if permanent else int(getattr(settings, 'GRAPHQL_APQ_TTL', 86400)) or None
+    cache.set(_CACHE_PREFIX + sha, query, timeout=timeout)
+    _remember(sha, query)
+    return sha
+
+
+def register_many(queries: Iterable[Tuple[Optional[str], str]]) -> int:
+    """Carga un manifiesto (pares hash/query) sin expiración."""
+    count = 0
+    for sha, query in queries:
+        if sha and query_hash(query) != sha:
+            raise PersistedQueryError(HASH_MISMATCH)
+        register(query, sha, permanent=True)
+        count += 1
+    return count
+
+
+# ============================================================================
+# MANIFIESTO (ALLOWLIST)
+# ============================================================================
+
+def parse_manifest(manifest) -> List[Tuple[Optional[str], str]]:
+    """Pares hash/query de ``{hash: query}`` o de un manifiesto Apollo."""
+    if isinstance(manifest, dict) and 'operations' in manifest:
+        return [(op.get('id'), op['body']) for op in manifest['operations']]
+    if isinstance(manifest, dict):
+        return list(manifest.items())
+    raise ValueError('Formato de manifiesto no soportado')
+
+
+def read_manifest(path: str) -> Dict[str, str]:
+    """
+    Lee el manifiesto de ``path`` como ``{hash: query}``.
+
+    Raises:
+        OSError, ValueError: archivo ilegible o con formato no soportado
+        PersistedQueryError: algún hash no coincide con su query
+    """
+    with open(path, encoding='utf-8') as fh:
+        manifest = json.load(fh)
+    entries = {}
+    for sha, query in parse_manifest(manifest):
+        if sha and query_hash(query) != sha:
+            raise PersistedQueryError(HASH_MISMATCH)
+        entries[sha or query_hash(query)] = query
+    return entries
+
+
+def get_allowlist() -> Mapping[str, str]:
+    """Documentos del manifiesto ``GRAPHQL_APQ_MANIFEST`` (vacío si no hay)."""
+    global _allowlist
+    if _allowlist is None:
+        with _local_lock:
+            if _allowlist is None:
+                entries = {}
+                path = getattr(settings, 'GRAPHQL_APQ_MANIFEST', '')
+                if path:
+                    try:
+                        entries = read_manifest(path)
+                    except (OSError, ValueError, KeyError, TypeError, PersistedQueryError) as exc:
+                        logger.error("No se pudo leer GRAPHQL_APQ_MANIFEST (%s): %s", path, exc)
+                elif is_allowlist_only():
+                    logger.error("GRAPHQL_APQ_ALLOWLIST_ONLY sin GRAPHQL_APQ_MANIFEST: se rechazan todas las operaciones")
+                _allowlist = MappingProxyType(entries)
+    return _allowlist
+
+
+def reset_allowlist() -> None:
+    """Vuelve a leer el manifiesto en el próximo uso."""
+    global _allowlist
+    _allowlist = None
+
+
+# ============================================================================
+# RESOLUCIÓN POR REQUEST
+# ============================================================================
+
+def resolve_query(data, query: Optional[str]) -> Optional[str]:
+    """
+    Texto a ejecutar para una operación (aplica el protocolo APQ).
+
+    Raises:
+        PersistedQueryError: hash desconocido, no permitido o inconsistente
+    """
+    if not is_enabled():
+        return query
+
+    sha = get_persisted_hash(data)
+    if is_allowlist_only():
+        # Solo el manifiesto: lo registrado en la caché no cuenta
+        allowlist = get_allowlist()
+        if sha is None:
+            if query and query_hash(query) not in allowlist:
+                raise PersistedQueryError(NOT_ALLOWED)
+            return query
+        if query and query_hash(query) != sha:
+            raise PersistedQueryError(HASH_MISMATCH)
+        if sha not in allowlist:
+            raise PersistedQueryError(NOT_ALLOWED)
+        return allowlist[sha]
+
+    if sha is None:
+        return query
+
+    if query:
+        if query_hash(query) != sha:
+            raise PersistedQueryError(HASH_MISMATCH)
+        if lookup(sha) is None:
+            register(query, sha)
+        return query
+
+    stored = lookup(sha)
+    if stored is None:
+        raise PersistedQueryError(NOT_FOUND)
+    return stored
+
+
+def peek_query(data) -> Optional[str]:
+    """Query registrada para el hash de ``data`` (sin errores ni registro)."""
+    if not is_enabled():
+        return None
+    sha = get_persisted_hash(data)
+    return lookup(sha) if sha else None
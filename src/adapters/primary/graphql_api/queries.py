@@ -17,6 +17,9 @@ from django.db.models import Q, Count, Avg, Sum, F, Value, CharField
 from django.db.models.functions import Concat
 from datetime import datetime, timedelta
 
+from .optimizer import optimize
+from .pagination import paginate
+from . import statistics
 from .types import (
     UserType, StudentType, CompanyType, SupervisorType,
     PracticeType, DocumentType, NotificationType,
@@ -46,6 +49,7 @@ class PracticeStatisticsType(graphene.ObjectType):
     approved = graphene.Int()
     in_progress = graphene.Int()
     completed = graphene.Int()
+    rejected = graphene.Int()
     cancelled = graphene.Int()
     average_hours = graphene.Float()
     average_grade = graphene.Float()
@@ -67,7 +71,8 @@ class CompanyStatisticsType(graphene.ObjectType):
     active = graphene.Int()
     pending = graphene.Int()
     suspended = graphene.Int()
-    blacklisted = graphene.Int()
+    inactive = graphene.Int()
+    blacklisted = graphene.Int(deprecation_reason="Sin estado equivalente en upeu_empresa; usar inactive")
     by_sector = graphene.JSONString()
     with_practices = graphene.Int()
 
@@ -81,7 +86,7 @@ class DashboardStatisticsType(graphene.ObjectType):
 
 
 class PaginationType(graphene.ObjectType):
-    """Información de paginación."""
+    """Información de paginación por offset (``page``/``pageSize``)."""
     page = graphene.Int()
     page_size = graphene.Int()
     total_count = graphene.Int()
@@ -94,24 +99,66 @@ class UserListType(graphene.ObjectType):
     """Lista paginada de usuarios."""
     items = graphene.List(UserType)
     pagination = graphene.Field(PaginationType)
+    page_info = graphene.Field(graphene.relay.PageInfo)
+    total_count = graphene.Int()
 
 
 class StudentListType(graphene.ObjectType):
     """Lista paginada de estudiantes."""
     items = graphene.List(StudentType)
     pagination = graphene.Field(PaginationType)
+    page_info = graphene.Field(graphene.relay.PageInfo)
+    total_count = graphene.Int()
 
 
 class CompanyListType(graphene.ObjectType):
     """Lista paginada de empresas."""
     items = graphene.List(CompanyType)
     pagination = graphene.Field(PaginationType)
+    page_info = graphene.Field(graphene.relay.PageInfo)
+    total_count = graphene.Int()
 
 
 class PracticeListType(graphene.ObjectType):
     """Lista paginada de prácticas."""
     items = graphene.List(PracticeType)
     pagination = graphene.Field(PaginationType)
+    page_info = graphene.Field(graphene.relay.PageInfo)
+    total_count = graphene.Int()
+
+
+# Allowlist de ``orderBy`` por lista: nombre público (o legacy) -> campo del
+# modelo. El cursor keyset lleva el valor de la columna de orden, así que solo
+# se admiten columnas que la lista ya expone; cualquier otro nombre se rechaza.
+USER_ORDER_FIELDS = {
+    'id': 'id',
+    'created_at': 'fecha_creacion', 'fecha_creacion': 'fecha_creacion',
+    'email': 'correo', 'correo': 'correo',
+    'first_name': 'nombres', 'nombres': 'nombres',
+    'last_name': 'apellidos', 'apellidos': 'apellidos',
+    'last_login': 'ultimo_acceso', 'ultimo_acceso': 'ultimo_acceso',
+}
+STUDENT_ORDER_FIELDS = {
+    'id': 'id',
+    'created_at': 'fecha_creacion', 'fecha_creacion': 'fecha_creacion',
+    'codigo_estudiante': 'codigo', 'codigo': 'codigo',
+    'semestre_actual': 'semestre', 'semestre': 'semestre',
+    'promedio_ponderado': 'promedio', 'promedio': 'promedio',
+}
+COMPANY_ORDER_FIELDS = {
+    'id': 'id',
+    'created_at': 'fecha_registro', 'fecha_registro': 'fecha_registro',
+    'nombre_comercial': 'nombre', 'nombre': 'nombre',
+    'razon_social': 'razon_social',
+    'status': 'estado', 'estado': 'estado',
+}
+PRACTICE_ORDER_FIELDS = {
+    'id': 'id',
+    'created_at': 'fecha_creacion', 'fecha_creacion': 'fecha_creacion',
+    'updated_at': 'fecha_actualizacion', 'fecha_actualizacion': 'fecha_actualizacion',
+    'status': 'estado', 'estado': 'estado',
+    'titulo': 'titulo', 'fecha_inicio': 'fecha_inicio', 'fecha_fin': 'fecha_fin',
+}
 
 
 # ============================================================================
@@ -147,6 +194,9 @@ class Query(graphene.ObjectType):
         UserListType,
         page=graphene.Int(default_value=1),
         page_size=graphene.Int(default_value=20),
+        first=graphene.Int(description="Tamaño de página en modo cursor"),
+        after=graphene.String(description="Cursor (endCursor) de la página anterior"),
+        order_by=graphene.String(default_value="-created_at"),
         role=graphene.String(),
         is_active=graphene.Boolean(),
         search=graphene.String(),
@@ -187,6 +237,8 @@ class Query(graphene.ObjectType):
         StudentListType,
         page=graphene.Int(default_value=1),
         page_size=graphene.Int(default_value=20),
+        first=graphene.Int(description="Tamaño de página en modo cursor"),
+        after=graphene.String(description="Cursor (endCursor) de la página anterior"),
         semestre=graphene.Int(),
         carrera=graphene.String(),
         search=graphene.String(),
@@ -227,6 +279,8 @@ class Query(graphene.ObjectType):
         CompanyListType,
         page=graphene.Int(default_value=1),
         page_size=graphene.Int(default_value=20),
+        first=graphene.Int(description="Tamaño de página en modo cursor"),
+        after=graphene.String(description="Cursor (endCursor) de la página anterior"),
         status=graphene.String(),
         sector=graphene.String(),
         search=graphene.String(),
@@ -307,6 +361,8 @@ class Query(graphene.ObjectType):
         PracticeListType,
         page=graphene.Int(default_value=1),
         page_size=graphene.Int(default_value=20),
+        first=graphene.Int(description="Tamaño de página en modo cursor"),
+        after=graphene.String(description="Cursor (endCursor) de la página anterior"),
         status=graphene.String(),
         student_id=graphene.ID(),
         company_id=graphene.ID(),
@@ -465,54 +521,40 @@ class Query(graphene.ObjectType):
             return None
         
         try:
-            return User.objects.get(id=id)
+            return optimize(User.objects.all(), info).get(id=id)
         except User.DoesNotExist:
             return None
     
     @login_required
-    def resolve_users(self, info, page=1, page_size=20, role=None, is_active=None, search=None):
-        """Resolver: Lista paginada de usuarios."""
+    def resolve_users(self, info, page=1, page_size=20, first=None, after=None,
+                      role=None, is_active=None, search=None, order_by="-created_at"):
+        """Resolver: Lista paginada de usuarios (offset o cursor)."""
         current_user = info.context.user
         
         if not can_view_users(current_user):
             return UserListType(items=[], pagination=None)
         
         # Query base
-        queryset = User.objects.all()
+        queryset = optimize(User.objects.all(), info)
         
         # Filtros
         if role:
-            queryset = queryset.filter(role=role)
+            queryset = queryset.filter(rol_id__nombre=role)
         if is_active is not None:
-            queryset = queryset.filter(is_active=is_active)
+            queryset = queryset.filter(activo=is_active)
         if search:
             queryset = queryset.filter(
-                Q(email__icontains=search) |
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(username__icontains=search)
+                Q(correo__icontains=search) |
+                Q(nombres__icontains=search) |
+                Q(apellidos__icontains=search) |
+                Q(dni__icontains=search)
             )
         
-        # Ordenamiento
-        queryset = queryset.order_by('-created_at')
-        
-        # Paginación
-        total_count = queryset.count()
-        total_pages = (total_count + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
-        items = list(queryset[start:end])
-        
-        pagination = PaginationType(
-            page=page,
-            page_size=page_size,
-            total_count=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1
+        # Ordenamiento estable (clave, id) + paginación
+        return paginate(
+            queryset, page=page, page_size=page_size, first=first, after=after,
+            order_by=order_by, order_fields=USER_ORDER_FIELDS,
         )
-        
-        return UserListType(items=items, pagination=pagination)
     
     @login_required
     def resolve_users_by_role(self, info, role):
@@ -522,7 +564,7 @@ class Query(graphene.ObjectType):
         if not can_view_users(current_user):
             return []
         
-        return User.objects.filter(role=role, is_active=True).order_by('first_name', 'last_name')
+        return optimize(User.objects.filter(role=role, is_active=True), info).order_by('first_name', 'last_name')
     
     @login_required
     def resolve_search_users(self, info, query):
@@ -532,12 +574,12 @@ class Query(graphene.ObjectType):
         if not can_view_users(current_user):
             return []
         
-        return User.objects.filter(
+        return optimize(User.objects.filter(
             Q(email__icontains=query) |
             Q(first_name__icontains=query) |
             Q(last_name__icontains=query) |
             Q(username__icontains=query)
-        ).order_by('first_name', 'last_name')[:20]
+        ), info).order_by('first_name', 'last_name')[:20]
     
     # ========================================================================
     # RESOLVERS - STUDENT
@@ -550,9 +592,9 @@ class Query(graphene.ObjectType):
         
         try:
             if id:
-                student = Student.objects.select_related('user').get(id=id)
+                student = optimize(Student.objects.all(), info).get(id=id)
             elif codigo:
-                student = Student.objects.select_related('user').get(codigo_estudiante=codigo)
+                student = optimize(Student.objects.all(), info).get(codigo_estudiante=codigo)
             else:
                 return None
             
@@ -583,49 +625,35 @@ class Query(graphene.ObjectType):
         return getattr(current_user, 'student_profile', None)
     
     @login_required
-    def resolve_students(self, info, page=1, page_size=20, semestre=None, carrera=None, search=None, order_by="-created_at"):
-        """Resolver: Lista paginada de estudiantes."""
+    def resolve_students(self, info, page=1, page_size=20, first=None, after=None,
+                         semestre=None, carrera=None, search=None, order_by="-created_at"):
+        """Resolver: Lista paginada de estudiantes (offset o cursor)."""
         current_user = info.context.user
         
         if not can_view_students(current_user):
             return StudentListType(items=[], pagination=None)
         
         # Query base
-        queryset = Student.objects.select_related('user').all()
+        queryset = optimize(Student.objects.all(), info)
         
         # Filtros
         if semestre:
-            queryset = queryset.filter(semestre_actual=semestre)
+            queryset = queryset.filter(semestre=semestre)
         if carrera:
-            queryset = queryset.filter(carrera__icontains=carrera)
+            queryset = queryset.filter(escuela__nombre__icontains=carrera)
         if search:
             queryset = queryset.filter(
-                Q(codigo_estudiante__icontains=search) |
-                Q(user__first_name__icontains=search) |
-                Q(user__last_name__icontains=search) |
-                Q(carrera__icontains=search)
+                Q(codigo__icontains=search) |
+                Q(usuario__nombres__icontains=search) |
+                Q(usuario__apellidos__icontains=search) |
+                Q(escuela__nombre__icontains=search)
             )
         
-        # Ordenamiento
-        queryset = queryset.order_by(order_by)
-        
-        # Paginación
-        total_count = queryset.count()
-        total_pages = (total_count + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
-        items = list(queryset[start:end])
-        
-        pagination = PaginationType(
-            page=page,
-            page_size=page_size,
-            total_count=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1
+        # Ordenamiento estable (clave, id) + paginación
+        return paginate(
+            queryset, page=page, page_size=page_size, first=first, after=after,
+            order_by=order_by, order_fields=STUDENT_ORDER_FIELDS,
         )
-        
-        return StudentListType(items=items, pagination=pagination)
     
     @login_required
     def resolve_eligible_students(self, info):
@@ -635,11 +663,11 @@ class Query(graphene.ObjectType):
         if not can_view_students(current_user):
             return []
         
-        return Student.objects.filter(
+        return optimize(Student.objects.filter(
             semestre_actual__gte=6,
             promedio_ponderado__gte=12.0,
             user__is_active=True
-        ).select_related('user').order_by('-promedio_ponderado')
+        ), info).order_by('-promedio_ponderado')
     
     @login_required
     def resolve_students_without_practice(self, info):
@@ -650,13 +678,13 @@ class Query(graphene.ObjectType):
             return []
         
         # Estudiantes elegibles que no tienen prácticas activas
-        return Student.objects.filter(
+        return optimize(Student.objects.filter(
             semestre_actual__gte=6,
             promedio_ponderado__gte=12.0,
             user__is_active=True
         ).exclude(
             practices__status__in=['APPROVED', 'IN_PROGRESS']
-        ).select_related('user').order_by('-promedio_ponderado')
+        ), info).order_by('-promedio_ponderado')
     
     @login_required
     def resolve_search_students(self, info, query):
@@ -666,12 +694,12 @@ class Query(graphene.ObjectType):
         if not can_view_students(current_user):
             return []
         
-        return Student.objects.filter(
+        return optimize(Student.objects.filter(
             Q(codigo_estudiante__icontains=query) |
             Q(user__first_name__icontains=query) |
             Q(user__last_name__icontains=query) |
             Q(carrera__icontains=query)
-        ).select_related('user').order_by('user__first_name', 'user__last_name')[:20]
+        ), info).order_by('user__first_name', 'user__last_name')[:20]
     
     # ========================================================================
     # RESOLVERS - COMPANY
@@ -682,64 +710,50 @@ class Query(graphene.ObjectType):
         """Resolver: Empresa por ID o RUC."""
         try:
             if id:
-                return Company.objects.get(id=id)
+                return optimize(Company.objects.all(), info).get(id=id)
             elif ruc:
-                return Company.objects.get(ruc=ruc)
+                return optimize(Company.objects.all(), info).get(ruc=ruc)
         except Company.DoesNotExist:
             pass
         
         return None
     
     @login_required
-    def resolve_companies(self, info, page=1, page_size=20, status=None, sector=None, search=None, order_by="-created_at"):
-        """Resolver: Lista paginada de empresas."""
+    def resolve_companies(self, info, page=1, page_size=20, first=None, after=None,
+                          status=None, sector=None, search=None, order_by="-created_at"):
+        """Resolver: Lista paginada de empresas (offset o cursor)."""
         current_user = info.context.user
         
         # Query base
-        queryset = Company.objects.all()
+        queryset = optimize(Company.objects.all(), info)
         
         # Si no es staff, solo ver empresas activas
         if not can_view_companies(current_user):
-            queryset = queryset.filter(status='ACTIVE')
+            queryset = queryset.filter(estado='ACTIVO')
         
         # Filtros
         if status:
-            queryset = queryset.filter(status=status)
+            queryset = queryset.filter(estado=status)
         if sector:
             queryset = queryset.filter(sector_economico__icontains=sector)
         if search:
             queryset = queryset.filter(
                 Q(razon_social__icontains=search) |
-                Q(nombre_comercial__icontains=search) |
+                Q(nombre__icontains=search) |
                 Q(ruc__icontains=search) |
                 Q(sector_economico__icontains=search)
             )
         
-        # Ordenamiento
-        queryset = queryset.order_by(order_by)
-        
-        # Paginación
-        total_count = queryset.count()
-        total_pages = (total_count + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
-        items = list(queryset[start:end])
-        
-        pagination = PaginationType(
-            page=page,
-            page_size=page_size,
-            total_count=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1
+        # Ordenamiento estable (clave, id) + paginación
+        return paginate(
+            queryset, page=page, page_size=page_size, first=first, after=after,
+            order_by=order_by, order_fields=COMPANY_ORDER_FIELDS,
         )
-        
-        return CompanyListType(items=items, pagination=pagination)
     
     @login_required
     def resolve_active_companies(self, info):
         """Resolver: Empresas activas."""
-        return Company.objects.filter(status='ACTIVE').order_by('razon_social')
+        return optimize(Company.objects.filter(status='ACTIVE'), info).order_by('razon_social')
     
     @login_required
     def resolve_pending_validation_companies(self, info):
@@ -749,25 +763,25 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'ADMINISTRADOR']:
             return []
         
-        return Company.objects.filter(status='PENDING_VALIDATION').order_by('-created_at')
+        return optimize(Company.objects.filter(status='PENDING_VALIDATION'), info).order_by('-created_at')
     
     @login_required
     def resolve_companies_by_sector(self, info, sector):
         """Resolver: Empresas por sector."""
-        return Company.objects.filter(
+        return optimize(Company.objects.filter(
             sector_economico__icontains=sector,
             status='ACTIVE'
-        ).order_by('razon_social')
+        ), info).order_by('razon_social')
     
     @login_required
     def resolve_search_companies(self, info, query):
         """Resolver: Búsqueda de empresas."""
-        return Company.objects.filter(
+        return optimize(Company.objects.filter(
             Q(razon_social__icontains=query) |
             Q(nombre_comercial__icontains=query) |
             Q(ruc__icontains=query) |
             Q(sector_economico__icontains=query)
-        ).order_by('razon_social')[:20]
+        ), info).order_by('razon_social')[:20]
     
     # ========================================================================
     # RESOLVERS - SUPERVISOR
@@ -777,7 +791,7 @@ class Query(graphene.ObjectType):
     def resolve_supervisor(self, info, id):
         """Resolver: Supervisor por ID."""
         try:
-            return Supervisor.objects.select_related('user', 'company').get(id=id)
+            return optimize(Supervisor.objects.all(), info).get(id=id)
         except Supervisor.DoesNotExist:
             return None
     
@@ -799,7 +813,7 @@ class Query(graphene.ObjectType):
         if not can_view_supervisors(current_user):
             return []
         
-        queryset = Supervisor.objects.select_related('user', 'company').all()
+        queryset = optimize(Supervisor.objects.all(), info)
         
         if company_id:
             queryset = queryset.filter(company_id=company_id)
@@ -809,16 +823,16 @@ class Query(graphene.ObjectType):
     @login_required
     def resolve_company_supervisors(self, info, company_id):
         """Resolver: Supervisores de una empresa."""
-        return Supervisor.objects.filter(
+        return optimize(Supervisor.objects.filter(
             company_id=company_id,
             user__is_active=True
-        ).select_related('user').order_by('user__first_name', 'user__last_name')
+        ), info).order_by('user__first_name', 'user__last_name')
     
     @login_required
     def resolve_available_supervisors(self, info, company_id):
         """Resolver: Supervisores disponibles (con capacidad)."""
         # Supervisores con menos de 5 prácticas activas
-        return Supervisor.objects.filter(
+        return optimize(Supervisor.objects.filter(
             company_id=company_id,
             user__is_active=True
         ).annotate(
@@ -828,7 +842,7 @@ class Query(graphene.ObjectType):
             )
         ).filter(
             active_practices__lt=5
-        ).select_related('user').order_by('active_practices', 'user__first_name')
+        ), info).order_by('active_practices', 'user__first_name')
     
     # ========================================================================
     # RESOLVERS - PRACTICE
@@ -840,9 +854,7 @@ class Query(graphene.ObjectType):
         current_user = info.context.user
         
         try:
-            practice = Practice.objects.select_related(
-                'student__user', 'company', 'supervisor__user'
-            ).get(id=id)
+            practice = optimize(Practice.objects.all(), info).get(id=id)
             
             # Verificar permisos
             if can_view_practices(current_user):
@@ -861,25 +873,26 @@ class Query(graphene.ObjectType):
         return None
     
     @login_required
-    def resolve_practices(self, info, page=1, page_size=20, status=None, student_id=None, 
-                         company_id=None, supervisor_id=None, fecha_inicio_from=None,
-                         fecha_inicio_to=None, search=None, order_by="-created_at"):
-        """Resolver: Lista paginada de prácticas."""
+    def resolve_practices(self, info, page=1, page_size=20, first=None, after=None,
+                          status=None, student_id=None, company_id=None, supervisor_id=None,
+                          fecha_inicio_from=None, fecha_inicio_to=None, search=None,
+                          order_by="-created_at"):
+        """Resolver: Lista paginada de prácticas (offset o cursor)."""
         current_user = info.context.user
         
         # Query base según permisos
         if can_view_practices(current_user):
-            queryset = Practice.objects.select_related('student__user', 'company', 'supervisor__user').all()
+            queryset = optimize(Practice.objects.all(), info)
         elif current_user.role == 'PRACTICANTE':
             student = getattr(current_user, 'student_profile', None)
             if student:
-                queryset = Practice.objects.filter(student=student).select_related('company', 'supervisor__user')
+                queryset = optimize(Practice.objects.filter(practicante=student), info)
             else:
                 return PracticeListType(items=[], pagination=None)
         elif current_user.role == 'SUPERVISOR':
             supervisor = getattr(current_user, 'supervisor_profile', None)
             if supervisor:
-                queryset = Practice.objects.filter(supervisor=supervisor).select_related('student__user', 'company')
+                queryset = optimize(Practice.objects.filter(supervisor=supervisor), info)
             else:
                 return PracticeListType(items=[], pagination=None)
         else:
@@ -887,11 +900,11 @@ class Query(graphene.ObjectType):
         
         # Filtros
         if status:
-            queryset = queryset.filter(status=status)
+            queryset = queryset.filter(estado=status)
         if student_id:
-            queryset = queryset.filter(student_id=student_id)
+            queryset = queryset.filter(practicante_id=student_id)
         if company_id:
-            queryset = queryset.filter(company_id=company_id)
+            queryset = queryset.filter(empresa_id=company_id)
         if supervisor_id:
             queryset = queryset.filter(supervisor_id=supervisor_id)
         if fecha_inicio_from:
@@ -901,32 +914,16 @@ class Query(graphene.ObjectType):
         if search:
             queryset = queryset.filter(
                 Q(titulo__icontains=search) |
-                Q(area_practica__icontains=search) |
-                Q(company__razon_social__icontains=search) |
-                Q(student__user__first_name__icontains=search) |
-                Q(student__user__last_name__icontains=search)
+                Q(empresa__razon_social__icontains=search) |
+                Q(practicante__usuario__nombres__icontains=search) |
+                Q(practicante__usuario__apellidos__icontains=search)
             )
         
-        # Ordenamiento
-        queryset = queryset.order_by(order_by)
-        
-        # Paginación
-        total_count = queryset.count()
-        total_pages = (total_count + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
-        items = list(queryset[start:end])
-        
-        pagination = PaginationType(
-            page=page,
-            page_size=page_size,
-            total_count=total_count,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1
+        # Ordenamiento estable (clave, id) + paginación
+        return paginate(
+            queryset, page=page, page_size=page_size, first=first, after=after,
+            order_by=order_by, order_fields=PRACTICE_ORDER_FIELDS,
         )
-        
-        return PracticeListType(items=items, pagination=pagination)
     
     @login_required
     def resolve_my_practices(self, info):
@@ -936,15 +933,11 @@ class Query(graphene.ObjectType):
         if current_user.role == 'PRACTICANTE':
             student = getattr(current_user, 'student_profile', None)
             if student:
-                return Practice.objects.filter(student=student).select_related(
-                    'company', 'supervisor__user'
-                ).order_by('-created_at')
+                return optimize(Practice.objects.filter(student=student), info).order_by('-created_at')
         elif current_user.role == 'SUPERVISOR':
             supervisor = getattr(current_user, 'supervisor_profile', None)
             if supervisor:
-                return Practice.objects.filter(supervisor=supervisor).select_related(
-                    'student__user', 'company'
-                ).order_by('-created_at')
+                return optimize(Practice.objects.filter(supervisor=supervisor), info).order_by('-created_at')
         
         return []
     
@@ -954,16 +947,14 @@ class Query(graphene.ObjectType):
         current_user = info.context.user
         
         if can_view_practices(current_user):
-            return Practice.objects.filter(status=status).select_related(
-                'student__user', 'company', 'supervisor__user'
-            ).order_by('-created_at')
+            return optimize(Practice.objects.filter(status=status), info).order_by('-created_at')
         elif current_user.role == 'SUPERVISOR':
             supervisor = getattr(current_user, 'supervisor_profile', None)
             if supervisor:
-                return Practice.objects.filter(
+                return optimize(Practice.objects.filter(
                     status=status,
                     supervisor=supervisor
-                ).select_related('student__user', 'company').order_by('-created_at')
+                ), info).order_by('-created_at')
         
         return []
     
@@ -975,9 +966,7 @@ class Query(graphene.ObjectType):
         if not can_view_practices(current_user):
             return []
         
-        return Practice.objects.filter(student_id=student_id).select_related(
-            'company', 'supervisor__user'
-        ).order_by('-created_at')
+        return optimize(Practice.objects.filter(student_id=student_id), info).order_by('-created_at')
     
     @login_required
     def resolve_company_practices(self, info, company_id):
@@ -987,9 +976,7 @@ class Query(graphene.ObjectType):
         if not can_view_practices(current_user):
             return []
         
-        return Practice.objects.filter(company_id=company_id).select_related(
-            'student__user', 'supervisor__user'
-        ).order_by('-created_at')
+        return optimize(Practice.objects.filter(company_id=company_id), info).order_by('-created_at')
     
     @login_required
     def resolve_supervisor_practices(self, info, supervisor_id):
@@ -999,9 +986,7 @@ class Query(graphene.ObjectType):
         if not can_view_practices(current_user):
             return []
         
-        return Practice.objects.filter(supervisor_id=supervisor_id).select_related(
-            'student__user', 'company'
-        ).order_by('-created_at')
+        return optimize(Practice.objects.filter(supervisor_id=supervisor_id), info).order_by('-created_at')
     
     @login_required
     def resolve_active_practices(self, info):
@@ -1011,9 +996,9 @@ class Query(graphene.ObjectType):
         if not can_view_practices(current_user):
             return []
         
-        return Practice.objects.filter(
+        return optimize(Practice.objects.filter(
             status__in=['APPROVED', 'IN_PROGRESS']
-        ).select_related('student__user', 'company', 'supervisor__user').order_by('-fecha_inicio')
+        ), info).order_by('-fecha_inicio')
     
     @login_required
     def resolve_pending_approval_practices(self, info):
@@ -1023,9 +1008,7 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return []
         
-        return Practice.objects.filter(status='PENDING').select_related(
-            'student__user', 'company', 'supervisor__user'
-        ).order_by('created_at')
+        return optimize(Practice.objects.filter(status='PENDING'), info).order_by('created_at')
     
     @login_required
     def resolve_completed_practices(self, info, year=None):
@@ -1035,9 +1018,7 @@ class Query(graphene.ObjectType):
         if not can_view_practices(current_user):
             return []
         
-        queryset = Practice.objects.filter(status='COMPLETED').select_related(
-            'student__user', 'company', 'supervisor__user'
-        )
+        queryset = optimize(Practice.objects.filter(status='COMPLETED'), info)
         
         if year:
             queryset = queryset.filter(fecha_fin__year=year)
@@ -1052,7 +1033,7 @@ class Query(graphene.ObjectType):
     def resolve_document(self, info, id):
         """Resolver: Documento por ID."""
         try:
-            return Document.objects.select_related('practice', 'subido_por').get(id=id)
+            return optimize(Document.objects.all(), info).get(id=id)
         except Document.DoesNotExist:
             return None
     
@@ -1064,7 +1045,7 @@ class Query(graphene.ObjectType):
         if not can_view_documents(current_user):
             return []
         
-        queryset = Document.objects.select_related('practice', 'subido_por').all()
+        queryset = optimize(Document.objects.all(), info)
         
         if practice_id:
             queryset = queryset.filter(practice_id=practice_id)
@@ -1097,9 +1078,7 @@ class Query(graphene.ObjectType):
                     can_view = True
             
             if can_view:
-                return Document.objects.filter(practice=practice).select_related(
-                    'subido_por'
-                ).order_by('-created_at')
+                return optimize(Document.objects.filter(practice=practice), info).order_by('-created_at')
         except Practice.DoesNotExist:
             pass
         
@@ -1113,18 +1092,14 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return []
         
-        return Document.objects.filter(aprobado=False).select_related(
-            'practice__student__user', 'practice__company', 'subido_por'
-        ).order_by('created_at')
+        return optimize(Document.objects.filter(aprobado=False), info).order_by('created_at')
     
     @login_required
     def resolve_my_documents(self, info):
         """Resolver: Documentos del usuario actual."""
         current_user = info.context.user
         
-        return Document.objects.filter(subido_por=current_user).select_related(
-            'practice__company'
-        ).order_by('-created_at')
+        return optimize(Document.objects.filter(subido_por=current_user), info).order_by('-created_at')
     
     # ========================================================================
     # RESOLVERS - NOTIFICATION
@@ -1135,7 +1110,7 @@ class Query(graphene.ObjectType):
         """Resolver: Notificaciones del usuario actual."""
         current_user = info.context.user
         
-        queryset = Notification.objects.filter(user=current_user)
+        queryset = optimize(Notification.objects.filter(user=current_user), info)
         
         if leida is not None:
             queryset = queryset.filter(leida=leida)
@@ -1149,10 +1124,10 @@ class Query(graphene.ObjectType):
         """Resolver: Notificaciones no leídas."""
         current_user = info.context.user
         
-        return Notification.objects.filter(
+        return optimize(Notification.objects.filter(
             user=current_user,
             leida=False
-        ).order_by('-created_at')
+        ), info).order_by('-created_at')
     
     @login_required
     def resolve_unread_count(self, info):
@@ -1170,92 +1145,18 @@ class Query(graphene.ObjectType):
     
     @login_required
     def resolve_dashboard_statistics(self, info):
-        """Resolver: Estadísticas del dashboard."""
+        """Resolver: Estadísticas del dashboard (snapshot cacheado, ver statistics.py)."""
         current_user = info.context.user
         
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return None
         
-        # Estadísticas de prácticas
-        practice_stats = Practice.objects.aggregate(
-            total=Count('id'),
-            draft=Count('id', filter=Q(status='DRAFT')),
-            pending=Count('id', filter=Q(status='PENDING')),
-            approved=Count('id', filter=Q(status='APPROVED')),
-            in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
-            completed=Count('id', filter=Q(status='COMPLETED')),
-            cancelled=Count('id', filter=Q(status='CANCELLED')),
-            avg_hours=Avg('horas_totales'),
-            avg_grade=Avg('calificacion_final', filter=Q(calificacion_final__isnull=False))
-        )
-        
-        # Estadísticas de estudiantes
-        student_stats = Student.objects.aggregate(
-            total=Count('id'),
-            eligible=Count('id', filter=Q(semestre_actual__gte=6, promedio_ponderado__gte=12.0)),
-            with_practice=Count('id', filter=Q(practices__status__in=['APPROVED', 'IN_PROGRESS'])),
-            avg_gpa=Avg('promedio_ponderado')
-        )
-        student_stats['without_practice'] = student_stats['total'] - student_stats['with_practice']
-        
-        # Estudiantes por semestre
-        by_semester = {}
-        for sem in range(1, 13):
-            count = Student.objects.filter(semestre_actual=sem).count()
-            by_semester[f'semestre_{sem}'] = count
-        student_stats['by_semester'] = by_semester
-        
-        # Estadísticas de empresas
-        company_stats = Company.objects.aggregate(
-            total=Count('id'),
-            active=Count('id', filter=Q(status='ACTIVE')),
-            pending=Count('id', filter=Q(status='PENDING_VALIDATION')),
-            suspended=Count('id', filter=Q(status='SUSPENDED')),
-            blacklisted=Count('id', filter=Q(status='BLACKLISTED')),
-            with_practices=Count('id', filter=Q(practices__isnull=False))
-        )
-        
-        # Empresas por sector
-        by_sector = {}
-        sectors = Company.objects.values_list('sector_economico', flat=True).distinct()
-        for sector in sectors:
-            if sector:
-                count = Company.objects.filter(sector_economico=sector).count()
-                by_sector[sector] = count
-        company_stats['by_sector'] = by_sector
-        
-        # Actividades recientes (últimas 10)
-        recent_activities = []
-        recent_practices = Practice.objects.select_related('student__user', 'company').order_by('-created_at')[:5]
-        for practice in recent_practices:
-            recent_activities.append({
-                'type': 'practice',
-                'action': 'created',
-                'description': f'Nueva práctica: {practice.titulo}',
-                'student': practice.student.user.get_full_name(),
-                'company': practice.company.razon_social,
-                'timestamp': practice.created_at.isoformat()
-            })
-        
-        recent_documents = Document.objects.select_related('practice__student__user', 'subido_por').order_by('-created_at')[:5]
-        for doc in recent_documents:
-            recent_activities.append({
-                'type': 'document',
-                'action': 'uploaded',
-                'description': f'Documento subido: {doc.nombre_archivo}',
-                'student': doc.practice.student.user.get_full_name(),
-                'uploaded_by': doc.subido_por.get_full_name(),
-                'timestamp': doc.created_at.isoformat()
-            })
-        
-        # Ordenar por timestamp y tomar los 10 más recientes
-        recent_activities = sorted(recent_activities, key=lambda x: x['timestamp'], reverse=True)[:10]
-        
+        snapshot = statistics.dashboard_statistics()
         return DashboardStatisticsType(
-            practices=PracticeStatisticsType(**practice_stats),
-            students=StudentStatisticsType(**student_stats),
-            companies=CompanyStatisticsType(**company_stats),
-            recent_activities=recent_activities
+            practices=PracticeStatisticsType(**snapshot['practices']),
+            students=StudentStatisticsType(**snapshot['students']),
+            companies=CompanyStatisticsType(**snapshot['companies']),
+            recent_activities=snapshot['recent_activities']
         )
     
     @login_required
@@ -1266,23 +1167,9 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return None
         
-        queryset = Practice.objects.all()
-        
-        if year:
-            queryset = queryset.filter(fecha_inicio__year=year)
-        
-        stats = queryset.aggregate(
-            total=Count('id'),
-            draft=Count('id', filter=Q(status='DRAFT')),
-            pending=Count('id', filter=Q(status='PENDING')),
-            approved=Count('id', filter=Q(status='APPROVED')),
-            in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
-            completed=Count('id', filter=Q(status='COMPLETED')),
-            cancelled=Count('id', filter=Q(status='CANCELLED')),
-            average_hours=Avg('horas_totales'),
-            average_grade=Avg('calificacion_final', filter=Q(calificacion_final__isnull=False))
+        stats = statistics.cached_snapshot(
+            f'practices:{year or "all"}', lambda: statistics.practice_statistics(year)
         )
-        
         return PracticeStatisticsType(**stats)
     
     @login_required
@@ -1293,22 +1180,7 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return None
         
-        stats = Student.objects.aggregate(
-            total=Count('id'),
-            eligible=Count('id', filter=Q(semestre_actual__gte=6, promedio_ponderado__gte=12.0)),
-            with_practice=Count('id', filter=Q(practices__status__in=['APPROVED', 'IN_PROGRESS'])),
-            average_gpa=Avg('promedio_ponderado')
-        )
-        
-        stats['without_practice'] = stats['total'] - stats['with_practice']
-        
-        # Por semestre
-        by_semester = {}
-        for sem in range(1, 13):
-            count = Student.objects.filter(semestre_actual=sem).count()
-            by_semester[f'semestre_{sem}'] = count
-        stats['by_semester'] = by_semester
-        
+        stats = statistics.cached_snapshot('students', statistics.student_statistics)
         return StudentStatisticsType(**stats)
     
     @login_required
@@ -1319,24 +1191,7 @@ class Query(graphene.ObjectType):
         if current_user.role not in ['COORDINADOR', 'SECRETARIA', 'ADMINISTRADOR']:
             return None
         
-        stats = Company.objects.aggregate(
-            total=Count('id'),
-            active=Count('id', filter=Q(status='ACTIVE')),
-            pending=Count('id', filter=Q(status='PENDING_VALIDATION')),
-            suspended=Count('id', filter=Q(status='SUSPENDED')),
-            blacklisted=Count('id', filter=Q(status='BLACKLISTED')),
-            with_practices=Count('id', filter=Q(practices__isnull=False))
-        )
-        
-        # Por sector
-        by_sector = {}
-        sectors = Company.objects.values_list('sector_economico', flat=True).distinct()
-        for sector in sectors:
-            if sector:
-                count = Company.objects.filter(sector_economico=sector).count()
-                by_sector[sector] = count
-        stats['by_sector'] = by_sector
-        
+        stats = statistics.cached_snapshot('companies', statistics.company_statistics)
         return CompanyStatisticsType(**stats)
 
     # ========================================================================
@@ -1361,15 +1216,15 @@ class Query(graphene.ObjectType):
     def resolve_school(self, info, id=None, codigo=None):
         """Resolver: Buscar escuela por ID o código."""
         if id:
-            return School.objects.get(pk=id)
+            return optimize(School.objects.all(), info).get(pk=id)
         elif codigo:
-            return School.objects.get(codigo=codigo)
+            return optimize(School.objects.all(), info).get(codigo=codigo)
         return None
     
     @login_required
     def resolve_schools(self, info, activa=None, search=None):
         """Resolver: Lista de escuelas profesionales."""
-        queryset = School.objects.select_related('coordinador').all()
+        queryset = optimize(School.objects.all(), info)
         
         if activa is not None:
             queryset = queryset.filter(activa=activa)
@@ -1410,12 +1265,12 @@ class Query(graphene.ObjectType):
     @login_required
     def resolve_branch(self, info, id):
         """Resolver: Buscar rama por ID."""
-        return Branch.objects.select_related('school').get(pk=id)
+        return optimize(Branch.objects.all(), info).get(pk=id)
     
     @login_required
     def resolve_branches(self, info, school_id=None, activa=None, search=None):
         """Resolver: Lista de ramas/especialidades."""
-        queryset = Branch.objects.select_related('school').all()
+        queryset = optimize(Branch.objects.all(), info)
         
         if school_id:
             queryset = queryset.filter(school_id=school_id)
@@ -1434,10 +1289,10 @@ class Query(graphene.ObjectType):
     @login_required
     def resolve_branches_by_school(self, info, school_id):
         """Resolver: Ramas de una escuela específica."""
-        return Branch.objects.filter(
+        return optimize(Branch.objects.filter(
             school_id=school_id,
             activa=True
-        ).order_by('nombre')
+        ), info).order_by('nombre')
     
     # ========================================================================
     # PRACTICE EVALUATION QUERIES (NUEVAS)
@@ -1474,10 +1329,7 @@ class Query(graphene.ObjectType):
     def resolve_evaluation(self, info, id):
         """Resolver: Buscar evaluación por ID."""
         current_user = info.context.user
-        evaluation = PracticeEvaluation.objects.select_related(
-            'practice', 'practice__student', 'practice__student__user',
-            'evaluator', 'approved_by'
-        ).get(pk=id)
+        evaluation = optimize(PracticeEvaluation.objects.all(), info).get(pk=id)
         
         # Verificar permisos
         if current_user.role == 'PRACTICANTE':
@@ -1494,10 +1346,7 @@ class Query(graphene.ObjectType):
                            tipo_evaluador=None, periodo_evaluacion=None, status=None):
         """Resolver: Lista de evaluaciones."""
         current_user = info.context.user
-        queryset = PracticeEvaluation.objects.select_related(
-            'practice', 'practice__student', 'practice__student__user',
-            'evaluator', 'approved_by'
-        ).all()
+        queryset = optimize(PracticeEvaluation.objects.all(), info)
         
         # Filtrar por rol
         if current_user.role == 'PRACTICANTE':
@@ -1525,13 +1374,13 @@ class Query(graphene.ObjectType):
         current_user = info.context.user
         
         if current_user.role == 'PRACTICANTE':
-            return PracticeEvaluation.objects.filter(
+            return optimize(PracticeEvaluation.objects.filter(
                 practice__student__user=current_user
-            ).select_related('practice', 'evaluator', 'approved_by').order_by('-fecha_evaluacion')
+            ), info).order_by('-fecha_evaluacion')
         elif current_user.role == 'SUPERVISOR':
-            return PracticeEvaluation.objects.filter(
+            return optimize(PracticeEvaluation.objects.filter(
                 evaluator=current_user
-            ).select_related('practice', 'practice__student__user', 'approved_by').order_by('-fecha_evaluacion')
+            ), info).order_by('-fecha_evaluacion')
         
         return []
     
@@ -1541,14 +1390,14 @@ class Query(graphene.ObjectType):
         current_user = info.context.user
         
         # Verificar permiso para ver la práctica
-        practice = Practice.objects.select_related('student__user').get(pk=practice_id)
+        practice = Practice.objects.get(pk=practice_id)
         
         if current_user.role == 'PRACTICANTE' and practice.student.user != current_user:
             raise Exception("No tienes permiso para ver estas evaluaciones")
         
-        return PracticeEvaluation.objects.filter(
+        return optimize(PracticeEvaluation.objects.filter(
             practice_id=practice_id
-        ).select_related('evaluator', 'approved_by').order_by('periodo_evaluacion')
+        ), info).order_by('periodo_evaluacion')
     
     # ========================================================================
     # PRACTICE STATUS HISTORY QUERIES (NUEVAS)
@@ -1572,24 +1421,22 @@ class Query(graphene.ObjectType):
         current_user = info.context.user
         
         # Verificar permiso para ver la práctica
-        practice = Practice.objects.select_related('student__user').get(pk=practice_id)
+        practice = Practice.objects.get(pk=practice_id)
         
         if current_user.role == 'PRACTICANTE' and practice.student.user != current_user:
             raise Exception("No tienes permiso para ver este historial")
         elif current_user.role == 'SUPERVISOR' and practice.supervisor.user != current_user:
             raise Exception("No tienes permiso para ver este historial")
         
-        return PracticeStatusHistory.objects.filter(
+        return optimize(PracticeStatusHistory.objects.filter(
             practice_id=practice_id
-        ).select_related('usuario_responsable').order_by('-fecha_cambio')
+        ), info).order_by('-fecha_cambio')
     
     @login_required
     def resolve_status_changes(self, info, estado_nuevo=None):
         """Resolver: Lista de cambios de estado."""
         current_user = info.context.user
-        queryset = PracticeStatusHistory.objects.select_related(
-            'practice', 'practice__student__user', 'usuario_responsable'
-        ).all()
+        queryset = optimize(PracticeStatusHistory.objects.all(), info)
         
         # Filtrar por rol
         if current_user.role == 'PRACTICANTE':
@@ -0,0 +1,176 @@
+"""
+Estadísticas del dashboard GraphQL con agregaciones condicionales.
+
+Cada bloque sale de un número fijo de consultas, independiente del número
+de semestres, sectores o estados:
+
+- prácticas: 1 agregación (``Count(filter=Q(...))`` por estado) + 1 para
+  el promedio de evaluaciones
+- estudiantes: 1 agregación (semestres como conteos condicionales y
+  "con práctica" como ``EXISTS``)
+- empresas: 1 agregación + 1 ``GROUP BY sector_economico``
+- actividad reciente: 2 consultas con ``select_related``
+
+El dashboard completo son 7 consultas. Los resultados son diccionarios
+serializables y se guardan como un snapshot en la caché compartida durante
+``GRAPHQL_STATISTICS_CACHE_TTL`` segundos (0 lo desactiva).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Exists, OuterRef, Q
+
+from src.adapters.secondary.database.models import (
+    Company, Document, Practice, PracticeEvaluation, Student,
+)
+
+CACHE_KEY = 'graphql:stats:{name}'
+SEMESTERS = range(1, 13)
+
+PRACTICE_STATES = {
+    'draft': 'BORRADOR',
+    'pending': 'PENDIENTE',
+    'approved': 'APROBADO',
+    'in_progress': 'EN_PROGRESO',
+    'completed': 'COMPLETADO',
+    'rejected': 'RECHAZADO',
+    'cancelled': 'CANCELADO',
+}
+
+COMPANY_STATES = {
+    'active': 'ACTIVO',
+    'pending': 'PENDIENTE',
+    'suspended': 'SUSPENDIDO',
+    'inactive': 'INACTIVO',
+}
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def cached_snapshot(name: str, builder):
+    """Snapshot ``builder()`` cacheado bajo ``name`` (TTL de settings)."""
+    ttl = int(getattr(settings, 'GRAPHQL_STATISTICS_CACHE_TTL', 60))
+    if ttl <= 0:
+        return builder()
+    key = CACHE_KEY.format(name=name)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = builder()
+        cache.set(key, snapshot, timeout=ttl)
+    return snapshot
+
+
+# ============================================================================
+# BLOQUES
+# ============================================================================
+
+def practice_statistics(year=None) -> dict:
+    """Conteos por estado y promedios de prácticas (2 consultas)."""
+    queryset = Practice.objects.all()
+    if year:
+        queryset = queryset.filter(fecha_inicio__year=year)
+
+    stats = queryset.aggregate(
+        total=Count('id'),
+        average_hours=Avg('horas_totales'),
+        **{
+            name: Count('id', filter=Q(estado=state))
+            for name, state in PRACTICE_STATES.items()
+        },
+    )
+    evaluations = PracticeEvaluation.objects.all()
+    if year:
+        evaluations = evaluations.filter(practica__fecha_inicio__year=year)
+    stats['average_grade'] = evaluations.aggregate(value=Avg('puntaje_total'))['value']
+
+    stats['average_hours'] = _float(stats['average_hours'])
+    stats['average_grade'] = _float(stats['average_grade'])
+    return stats
+
+
+def student_statistics() -> dict:
+    """Totales, elegibles y distribución por semestre (1 consulta)."""
+    in_practice = Practice.objects.filter(
+        practicante=OuterRef('pk'), estado__in=['APROBADO', 'EN_PROGRESO'],
+    )
+    stats = Student.objects.aggregate(
+        total=Count('id'),
+        eligible=Count('id', filter=Q(semestre__gte=6, promedio__gte=12)),
+        with_practice=Count('id', filter=Q(Exists(in_practice))),
+        average_gpa=Avg('promedio'),
+        **{
+            f'semestre_{semester}': Count('id', filter=Q(semestre=semester))
+            for semester in SEMESTERS
+        },
+    )
+    by_semester = {f'semestre_{semester}': stats.pop(f'semestre_{semester}') for semester in SEMESTERS}
+    stats['by_semester'] = by_semester
+    stats['without_practice'] = stats['total'] - stats['with_practice']
+    stats['average_gpa'] = _float(stats['average_gpa'])
+    return stats
+
+
+def company_statistics() -> dict:
+    """Conteos por estado y distribución por sector (2 consultas)."""
+    stats = Company.objects.aggregate(
+        total=Count('id'),
+        with_practices=Count('id', filter=Q(Exists(Practice.objects.filter(empresa=OuterRef('pk'))))),
+        **{
+            name: Count('id', filter=Q(estado=state))
+            for name, state in COMPANY_STATES.items()
+        },
+    )
+    sectors = (
+        Company.objects.exclude(sector_economico__isnull=True).exclude(sector_economico='')
+        .values('sector_economico')
+        .annotate(count=Count('id'))
+        .order_by('sector_economico')
+    )
+    stats['by_sector'] = {row['sector_economico']: row['count'] for row in sectors}
+    return stats
+
+
+def recent_activities(limit: int = 10) -> list:
+    """Últimas prácticas creadas y documentos subidos (2 consultas)."""
+    activities = []
+    practices = (
+        Practice.objects.select_related('practicante__usuario', 'empresa')
+        .order_by('-fecha_creacion')[:5]
+    )
+    for practice in practices:
+        activities.append({
+            'type': 'practice',
+            'action': 'created',
+            'description': f'Nueva práctica: {practice.titulo}',
+            'student': practice.practicante.usuario.get_full_name(),
+            'company': practice.empresa.razon_social,
+            'timestamp': practice.fecha_creacion.isoformat(),
+        })
+
+    documents = (
+        Document.objects.select_related('practice__practicante__usuario', 'subido_por')
+        .order_by('-created_at')[:5]
+    )
+    for document in documents:
+        activities.append({
+            'type': 'document',
+            'action': 'uploaded',
+            'description': f'Documento subido: {document.nombre_archivo}',
+            'student': document.practice.practicante.usuario.get_full_name(),
+            'uploaded_by': document.subido_por.get_full_name(),
+            'timestamp': document.created_at.isoformat(),
+        })
+
+    return sorted(activities, key=lambda item: item['timestamp'], reverse=True)[:limit]
+
+
+def dashboard_statistics() -> dict:
+    """Snapshot completo del dashboard (7 consultas, cacheado)."""
+    return cached_snapshot('dashboard', lambda: {
+        'practices': practice_statistics(),
+        'students': student_statistics(),
+        'companies': company_statistics(),
+        'recent_activities': recent_activities(),
+    })
@@ -0,0 +1,254 @@
+"""
+Trazas opcionales por campo de la ejecución GraphQL.
+
+Con ``GRAPHQL_TRACING_ENABLED`` activo, ``CustomGraphQLView`` añade
+``FieldTracingMiddleware`` a los middlewares de graphene y ejecuta cada
+operación dentro de ``trace(request)``, que registra por campo
+(``Tipo.campo``):
+
+- llamadas y tiempo de pared del resolver (sin contar los hijos: graphql
+  resuelve los subcampos después de que el resolver padre retorna)
+- consultas SQL (``connection.execute_wrapper``) y cuántas se repiten con
+  el mismo SQL y parámetros dentro de la request
+
+Las consultas que ocurren fuera de un resolver (p. ej. al iterar el
+QuerySet devuelto) se atribuyen al último campo resuelto, que es el que se
+está completando.
+
+Los usuarios staff reciben la traza en ``extensions.tracing``. Todas las
+trazas se agregan en un registro del proceso (histogramas de
+``middleware/timing.py``) que se publica en la caché compartida
+(``middleware/snapshots.py``) y se
+consulta con ``manage.py graphql_tracing``.
+
+Deshabilitado, ni el middleware ni el wrapper SQL se instalan: costo cero.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from src.infrastructure.middleware.snapshots import SnapshotPublisher
+from src.infrastructure.middleware.timing import LatencyHistogram
+
+_REQUEST_ATTR = '_graphql_trace'
+_CACHE_PREFIX = 'gql_tracing'
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'GRAPHQL_TRACING_ENABLED', False)
+
+
+class FieldStats:
+    """Acumulado de un campo (por request o en el registro del proceso)."""
+
+    __slots__ = ('calls', 'queries', 'duplicates', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.queries = 0
+        self.duplicates = 0
+        self.histogram = LatencyHistogram()
+
+    def merge(self, other: 'FieldStats') -> None:
+        self.calls += other.calls
+        self.queries += other.queries
+        self.duplicates += other.duplicates
+        self.histogram.merge(other.histogram)
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls, 'queries': self.queries,
+            'duplicates': self.duplicates, 'histogram': self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FieldStats':
+        stats = cls()
+        stats.calls = data['calls']
+        stats.queries = data['queries']
+        stats.duplicates = data['duplicates']
+        stats.histogram = LatencyHistogram.from_dict(data['histogram'])
+        return stats
+
+    def summary(self) -> dict:
+        histogram = self.histogram
+        return {
+            'calls': self.calls,
+            'total_ms': round(histogram.total / 1000, 3),
+            'max_ms': round(histogram.max / 1000, 3),
+            'p95_ms': round(histogram.percentile(95) / 1000, 3),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates,
+        }
+
+
+class RequestTrace:
+    """Traza de una request (campos, consultas y duplicados)."""
+
+    def __init__(self):
+        self.fields: Dict[str, FieldStats] = {}
+        self.queries = 0
+        self.duplicates = 0
+        self._seen = set()
+        self._active: List[str] = []
+        self._last: Optional[str] = None
+        self._start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def _stats(self, field: str) -> FieldStats:
+        stats = self.fields.get(field)
+        if stats is None:
+            stats = self.fields[field] = FieldStats()
+        return stats
+
+    def enter(self, field: str) -> None:
+        self._active.append(field)
+
+    def leave(self, field: str, micros: float) -> None:
+        self._active.pop()
+        self._last = field
+        stats = self._stats(field)
+        stats.calls += 1
+        stats.histogram.record(micros)
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper``: cuenta consultas y duplicados."""
+        key = (sql, repr(params))
+        duplicate = key in self._seen
+        self._seen.add(key)
+        self.queries += 1
+        self.duplicates += duplicate
+        field = self._active[-1] if self._active else self._last
+        if field is not None:
+            stats = self._stats(field)
+            stats.queries += 1
+            stats.duplicates += duplicate
+        return execute(sql, params, many, context)
+
+    def top(self, limit: int) -> List[dict]:
+        rows = [{'field': field, **stats.summary()} for field, stats in self.fields.items()]
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows[:limit]
+
+    def extensions(self, limit: int) -> dict:
+        return {
+            'duration_ms': round(self.elapsed * 1000, 3),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates,
+            'fields': self.top(limit),
+        }
+
+
+class FieldTracingMiddleware:
+    """Middleware de graphene: mide cada resolver de la request trazada."""
+
+    def resolve(self, next, root, info, **args):
+        trace = getattr(info.context, _REQUEST_ATTR, None)
+        if trace is None:
+            return next(root, info, **args)
+        field = f'{info.parent_type.name}.{info.field_name}'
+        trace.enter(field)
+        start = time.perf_counter()
+        try:
+            return next(root, info, **args)
+        finally:
+            trace.leave(field, (time.perf_counter() - start) * 1e6)
+
+
+@contextmanager
+def trace(request):
+    """Traza la ejecución de una operación y la agrega al registro."""
+    request_trace = RequestTrace()
+    setattr(request, _REQUEST_ATTR, request_trace)
+    try:
+        with connection.execute_wrapper(request_trace.sql_wrapper):
+            yield request_trace
+    finally:
+        request_trace.elapsed = time.perf_counter() - request_trace._start
+        setattr(request, _REQUEST_ATTR, None)
+        registry.record(request_trace)
+
+
+def top_limit() -> int:
+    return int(getattr(settings, 'GRAPHQL_TRACING_TOP_N', 20))
+
+
+# ============================================================================
+# REGISTRO DEL PROCESO
+# ============================================================================
+
+class TracingRegistry:
+    """Acumulado por campo del proceso y publicación en la caché compartida."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fields: Dict[str, FieldStats] = {}
+        self.publisher = SnapshotPublisher(_CACHE_PREFIX, 'GRAPHQL_TRACING_PUBLISH_INTERVAL')
+
+    def record(self, request_trace: RequestTrace) -> None:
+        with self._lock:
+            for field, stats in request_trace.fields.items():
+                current = self._fields.get(field)
+                if current is None:
+                    current = self._fields[field] = FieldStats()
+                current.merge(stats)
+        self._maybe_publish()
+
+    def snapshot(self) -> Dict[str, FieldStats]:
+        with self._lock:
+            return {field: FieldStats.from_dict(stats.to_dict()) for field, stats in self._fields.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._fields.clear()
+
+    def _maybe_publish(self) -> None:
+        self.publisher.maybe_publish(self._published_data)
+
+    def _published_data(self) -> dict:
+        return {field: stats.to_dict() for field, stats in self.snapshot().items()}
+
+    def publish(self) -> None:
+        """Guarda el snapshot del proceso en su ranura de la caché compartida."""
+        self.publisher.publish(self._published_data())
+
+
+registry = TracingRegistry()
+
+
+def collect(include_local: bool = True) -> Dict[str, FieldStats]:
+    """Combina los snapshots publicados por todos los procesos."""
+    merged: Dict[str, FieldStats] = {}
+
+    def _merge(field, stats):
+        if field in merged:
+            merged[field].merge(stats)
+        else:
+            merged[field] = stats
+
+    for snapshot in registry.publisher.published(exclude_own=include_local):
+        for field, data in snapshot.items():
+            _merge(field, FieldStats.from_dict(data))
+
+    if include_local:
+        for field, stats in registry.snapshot().items():
+            _merge(field, stats)
+    return merged
+
+
+def report(fields: Dict[str, FieldStats], limit: int = 20, order: str = 'total_ms') -> List[dict]:
+    """Top ``limit`` campos ordenados por ``order`` descendente."""
+    rows = [{'field': field, **stats.summary()} for field, stats in fields.items()]
+    rows.sort(key=lambda row: row[order], reverse=True)
+    return rows[:limit]
+
+
+def reset_all() -> None:
+    """Borra el registro local y los snapshots publicados."""
+    registry.reset()
+    registry.publisher.clear()
@@ -11,6 +11,7 @@ from src.adapters.secondary.database.models import (
     Permission, Role, RolePermission, UserPermission, Avatar,
     School, Branch, PracticeEvaluation, PracticeStatusHistory
 )
+from .dataloaders import cached_related, get_loaders
 
 
 class UserFilter(FilterSet):
@@ -39,6 +40,23 @@ class UserType(DjangoObjectType):
             'activo', 'ultimo_acceso', 'fecha_creacion', 'rol_id', 'escuela_id'
         )
     
+    # Campos legacy -> columnas / relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'full_name': ('nombres', 'apellidos'),
+        'nombre_completo': ('nombres', 'apellidos'),
+        'email': 'correo',
+        'first_name': 'nombres',
+        'last_name': 'apellidos',
+        'is_active': 'activo',
+        'last_login': 'ultimo_acceso',
+        'codigo_estudiante': None,  # DataLoader
+        'role_obj': 'rol_id',
+        'all_permissions': 'rol_id',
+        'permissions_info': 'rol_id',
+        'role_permissions': 'rol_id',
+        'permisos': 'rol_id',
+    }
+
     full_name = graphene.String()
     photo_url = graphene.String()
     # Alias en español para consumo de frontend
@@ -94,22 +112,14 @@ class UserType(DjangoObjectType):
 
     def resolve_codigo_estudiante(self, info):
         """Resuelve el código de estudiante si el usuario es PRACTICANTE."""
-        if hasattr(self, 'student_profile') and self.student_profile:
-            return self.student_profile.codigo
-        return None
+        profile = get_loaders(info.context).student_profiles.load(self.pk, parent=self)
+        return profile.codigo if profile else None
     
     def resolve_role_obj(self, info):
-        """Resuelve el objeto Role completo del usuario."""
-        # Primero intentar con role_obj (ForeignKey), luego con role (legacy)
-        if self.role_obj:
-            return self.role_obj
-        elif self.role:
-            from src.adapters.secondary.database.models import Role
-            try:
-                return Role.objects.get(code=self.role, is_active=True)
-            except Role.DoesNotExist:
-                return None
-        return None
+        """Resuelve el objeto Role completo del usuario (batch por request)."""
+        if self.rol_id_id is None:
+            return None
+        return cached_related(self, 'rol_id') or get_loaders(info.context).roles.load(self.rol_id_id, parent=self)
     
     def resolve_all_permissions(self, info):
         """Resuelve todos los permisos del usuario."""
@@ -118,26 +128,22 @@ class UserType(DjangoObjectType):
     
     def resolve_permissions_info(self, info):
         """Resuelve información detallada de permisos."""
-        from src.adapters.primary.graphql_api.types import UserPermissionsInfo
-        from src.adapters.secondary.database.models import Permission
+        loaders = get_loaders(info.context)
+        role = UserType.resolve_role_obj(self, info)
         
-        role_perms = []
-        if self.role_obj:
-            role_perms = list(self.role_obj.permissions.filter(is_active=True))
-        
-        custom_perms = list(self.custom_permissions.filter(
-            permission__is_active=True
-        ))
+        # TODOS los permisos del rol
+        role_perms = loaders.permissions_by_role.load(self.rol_id_id, parent=self)
+        custom_perms = loaders.custom_permissions_by_user.load(self.pk, parent=self)
         
         # Obtener permisos efectivos (códigos) y convertirlos a objetos Permission
         effective_codes = self.get_all_permissions()
-        effective_perms = list(Permission.objects.filter(
-            code__in=effective_codes,
-            is_active=True
-        ))
+        effective_perms = [
+            permission for permission in loaders.permissions_by_code.load_many(effective_codes)
+            if permission is not None
+        ]
         
         return UserPermissionsInfo(
-            role=self.role_obj,
+            role=role,
             role_permissions=role_perms,  # TODOS los permisos del rol
             effective_permissions=effective_perms,  # Solo permisos EFECTIVOS
             custom_permissions=custom_perms,
@@ -146,25 +152,19 @@ class UserType(DjangoObjectType):
     
     def resolve_role_permissions(self, info):
         """Resuelve los permisos del rol del usuario."""
-        from src.adapters.secondary.database.models import Role, Permission
-        try:
-            role = Role.objects.get(code=self.role, is_active=True)
-            return role.permissions.filter(is_active=True)
-        except Role.DoesNotExist:
-            return Permission.objects.none()
+        return get_loaders(info.context).permissions_by_role.load(self.rol_id_id, parent=self)
     
     def resolve_permisos(self, info):
         """Resuelve SOLO los permisos efectivos del usuario (campo simplificado)."""
-        from src.adapters.secondary.database.models import Permission
-        
         # Obtener códigos de permisos efectivos
         effective_codes = self.get_all_permissions()
         
-        # Convertir a objetos Permission
-        return Permission.objects.filter(
-            code__in=effective_codes,
-            is_active=True
-        ).order_by('module', 'code')
+        # Convertir a objetos Permission (batch por request)
+        permissions = get_loaders(info.context).permissions_by_code.load_many(effective_codes)
+        return sorted(
+            (permission for permission in permissions if permission is not None),
+            key=lambda permission: (permission.module or '', permission.codigo)
+        )
 
 
 class StudentFilter(FilterSet):
@@ -192,6 +192,19 @@ class StudentType(DjangoObjectType):
             'direccion', 'escuela', 'rama', 'cv_path', 'estado_academico', 'fecha_creacion'
         )
     
+    # Campos legacy -> columnas / relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'user': 'usuario',
+        'codigo_estudiante': 'codigo',
+        'semestre_actual': 'semestre',
+        'promedio_ponderado': 'promedio',
+        'carrera': 'escuela',
+        'puede_realizar_practica': ('semestre', 'promedio'),
+        'anio_ingreso': 'codigo',
+        'edad': 'fecha_nacimiento',
+        'practicas': None,  # DataLoader
+    }
+
     # Campos legacy para compatibilidad
     user = graphene.Field('src.adapters.primary.graphql_api.types.UserType')
     codigo_estudiante = graphene.String()
@@ -201,10 +214,13 @@ class StudentType(DjangoObjectType):
     puede_realizar_practica = graphene.Boolean()
     anio_ingreso = graphene.Int()
     edad = graphene.Int()
+    practicas = graphene.List('src.adapters.primary.graphql_api.types.PracticeType')
     
     def resolve_user(self, info):
         """Alias para usuario."""
-        return self.usuario
+        return cached_related(self, 'usuario') or get_loaders(info.context).users.load(
+            self.usuario_id, parent=self
+        )
     
     def resolve_codigo_estudiante(self, info):
         """Alias para codigo."""
@@ -239,6 +255,10 @@ class StudentType(DjangoObjectType):
         """Resuelve la edad del estudiante."""
         return self.edad
 
+    def resolve_practicas(self, info):
+        """Prácticas del estudiante (batch por request)."""
+        return get_loaders(info.context).practices_by_student.load(self.pk, parent=self)
+
 
 class CompanyFilter(FilterSet):
     """Filtros para empresas."""
@@ -265,6 +285,17 @@ class CompanyType(DjangoObjectType):
         # estado, validado_por, fecha_validacion, fecha_registro
         exclude = ('tamaño_empresa',)  # Excluir por caracteres especiales
     
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'tamano_empresa': 'tamaño_empresa',
+        'nombre_comercial': 'nombre',
+        'email': 'correo',
+        'status': 'estado',
+        'nombre_para_mostrar': ('razon_social', 'nombre'),
+        'puede_recibir_practicantes': 'estado',
+        'practicas': None,  # DataLoader
+    }
+
     # Campo con nombre ASCII para evitar caracteres especiales en GraphQL
     tamano_empresa = graphene.String(name='tamanoEmpresa')
     # Aliases legacy
@@ -273,6 +304,7 @@ class CompanyType(DjangoObjectType):
     status = graphene.String()
     nombre_para_mostrar = graphene.String()
     puede_recibir_practicantes = graphene.Boolean()
+    practicas = graphene.List('src.adapters.primary.graphql_api.types.PracticeType')
     
     def resolve_tamano_empresa(self, info):
         """Resuelve el tamaño de empresa desde el modelo."""
@@ -298,6 +330,10 @@ class CompanyType(DjangoObjectType):
         """Resuelve si puede recibir practicantes."""
         return self.estado == 'ACTIVO'
 
+    def resolve_practicas(self, info):
+        """Prácticas de la empresa (batch por request)."""
+        return get_loaders(info.context).practices_by_company.load(self.pk, parent=self)
+
 
 class SupervisorFilter(FilterSet):
     """Filtros para supervisores."""
@@ -324,13 +360,24 @@ class SupervisorType(DjangoObjectType):
         # Excluir campo con ñ para evitar conversión automática a camelCase inválido
         exclude = ('años_experiencia',)
 
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'anios_experiencia': 'años_experiencia',
+        'practicas': None,  # DataLoader
+    }
+
     # Campo con nombre ASCII para evitar caracteres especiales en GraphQL
     anios_experiencia = graphene.Int(name='aniosExperiencia')
+    practicas = graphene.List('src.adapters.primary.graphql_api.types.PracticeType')
     
     def resolve_anios_experiencia(self, info):
         """Resuelve los años de experiencia desde el modelo."""
         return self.años_experiencia
 
+    def resolve_practicas(self, info):
+        """Prácticas supervisadas (batch por request)."""
+        return get_loaders(info.context).practices_by_supervisor.load(self.pk, parent=self)
+
 
 class PracticeFilter(FilterSet):
     """Filtros para prácticas."""
@@ -364,6 +411,18 @@ class PracticeType(DjangoObjectType):
             'observaciones'
         )
 
+    # Campos legacy -> columnas / relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'student': 'practicante',
+        'company': 'empresa',
+        'status': 'estado',
+        'created_at': 'fecha_creacion',
+        'updated_at': 'fecha_actualizacion',
+        'duracion_dias': ('fecha_inicio', 'fecha_fin'),
+        'esta_activa': 'estado',
+        'progreso_porcentual': ('horas_totales', 'horas_completadas'),
+    }
+
     # Resolvers para campos legacy (compatibilidad)
     student = graphene.Field('src.adapters.primary.graphql_api.types.StudentType')
     company = graphene.Field('src.adapters.primary.graphql_api.types.CompanyType')
@@ -376,11 +435,15 @@ class PracticeType(DjangoObjectType):
     
     def resolve_student(self, info):
         """Compatibilidad: student mapea a practicante."""
-        return self.practicante
+        return cached_related(self, 'practicante') or get_loaders(info.context).students.load(
+            self.practicante_id, parent=self
+        )
     
     def resolve_company(self, info):
         """Compatibilidad: company mapea a empresa."""
-        return self.empresa
+        return cached_related(self, 'empresa') or get_loaders(info.context).companies.load(
+            self.empresa_id, parent=self
+        )
     
     def resolve_status(self, info):
         """Compatibilidad: status mapea a estado."""
@@ -431,6 +494,14 @@ class DocumentType(DjangoObjectType):
         # Excluir campo con ñ para evitar conversión automática a camelCase inválido
         exclude = ('tamaño_bytes',)
 
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'tamano_bytes': 'tamaño_bytes',
+        'tamano_legible': 'tamaño_bytes',
+        'es_imagen': 'mime_type',
+        'es_pdf': 'mime_type',
+    }
+
     # Campos con nombres ASCII para evitar caracteres especiales en GraphQL
     tamano_bytes = graphene.Int(name='tamanoBytes')
     tamano_legible = graphene.String(name='tamanoLegible')
@@ -479,6 +550,12 @@ class NotificationType(DjangoObjectType):
             'fecha_lectura', 'accion_url', 'created_at', 'updated_at'
         )
 
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'user': 'user_id',
+        'es_importante': 'tipo',
+    }
+
     es_importante = graphene.Boolean()
     
     def resolve_user(self, info):
@@ -598,6 +675,16 @@ class RoleType(DjangoObjectType):
         # Campos reales: id, nombre, descripcion, permisos, fecha_creacion
         fields = ('id', 'nombre', 'descripcion', 'permisos', 'fecha_creacion')
     
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'code': 'nombre',
+        'name': 'nombre',
+        'description': 'descripcion',
+        'permissions': 'permisos',
+        'permissions_count': 'permisos',
+        'users_count': None,  # DataLoader
+    }
+
     # Resolvers para campos legacy (compatibilidad)
     code = graphene.String()
     name = graphene.String()
@@ -619,16 +706,16 @@ class RoleType(DjangoObjectType):
         return self.descripcion
     
     def resolve_permissions(self, info):
-        """Resuelve los permisos del rol (desde tabla upeu_permiso si existe)."""
-        return self.permissions.filter(is_active=True)
+        """Resuelve los permisos del rol (códigos del JSONB ``permisos``)."""
+        return get_loaders(info.context).permissions_by_role.load(self.pk, parent=self)
     
     def resolve_permissions_count(self, info):
         """Cuenta los permisos activos del rol."""
-        return self.permissions.filter(is_active=True).count()
+        return len(get_loaders(info.context).permissions_by_role.load(self.pk, parent=self))
     
     def resolve_users_count(self, info):
         """Cuenta los usuarios activos con este rol."""
-        return User.objects.filter(rol=self, activo=True).count()
+        return get_loaders(info.context).users_count_by_role.load(self.pk, parent=self)
 
 
 class UserPermissionType(DjangoObjectType):
@@ -726,6 +813,16 @@ class SchoolType(DjangoObjectType):
             'id', 'codigo', 'nombre', 'descripcion', 'estado', 'fecha_creacion'
         )
     
+    # Campos legacy -> columnas (ver optimizer.py)
+    optimizer_hints = {
+        'activa': 'estado',
+        'created_at': 'fecha_creacion',
+        'coordinador_nombre': None,
+        'total_estudiantes': None,
+        'total_ramas': None,
+        'ramas': None,  # Filtra por activa: no usa el prefetch
+    }
+
     # Resolvers para campos legacy (compatibilidad)
     activa = graphene.Boolean()
     created_at = graphene.DateTime()
@@ -780,6 +877,15 @@ class BranchType(DjangoObjectType):
             'id', 'nombre', 'descripcion', 'escuela', 'activa', 'fecha_creacion'
         )
     
+    # Campos legacy -> columnas / relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'school': 'escuela',
+        'created_at': 'fecha_creacion',
+        'escuela_nombre': 'escuela__nombre',
+        'escuela_codigo': 'escuela__codigo',
+        'total_estudiantes': None,
+    }
+
     # Resolvers para campos legacy (compatibilidad)
     school = graphene.Field('src.adapters.primary.graphql_api.types.SchoolType')
     created_at = graphene.DateTime()
@@ -832,6 +938,19 @@ class PracticeEvaluationType(DjangoObjectType):
             'comentarios', 'recomendaciones'
         )
     
+    # Campos legacy -> columnas / relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'practice': 'practica',
+        'evaluator': 'evaluador',
+        'created_at': 'fecha_evaluacion',
+        'updated_at': 'fecha_evaluacion',
+        'status': None,
+        'status_display': None,
+        'practica_titulo': 'practica__titulo',
+        'estudiante_nombre': 'practica__practicante__usuario',
+        'evaluador_nombre': 'evaluador',
+    }
+
     # Resolvers para campos legacy (compatibilidad)
     practice = graphene.Field('src.adapters.primary.graphql_api.types.PracticeType')
     evaluator = graphene.Field('src.adapters.primary.graphql_api.types.UserType')
@@ -907,6 +1026,12 @@ class PracticeStatusHistoryType(DjangoObjectType):
             'usuario_responsable', 'motivo', 'metadata', 'fecha_cambio'
         )
     
+    # Campos calculados -> relaciones (ver optimizer.py)
+    optimizer_hints = {
+        'practica_titulo': 'practice__titulo',
+        'responsable_nombre': 'usuario_responsable',
+    }
+
     practica_titulo = graphene.String()
     responsable_nombre = graphene.String()
     
@@ -9,14 +9,33 @@ Este módulo configura el endpoint GraphQL con soporte para:
 - CORS y seguridad
 """
 
+from django.db import connection, transaction
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django.urls import path
 from django.views.generic import TemplateView, RedirectView
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
-from graphene_django.views import GraphQLView
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.utils.utils import set_rollback
+from graphene_django.views import GraphQLView, HttpError
+from graphql import ExecutionResult, GraphQLError, OperationType, execute, get_operation_ast, parse, validate_schema
+from graphql.validation import validate
 from graphql_jwt.decorators import jwt_cookie
 
+from src.infrastructure.security.logging import get_client_ip
+from src.infrastructure.security.rate_limiter import charge
+from src.infrastructure.security.throttling import LoginRateThrottle
+from src.infrastructure.security.token_channel import apply_token_cookies
+
 # Importar schema completo (queries_complete + mutations_complete)
+from . import cost as query_cost
+from . import tracing
+from .dataloaders import BatchingExecutionContext
+from .document_cache import document_key, get_document_cache
+from .envelope import LOGIN_ROOT_FIELDS, collect_root_fields, get_graphql_envelope
+from .persisted_queries import PersistedQueryError, get_persisted_hash, resolve_query
 from .schema import schema
 
 
@@ -31,88 +50,293 @@ class CustomGraphQLView(GraphQLView):
     - Manejo de errores mejorado
     - Logging de queries
     - CORS headers
+    - DataLoaders por request (batching de resolvers por hermanos)
+    - Caché LRU de documentos parseados y validados
+    - Automatic Persisted Queries (hash en ``extensions.persistedQuery``)
+    - Análisis de coste/profundidad con presupuesto por rol
+    - Trazas opcionales por campo (``GRAPHQL_TRACING_ENABLED``)
+    - Batching: un POST con una lista de operaciones responde una lista
     """
     
+    execution_context_class = BatchingExecutionContext
+    
+    def parse_body(self, request):
+        """Reutiliza el cuerpo ya decodificado por el envelope de la request."""
+        envelope = get_graphql_envelope(request)
+        data = envelope.data
+        expected = list if self.batch else dict  # QueryDict es un dict
+        if envelope.error is None and isinstance(data, expected):
+            return data
+        # Cuerpo inválido (p. ej. un escalar JSON): graphene responde el 400
+        return super().parse_body(request)
+    
+    def _enable_batch(self, request):
+        """
+        Activa el modo batch de graphene si el POST trae una lista de
+        operaciones (la vista se instancia por request). Las operaciones
+        comparten la request: DataLoaders, caché de permisos, usuario JWT y
+        el cobro acumulado de coste/rate limiting.
+        
+        Returns:
+            Mensaje de error si el batch no es válido, None si no
+        """
+        if request.method != 'POST':
+            return None
+        envelope = get_graphql_envelope(request)
+        if not envelope.is_batch:
+            return None
+        if not getattr(settings, 'GRAPHQL_BATCH_ENABLED', True):
+            return 'El batching de operaciones GraphQL está deshabilitado.'
+        operations = envelope.data
+        max_operations = int(getattr(settings, 'GRAPHQL_BATCH_MAX_OPERATIONS', 10))
+        if not operations or not all(isinstance(entry, dict) for entry in operations):
+            return 'El batch debe ser una lista no vacía de operaciones.'
+        if len(operations) > max_operations:
+            return f'El batch excede el máximo de {max_operations} operaciones.'
+        if envelope.is_login:
+            # Los logins tienen su propio bucket de rate limiting y cookies
+            return 'El login no puede enviarse dentro de un batch.'
+        self.batch = True
+        return None
+    
+    def execute_graphql_request(self, request, data, query, variables, operation_name,
+                                show_graphiql=False):
+        """
+        Igual que graphene, pero el parse + validación sale de la caché de
+        documentos cuando la query ya se vio antes. Antes se resuelve el
+        protocolo APQ (hash -> texto de la query); después de validar se
+        analiza el coste de la operación (``cost.py``).
+        """
+        try:
+            query = resolve_query(data, query)
+        except PersistedQueryError as e:
+            return ExecutionResult(errors=[e.as_graphql_error()])
+        
+        if not query:
+            return super().execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql
+            )
+        
+        schema = self.schema.graphql_schema
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+        
+        cache = get_document_cache()
+        key = document_key(schema, query, self.validation_rules) if cache.enabled else None
+        document = cache.get(key) if key is not None else None
+        cached = document is not None
+        if not cached:
+            try:
+                document = parse(query)
+            except Exception as e:
+                return ExecutionResult(errors=[e])
+        
+        operation_ast = get_operation_ast(document, operation_name)
+        if (
+            request.method.lower() == 'get'
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ['POST'],
+                    f"Can only perform a {operation_ast.operation.value} operation from a POST request.",
+                )
+            )
+        
+        if not cached:
+            validation_errors = validate(
+                schema, document, self.validation_rules, graphene_settings.MAX_VALIDATION_ERRORS
+            )
+            if validation_errors:
+                return ExecutionResult(data=None, errors=validation_errors)
+            if key is not None:
+                cache.put(key, document)
+        
+        if operation_ast is None:
+            return self._execute_document(request, schema, document, operation_ast, variables, operation_name)
+        
+        analysis = query_cost.analyze(schema, document, operation_ast, variables)
+        budget = query_cost.budget_for(getattr(request, 'user', None))
+        units = query_cost.rate_units(analysis.cost)
+        extensions = {'cost': query_cost.cost_extensions(analysis, budget, units)}
+        
+        # En un batch el presupuesto del rol cubre la suma de las operaciones
+        batch_cost = getattr(request, '_graphql_batch_cost', 0) + analysis.cost
+        if self.batch:
+            extensions['cost']['batchQueryCost'] = batch_cost
+        
+        error = query_cost.check(analysis._replace(cost=batch_cost), budget)
+        if error is None:
+            # El bucket se decide por los campos raíz de la operación validada
+            # que se va a ejecutar (no por operationName ni por el cuerpo crudo)
+            if LOGIN_ROOT_FIELDS.intersection(collect_root_fields(document, operation_ast)):
+                error = self._charge_login(request)
+            else:
+                error = self._charge_cost(request, units)
+        if error is not None:
+            return ExecutionResult(errors=[error], extensions=extensions)
+        request._graphql_batch_cost = batch_cost
+        
+        result = self._execute_document(request, schema, document, operation_ast, variables, operation_name)
+        result.extensions = {**(result.extensions or {}), **extensions}
+        return result
+    
+    def _charge_cost(self, request, units):
+        """
+        Cobra el coste de la operación al bucket 'graphql' del rate limiter
+        (el mismo que ``RateLimitMiddleware``). Las operaciones de un batch se
+        acumulan sobre la misma request.
+        """
+        total = getattr(request, '_graphql_cost_units', 0) + units
+        request._graphql_cost_units = total
+        result = charge(
+            request,
+            f"graphql:{get_client_ip(request) or 'unknown'}",
+            int(getattr(settings, 'RATE_LIMIT_REQUESTS_PER_MINUTE', 120)),
+            60,
+            cost=total,
+        )
+        if result.allowed:
+            return None
+        return GraphQLError(
+            'Demasiadas consultas costosas. Intenta nuevamente más tarde.',
+            extensions={'code': query_cost.RATE_LIMITED, 'retryAfter': int(result.retry_after) + 1},
+        )
+    
+    def _charge_login(self, request):
+        """Cobra un login al bucket 'login' (el mismo ``LoginRateThrottle`` del login REST)."""
+        throttle = LoginRateThrottle()
+        if throttle.allow_request(request, self):
+            return None
+        return GraphQLError(
+            'Demasiados intentos de login. Intenta nuevamente más tarde.',
+            extensions={'code': query_cost.RATE_LIMITED, 'retryAfter': int(throttle.wait() or 0) + 1},
+        )
+    
+    def get_response(self, request, data, show_graphiql=False):
+        """Igual que graphene, pero incluye ``extensions`` del resultado."""
+        if self.batch:
+            # Cada operación del batch decide su propio rollback de mutation
+            setattr(request, MUTATION_ERRORS_FLAG, False)
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        
+        if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+            set_rollback()
+        
+        if not execution_result:
+            return None, 200
+        
+        status_code = 200
+        response = {}
+        if execution_result.errors:
+            set_rollback()
+            response['errors'] = [self.format_error(e) for e in execution_result.errors]
+        
+        if execution_result.errors and any(not getattr(e, 'path', None) for e in execution_result.errors):
+            status_code = 400
+        else:
+            response['data'] = execution_result.data
+        
+        if execution_result.extensions:
+            response['extensions'] = execution_result.extensions
+        
+        if self.batch:
+            response['id'] = id
+            response['status'] = status_code
+        
+        return self.json_encode(request, response, pretty=show_graphiql), status_code
+    
+    def get_middleware(self, request):
+        """Middlewares de graphene (+ trazas por campo si están activas)."""
+        middleware = super().get_middleware(request)
+        if tracing.is_enabled():
+            middleware = [tracing.FieldTracingMiddleware(), *(middleware or [])]
+        return middleware
+    
+    def _execute_document(self, request, schema, document, operation_ast, variables, operation_name):
+        """Ejecuta un documento ya validado, trazado si está activo."""
+        if not tracing.is_enabled():
+            return self._execute(request, schema, document, operation_ast, variables, operation_name)
+        
+        with tracing.trace(request) as request_trace:
+            result = self._execute(request, schema, document, operation_ast, variables, operation_name)
+        user = getattr(request, 'user', None)
+        if getattr(user, 'is_staff', False):
+            result.extensions = {
+                **(result.extensions or {}),
+                'tracing': request_trace.extensions(tracing.top_limit()),
+            }
+        return result
+    
+    def _execute(self, request, schema, document, operation_ast, variables, operation_name):
+        """Ejecuta un documento ya validado (mutations atómicas como en graphene)."""
+        try:
+            execute_options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                execute_options['execution_context_class'] = self.execution_context_class
+            
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get('ATOMIC_MUTATIONS', False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+            
+            return execute(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+    
     def dispatch(self, request, *args, **kwargs):
         """Procesa la petición con soporte para JWT y cookies."""
+        batch_error = self._enable_batch(request)
+        if batch_error is not None:
+            return JsonResponse({'errors': [{'message': batch_error}]}, status=400)
+        
         response = super().dispatch(request, *args, **kwargs)
         
+        # Persisted queries por GET: cacheables por el navegador (nunca por
+        # proxies compartidos, la respuesta depende del usuario)
+        max_age = int(getattr(settings, 'GRAPHQL_APQ_GET_MAX_AGE', 0))
+        if (
+            max_age > 0
+            and request.method == 'GET'
+            and response.status_code == 200
+            and get_persisted_hash(request.GET)
+        ):
+            patch_cache_control(response, private=True, max_age=max_age)
+            patch_vary_headers(response, ('Cookie', 'Authorization'))
+        
         # Configurar CORS headers si es necesario
         if settings.DEBUG:
             response['Access-Control-Allow-Origin'] = '*'
             response['Access-Control-Allow-Methods'] = 'POST, GET, OPTIONS'
             response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
         
-        # Gestión de cookies JWT
+        # Cookies JWT: solo desde el canal de tokens de la request
+        # (publicado por jwtLogin/jwtRefresh/jwtLogout, sin parsear la respuesta)
         try:
-            import json
-            
-            jwt_settings = getattr(settings, 'GRAPHQL_JWT', {})
-            cookie_name = jwt_settings.get('JWT_COOKIE_NAME', 'JWT')
-            refresh_cookie_name = jwt_settings.get('JWT_REFRESH_TOKEN_COOKIE_NAME', 'JWT_REFRESH_TOKEN')
-            secure = jwt_settings.get('JWT_COOKIE_SECURE', not settings.DEBUG)
-            samesite = jwt_settings.get('JWT_COOKIE_SAMESITE', 'Lax')
-            path = '/'
-            
-            def _set_cookie(name, value, max_age=None):
-                """Helper para establecer cookies HttpOnly."""
-                if value:
-                    response.set_cookie(
-                        name,
-                        value,
-                        httponly=True,
-                        secure=secure,
-                        samesite=samesite,
-                        path=path,
-                        max_age=max_age,
-                    )
-            
-            # TTLs de cookies
-            access_ttl = 60 * 15  # 15 minutos
-            refresh_ttl = 60 * 60 * 24 * 7  # 7 días
-            
-            # 1) Tokens desde request._jwt_tokens (establecidos por mutations)
-            req_tokens = getattr(request, '_jwt_tokens', None)
-            if isinstance(req_tokens, dict):
-                _set_cookie(cookie_name, req_tokens.get('access'), max_age=access_ttl)
-                _set_cookie(refresh_cookie_name, req_tokens.get('refresh'), max_age=refresh_ttl)
-            
-            # 2) Parsear respuesta para TokenAuth/RefreshToken
-            if request.method == 'POST' and hasattr(response, 'content'):
-                try:
-                    body = json.loads(request.body.decode('utf-8'))
-                    query = (body.get('query') or '').replace('\n', ' ')
-                    op_name = body.get('operationName') or ''
-                    
-                    content = response.content.decode('utf-8')
-                    data = json.loads(content)
-                    payload = (data or {}).get('data') or {}
-                    
-                    # TokenAuth mutation
-                    if 'tokenAuth' in query.lower() or op_name == 'TokenAuth':
-                        token_data = payload.get('tokenAuth') or {}
-                        access = token_data.get('token')
-                        refresh = token_data.get('refreshToken')
-                        _set_cookie(cookie_name, access, max_age=access_ttl)
-                        _set_cookie(refresh_cookie_name, refresh, max_age=refresh_ttl)
-                    
-                    # RefreshToken mutation
-                    if 'refreshtoken' in query.lower() or op_name == 'RefreshToken':
-                        token_data = payload.get('refreshToken') or {}
-                        access = token_data.get('token')
-                        refresh = token_data.get('refreshToken')
-                        _set_cookie(cookie_name, access, max_age=access_ttl)
-                        if refresh:
-                            _set_cookie(refresh_cookie_name, refresh, max_age=refresh_ttl)
-                    
-                    # Logout mutation - limpiar cookies
-                    if 'logout' in query.lower() or op_name == 'Logout':
-                        response.delete_cookie(cookie_name, path=path, samesite=samesite)
-                        response.delete_cookie(refresh_cookie_name, path=path, samesite=samesite)
-                
-                except Exception:
-                    pass
-        
+            apply_token_cookies(request, response)
         except Exception:
             # No bloquear la respuesta si falla gestión de cookies
             pass
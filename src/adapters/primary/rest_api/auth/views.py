@@ -7,11 +7,12 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions, serializers
 from rest_framework.request import Request
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from django.contrib.auth import get_user_model, authenticate
 from django.conf import settings
+from src.infrastructure.security.jwt_auth import FilteredRefreshToken, JWTAuthenticationService
+from src.infrastructure.security.throttling import AnonRateThrottle, LoginRateThrottle
 import logging
 
 User = get_user_model()
@@ -86,8 +87,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 'detail': 'Usuario inactivo'
             })
         
-        # Generar tokens
-        refresh = self.get_token(user)
+        # Generar tokens: OutstandingToken + ultimo_acceso en una sola transacción.
+        # El backend ya cargó rol y perfiles con select_related (una consulta).
+        refresh = JWTAuthenticationService.issue_login_tokens(user, self.get_token)
         
         # Guardar usuario para usarlo después
         self.user = user
@@ -166,6 +168,8 @@ class LoginView(TokenObtainPairView):
     """
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [permissions.AllowAny]
+    # Bucket 'login' por IP (mismo motor y clave que el login GraphQL)
+    throttle_classes = [AnonRateThrottle, LoginRateThrottle]
     
     def post(self, request, *args, **kwargs):
         # Soporte para 'email', 'username' o 'correo'
@@ -213,6 +217,11 @@ class LoginView(TokenObtainPairView):
 # REFRESH TOKEN VIEW (POST /api/v1/auth/refresh/)
 # ============================================================================
 
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh con verificación de blacklist desde el filtro de JTIs en memoria."""
+    token_class = FilteredRefreshToken
+
+
 class RefreshTokenView(TokenRefreshView):
     """
     Vista para refrescar el access token.
@@ -229,6 +238,7 @@ class RefreshTokenView(TokenRefreshView):
     }
     """
     permission_classes = [permissions.AllowAny]
+    serializer_class = FilteredTokenRefreshSerializer
 
 
 # ============================================================================
@@ -262,7 +272,7 @@ class LogoutView(APIView):
             refresh_token = request.data.get('refresh')
             if refresh_token:
                 try:
-                    token = RefreshToken(refresh_token)
+                    token = FilteredRefreshToken(refresh_token)
                     token.blacklist()
                     logger.info(f"LOGOUT_SUCCESS: Refresh token blacklisted")
                 except Exception as e:
@@ -0,0 +1 @@
+# Management package for REST API utilities
@@ -0,0 +1,134 @@
+"""
+Comando de gestión para medir páginas profundas: offset vs keyset.
+"""
+
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+
+from src.adapters.primary.rest_api import viewsets
+from src.adapters.primary.rest_api.pagination import (
+    keyset_filter, order_expressions, resolve_ordering,
+)
+
+RESOURCES = {
+    'practices': viewsets.PracticeViewSet,
+    'documents': viewsets.DocumentViewSet,
+    'notifications': viewsets.NotificationViewSet,
+    'status-history': viewsets.PracticeStatusHistoryViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = 'Mide la latencia de una página profunda con PageNumberPagination y con keyset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resource',
+            choices=sorted(RESOURCES),
+            action='append',
+            help='Recurso a medir (repetible; default: todos)'
+        )
+
+        parser.add_argument(
+            '--page',
+            type=int,
+            default=500,
+            help='Página a medir (default: 500)'
+        )
+
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=20,
+            help='Tamaño de página (default: 20)'
+        )
+
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Repeticiones por modo (default: 5)'
+        )
+
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Salida en JSON'
+        )
+
+    def handle(self, *args, **options):
+        if options['page'] < 1 or options['page_size'] < 1 or options['repeat'] < 1:
+            raise CommandError('--page, --page-size y --repeat deben ser positivos')
+
+        rows = [
+            self._measure(name, RESOURCES[name], options)
+            for name in options['resource'] or sorted(RESOURCES)
+        ]
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        header = (
+            f"{'Recurso':<16} {'filas':>9} {'página':>7} "
+            f"{'offset ms':>10} {'keyset ms':>10} {'mejora':>8}"
+        )
+        self.stdout.write(self.style.SUCCESS(header))
+        for row in rows:
+            if row['offset_ms'] is None:
+                self.stdout.write(f"{row['resource']:<16} {row['rows']:>9} {'(tabla más corta que la página)':>37}")
+                continue
+            self.stdout.write(
+                f"{row['resource']:<16} {row['rows']:>9} {row['page']:>7} "
+                f"{row['offset_ms']:>10.2f} {row['keyset_ms']:>10.2f} {row['speedup'] or 0:>7.1f}x"
+            )
+
+    def _measure(self, name, viewset, options):
+        """Mediana de la página ``page`` en ambos modos con el orden por defecto."""
+        page, size, repeat = options['page'], options['page_size'], options['repeat']
+        queryset = viewset.queryset.order_by(*viewset.ordering)
+        columns = resolve_ordering(queryset)
+        ordered = queryset.order_by(*order_expressions(columns, reverse=False))
+
+        total = queryset.count()
+        result = {'resource': name, 'rows': total, 'page': page,
+                  'offset_ms': None, 'keyset_ms': None, 'speedup': None}
+        offset = (page - 1) * size
+        if offset >= total:
+            return result
+
+        # Cursor equivalente al final de la página anterior (fuera de la medición)
+        if offset:
+            boundary = ordered[offset - 1]
+            values = [getattr(boundary, field.attname) for field, _ in columns]
+            keyset = ordered.filter(keyset_filter(columns, values))
+        else:
+            keyset = ordered
+
+        def offset_page():
+            # Lo que hace PageNumberPagination: COUNT(*) + OFFSET
+            return list(Paginator(ordered, size).page(page).object_list)
+
+        def keyset_page():
+            return list(keyset[:size + 1])[:size]
+
+        offset_ms = self._median_ms(offset_page, repeat)
+        keyset_ms = self._median_ms(keyset_page, repeat)
+        result.update({
+            'offset_ms': round(offset_ms, 3),
+            'keyset_ms': round(keyset_ms, 3),
+            'speedup': round(offset_ms / keyset_ms, 2) if keyset_ms else None,
+        })
+        return result
+
+    @staticmethod
+    def _median_ms(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
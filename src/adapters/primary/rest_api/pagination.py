@@ -0,0 +1,287 @@
+"""
+Paginación keyset (cursor) para ViewSets con tablas grandes.
+
+``PageNumberPagination`` ejecuta en cada listado un ``COUNT(*)`` y un
+``OFFSET`` que recorre todas las filas anteriores: la página 500 lee
+10.000 filas para devolver 20. ``KeysetPagination`` en cambio:
+
+- ordena por el ordenamiento vigente del ViewSet (``ordering`` /
+  ``?ordering=`` validado por ``OrderingFilter`` contra
+  ``ordering_fields``) más el id como desempate
+- pide la página siguiente con ``WHERE (c1, c2, ..., id) > (cursor)``
+  expandido por columna, así el coste no crece con la profundidad
+- no ejecuta ``COUNT(*)``: lee una fila de más para saber si hay siguiente
+- codifica el cursor (base64 opaco) con las columnas y sus valores; un
+  cursor de otro ordenamiento se rechaza
+
+Los NULL de cada columna van siempre al final (en ambas direcciones).
+
+``PageOrCursorPagination`` mantiene la respuesta de ``PageNumberPagination``
+y activa el keyset por request (``?paginate=cursor``) o por ViewSet
+(``pagination_mode = 'cursor'``; ``?paginate=page`` vuelve al offset).
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR = 'cursor'
+PAGE = 'page'
+
+
+def _encode_value(value):
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(keys, values, reverse=False) -> str:
+    payload = {'k': list(keys), 'v': [_encode_value(value) for value in values]}
+    if reverse:
+        payload['r'] = 1
+    data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_cursor(cursor: str, keys):
+    """(valores, reverse) del cursor; 404 si no corresponde al ordenamiento."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        cursor_keys, values = payload['k'], payload['v']
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise NotFound(KeysetPagination.invalid_cursor_message)
+    if cursor_keys != list(keys) or len(values) != len(cursor_keys):
+        raise NotFound(KeysetPagination.invalid_cursor_message)
+    return values, bool(payload.get('r'))
+
+
+def _columns(model, ordering):
+    """Columnas ``(campo, descending)`` o None si algún término no es un campo."""
+    columns = []
+    for name in ordering:
+        if not isinstance(name, str):
+            return None
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        try:
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        except Exception:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        if any(field is seen for seen, _ in columns):
+            continue
+        columns.append((field, descending))
+        if field.primary_key:
+            break
+    return columns
+
+
+def resolve_ordering(queryset, default=None):
+    """
+    Columnas ``(campo, descending)`` del ordenamiento de ``queryset`` con el
+    id como desempate final.
+
+    Solo admite campos concretos del modelo (los ``ordering_fields`` de los
+    ViewSets); un ordenamiento por expresión o relación no es paginable por
+    keyset y cae en ``default``, en el ``Meta.ordering`` o en ``-id``.
+    """
+    model = queryset.model
+    for ordering in (queryset.query.order_by, default, model._meta.ordering):
+        columns = _columns(model, ordering or ())
+        if columns:
+            break
+    else:
+        columns = []
+
+    pk = model._meta.pk
+    if not columns or not columns[-1][0].primary_key:
+        # Desempate estable por id en la dirección de la última columna
+        columns.append((pk, columns[-1][1] if columns else True))
+    return columns
+
+
+def order_expressions(columns, reverse=False):
+    """``ORDER BY`` de las columnas (invertido si ``reverse``), NULLs al final."""
+    expressions = []
+    for field, descending in columns:
+        expression = F(field.name)
+        if descending != reverse:
+            expressions.append(expression.desc(nulls_first=reverse or None, nulls_last=not reverse or None))
+        else:
+            expressions.append(expression.asc(nulls_first=reverse or None, nulls_last=not reverse or None))
+    return expressions
+
+
+def _strictly(field, descending, value, reverse):
+    """Filas después (o antes, si ``reverse``) de ``value`` en una columna."""
+    if value is None:
+        # NULLs al final: nada va después; todo lo no nulo va antes
+        return Q(**{f'{field.name}__isnull': False}) if reverse else Q(pk__in=[])
+    lookup = 'lt' if descending != reverse else 'gt'
+    condition = Q(**{f'{field.name}__{lookup}': value})
+    if field.null and not reverse:
+        condition |= Q(**{f'{field.name}__isnull': True})
+    return condition
+
+
+def _equal(field, value):
+    if value is None:
+        return Q(**{f'{field.name}__isnull': True})
+    return Q(**{field.name: value})
+
+
+def keyset_filter(columns, values, reverse=False) -> Q:
+    """
+    Expansión por columna de ``(c1, ..., cn) > (v1, ..., vn)``::
+
+        c1 > v1 OR (c1 = v1 AND c2 > v2) OR ... (c1 = v1 AND ... AND cn > vn)
+    """
+    values = [
+        field.to_python(value) if value is not None else None
+        for (field, _), value in zip(columns, values)
+    ]
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for (field, descending), value in zip(columns, values):
+        condition |= prefix & _strictly(field, descending, value, reverse)
+        prefix &= _equal(field, value)
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset multi-columna sin ``COUNT(*)``.
+
+    Respuesta: ``{"next": url, "previous": url, "results": [...]}``.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = CURSOR
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.columns = resolve_ordering(queryset, getattr(view, 'ordering', None))
+        self.keys = [
+            f"{'-' if descending else ''}{field.name}" for field, descending in self.columns
+        ]
+
+        reverse = False
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values, reverse = decode_cursor(cursor, self.keys)
+            try:
+                condition = keyset_filter(self.columns, values, reverse)
+            except (ValidationError, ValueError, TypeError):
+                # Cursor manipulado: valores que no convierten al tipo de la columna
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(condition)
+        queryset = queryset.order_by(*order_expressions(self.columns, reverse))
+
+        size = self.page_size or 20
+        rows = list(queryset[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(cursor)
+        self.page = rows
+        return rows
+
+    def _cursor_for(self, item, reverse=False) -> str:
+        values = [getattr(item, field.attname) for field, _ in self.columns]
+        return encode_cursor(self.keys, values, reverse)
+
+    def _link(self, cursor):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self._cursor_for(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self._cursor_for(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Cursor de la página (enlaces next/previous)',
+            'schema': {'type': 'string'},
+        }]
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """
+    ``PageNumberPagination`` por defecto; keyset con ``?paginate=cursor``
+    o con ``pagination_mode = 'cursor'`` en el ViewSet.
+    """
+
+    mode_query_param = 'paginate'
+    cursor_class = KeysetPagination
+
+    def wants_cursor(self, request, view=None) -> bool:
+        mode = request.query_params.get(self.mode_query_param)
+        if mode is None and request.query_params.get(self.cursor_class.cursor_query_param):
+            mode = CURSOR
+        return (mode or getattr(view, 'pagination_mode', PAGE)) == CURSOR
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.wants_cursor(request, view):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [{
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': "'cursor' para paginación keyset sin conteo total",
+            'schema': {'type': 'string', 'enum': [PAGE, CURSOR]},
+        }] + self.cursor_class().get_schema_operation_parameters(view)
@@ -0,0 +1,16 @@
+"""
+URLs de diagnóstico (solo administradores).
+Archivo: src/adapters/primary/rest_api/urls/diagnostics_urls.py
+"""
+
+from django.urls import path
+from ..views.diagnostics import GraphQLDocumentCacheAPIView, MiddlewareTimingsAPIView
+
+app_name = 'diagnostics'
+
+urlpatterns = [
+    # Latencia por capa de middleware (MIDDLEWARE_TIMING_ENABLED)
+    path('middleware-timings/', MiddlewareTimingsAPIView.as_view(), name='middleware-timings'),
+    # Caché de documentos GraphQL parseados/validados
+    path('graphql-document-cache/', GraphQLDocumentCacheAPIView.as_view(), name='graphql-document-cache'),
+]
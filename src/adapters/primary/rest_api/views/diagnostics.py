@@ -0,0 +1,60 @@
+"""
+Vistas de diagnóstico (solo administradores).
+Implementación para src/adapters/primary/rest_api/views/diagnostics.py
+"""
+
+from django.conf import settings
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from src.adapters.primary.graphql_api.document_cache import get_document_cache
+from src.infrastructure.middleware import timing
+
+
+class MiddlewareTimingsAPIView(APIView):
+    """Histogramas de latencia por capa de middleware (p50/p95/p99)."""
+    
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Retorna la latencia por capa combinando todos los workers.
+        
+        Query params:
+            by_route: 'true' para desglosar por ruta
+            
+        Returns:
+            200: Filas ordenadas por p99 descendente
+        """
+        by_route = request.query_params.get('by_route', '').lower() in ('1', 'true', 'yes')
+        return Response({
+            'enabled': getattr(settings, 'MIDDLEWARE_TIMING_ENABLED', False),
+            'unit': 'us',
+            'layers': timing.summarize(timing.collect(), by_route=by_route),
+        })
+    
+    def delete(self, request, *args, **kwargs):
+        """Reinicia los histogramas (locales y publicados)."""
+        timing.reset_all()
+        return Response(status=204)
+
+
+class GraphQLDocumentCacheAPIView(APIView):
+    """Contadores de la caché de documentos GraphQL (por proceso)."""
+    
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Retorna tamaño, hits, misses y evictions del worker que atiende.
+        
+        Returns:
+            200: Estadísticas de la caché
+        """
+        return Response(get_document_cache().stats())
+    
+    def delete(self, request, *args, **kwargs):
+        """Vacía la caché y reinicia los contadores."""
+        get_document_cache().clear()
+        return Response(status=204)
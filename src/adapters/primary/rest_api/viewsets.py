@@ -32,6 +32,8 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from datetime import datetime
 from drf_spectacular.utils import extend_schema
 
+from .pagination import PageOrCursorPagination
+
 from src.adapters.secondary.database.models import (
     Student, Company, Supervisor, Practice, Document, Notification, Avatar,
     School, Branch, PracticeEvaluation, PracticeStatusHistory
@@ -872,7 +874,7 @@ class PracticeViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     ViewSet para gestión de prácticas profesionales.
     
     Endpoints:
-    - GET /api/practices/ - Listar prácticas
+    - GET /api/practices/ - Listar prácticas (?paginate=cursor para keyset)
     - GET /api/practices/{id}/ - Ver práctica
     - POST /api/practices/ - Crear práctica
     - PUT/PATCH /api/practices/{id}/ - Actualizar práctica
@@ -899,6 +901,7 @@ class PracticeViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     filterset_fields = ['estado', 'modalidad', 'empresa', 'practicante']
     ordering_fields = ['fecha_creacion', 'fecha_inicio', 'fecha_fin']
     ordering = ['-fecha_creacion']
+    pagination_class = PageOrCursorPagination  # ?paginate=cursor: keyset sin COUNT
     
     def get_serializer_class(self):
         """Retorna el serializer apropiado según la acción."""
@@ -1301,7 +1304,7 @@ class DocumentViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     ViewSet para gestión de documentos.
     
     Endpoints:
-    - GET /api/documents/ - Listar documentos
+    - GET /api/documents/ - Listar documentos (?paginate=cursor para keyset)
     - GET /api/documents/{id}/ - Ver documento
     - POST /api/documents/ - Subir documento
     - PUT/PATCH /api/documents/{id}/ - Actualizar documento
@@ -1320,6 +1323,7 @@ class DocumentViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     filterset_fields = ['practice', 'tipo', 'aprobado']
     ordering_fields = ['created_at', 'fecha_aprobacion']
     ordering = ['-created_at']
+    pagination_class = PageOrCursorPagination  # ?paginate=cursor: keyset sin COUNT
     
     def get_serializer_class(self):
         """Retorna el serializer apropiado según la acción."""
@@ -1505,7 +1509,7 @@ class NotificationViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     ViewSet para gestión de notificaciones.
     
     Endpoints:
-    - GET /api/notifications/ - Listar notificaciones del usuario
+    - GET /api/notifications/ - Listar notificaciones del usuario (?paginate=cursor para keyset)
     - GET /api/notifications/{id}/ - Ver notificación
     - POST /api/notifications/ - Crear notificación (solo Admin)
     - DELETE /api/notifications/{id}/ - Eliminar notificación
@@ -1521,6 +1525,7 @@ class NotificationViewSet(DisableAuthenticationMixin, viewsets.ModelViewSet):
     filterset_fields = ['tipo', 'leida']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = PageOrCursorPagination  # ?paginate=cursor: keyset sin COUNT
     
     def get_serializer_class(self):
         """Retorna el serializer apropiado según la acción."""
@@ -1943,7 +1948,7 @@ class PracticeStatusHistoryViewSet(DisableAuthenticationMixin, viewsets.ReadOnly
     ViewSet de solo lectura para historial de estados de prácticas.
     
     Endpoints:
-    - GET /api/practice-status-history/ - Listar todo el historial
+    - GET /api/practice-status-history/ - Listar todo el historial (?paginate=cursor para keyset)
     - GET /api/practice-status-history/{id}/ - Detalle de un cambio
     - GET /api/practice-status-history/by_practice/{practice_id}/ - Historial por práctica
     """
@@ -1956,6 +1961,7 @@ class PracticeStatusHistoryViewSet(DisableAuthenticationMixin, viewsets.ReadOnly
     filterset_fields = ['practice', 'estado_anterior', 'estado_nuevo', 'usuario_responsable']
     ordering_fields = ['fecha_cambio']
     ordering = ['-fecha_cambio']
+    pagination_class = PageOrCursorPagination  # ?paginate=cursor: keyset sin COUNT
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -0,0 +1,32 @@
+# Generated manually
+"""
+Índice funcional sobre LOWER(correo) en upeu_usuario.
+
+El login busca el usuario con LOWER(correo) = LOWER(%s)
+(src/infrastructure/security/auth_backends.py); sin este índice la
+consulta no puede usar el índice único de correo.
+"""
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('database', '0021_remove_text_fields'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS upeu_usuario_correo_lower_idx
+                ON upeu_usuario (LOWER(correo));
+            """,
+            reverse_sql="""
+                DROP INDEX CONCURRENTLY IF EXISTS upeu_usuario_correo_lower_idx;
+            """
+        ),
+    ]
@@ -167,9 +167,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         Determina si el usuario puede acceder al admin de Django.
         Solo ADMINISTRADOR y COORDINADOR tienen acceso al admin.
         """
-        if self.rol_id is None:
-            return False
-        return self.rol_id.nombre in ['ADMINISTRADOR', 'COORDINADOR']
+        return self.role_name in ['ADMINISTRADOR', 'COORDINADOR']
     
     @property
     def is_superuser(self):
@@ -177,9 +175,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         Determina si el usuario es superusuario.
         Solo el rol ADMINISTRADOR tiene todos los permisos.
         """
-        if self.rol_id is None:
-            return False
-        return self.rol_id.nombre == 'ADMINISTRADOR'
+        return self.role_name == 'ADMINISTRADOR'
+
+    @property
+    def role_name(self):
+        """
+        Nombre del rol leído del índice compilado de roles (sin cargar el Role).
+        Ver src.infrastructure.security.role_index.
+        """
+        from src.infrastructure.security.role_index import get_role_name_for_user
+        return get_role_name_for_user(self)
 
     objects = CustomUserManager()
 
@@ -240,6 +245,18 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     def get_all_permissions(self):
         """Obtiene todos los permisos efectivos del usuario (rol + personalizados)."""
+        return list(self.get_effective_permissions())
+    
+    def get_effective_permissions(self):
+        """
+        Permisos efectivos como frozenset, cacheados por versión de rol/usuario.
+        Ver src.infrastructure.security.permission_cache.
+        """
+        from src.infrastructure.security.permission_cache import get_effective_permissions
+        return get_effective_permissions(self, self._compute_permissions)
+    
+    def _compute_permissions(self):
+        """Calcula los permisos efectivos desde la BD (sin caché)."""
         permissions = set()
         
         # 1. Permisos del rol (desde rol_id FK)
@@ -270,21 +287,19 @@ class User(AbstractBaseUser, PermissionsMixin):
             # No hay permisos personalizados o error al obtenerlos
             pass
         
-        return list(permissions)
+        return permissions
     
     def has_permission(self, permission_code):
         """Verifica si el usuario tiene un permiso específico."""
-        return permission_code in self.get_all_permissions()
+        return permission_code in self.get_effective_permissions()
     
     def has_any_permission(self, permission_codes):
         """Verifica si el usuario tiene al menos uno de los permisos."""
-        user_perms = set(self.get_all_permissions())
-        return bool(user_perms.intersection(set(permission_codes)))
+        return not self.get_effective_permissions().isdisjoint(permission_codes)
     
     def has_all_permissions(self, permission_codes):
         """Verifica si el usuario tiene todos los permisos especificados."""
-        user_perms = set(self.get_all_permissions())
-        return set(permission_codes).issubset(user_perms)
+        return self.get_effective_permissions().issuperset(permission_codes)
     
     # ===== MÉTODOS REQUERIDOS POR DJANGO ADMIN =====
     
@@ -1,12 +1,17 @@
 """
-Simple rate limit middleware using Django cache.
+Simple rate limit middleware using the shared sliding-window engine.
 Limits requests per IP per time window. Tightens limits for login/auth operations.
+
+One atomic round trip per request (see src/infrastructure/security/rate_limiter.py).
+Bucket keys ('login:<ip>', 'graphql:<ip>') are shared with the DRF throttles of
+the same scope, so a request is only charged once per bucket.
 """
 from django.conf import settings
-from django.core.cache import cache
 from django.http import JsonResponse
-import time
-import json
+
+from src.adapters.primary.graphql_api.envelope import get_graphql_envelope
+from src.infrastructure.security.logging import get_client_ip
+from src.infrastructure.security.rate_limiter import charge
 
 
 class RateLimitMiddleware:
@@ -17,6 +22,7 @@ class RateLimitMiddleware:
         self.default_window = 60
         self.login_requests = int(getattr(settings, 'RATE_LIMIT_LOGIN_PER_5MIN', 20))
         self.login_window = 300
+        self.graphql_prefixes = tuple(getattr(settings, 'RATE_LIMIT_GRAPHQL_PATHS', ('/graphql/', '/api/graphql/')))
 
     def __call__(self, request):
         client_ip = self._get_client_ip(request)
@@ -24,24 +30,18 @@ class RateLimitMiddleware:
         method = request.method
 
         # Determine bucket and limits
-        if path.startswith('/api/graphql/') and method == 'POST':
-            # Try to detect login (tokenAuth) in GraphQL body
+        if path.startswith(self.graphql_prefixes) and method == 'POST':
+            # Detect login from the shared request-scoped envelope (decoded once,
+            # fragments resolved)
             try:
-                body = request.body.decode('utf-8') if request.body else ''
-                op_name = None
-                if body:
-                    data = json.loads(body)
-                    op_name = data.get('operationName') or ''
-                    query = data.get('query') or ''
-                if op_name == 'TokenAuth' or 'tokenAuth' in (query or '').replace('\n', ' '):
-                    limit = self.login_requests
-                    window = self.login_window
-                    bucket = 'login'
-                else:
-                    limit = self.default_requests
-                    window = self.default_window
-                    bucket = 'graphql'
+                is_login = get_graphql_envelope(request).is_login
             except Exception:
+                is_login = False
+            if is_login:
+                limit = self.login_requests
+                window = self.login_window
+                bucket = 'login'
+            else:
                 limit = self.default_requests
                 window = self.default_window
                 bucket = 'graphql'
@@ -50,28 +50,16 @@ class RateLimitMiddleware:
             window = self.default_window
             bucket = 'default'
 
-        key = f"rl:{bucket}:{client_ip}:{int(time.time() // window)}"
-        count = cache.get(key)
-        if count is not None and count >= limit:
-            return JsonResponse({
+        result = charge(request, f"{bucket}:{client_ip}", limit, window)
+        if not result.allowed:
+            response = JsonResponse({
                 'detail': 'Too many requests. Please try again later.'
             }, status=429)
-        # increment with TTL window
-        # Try to create the key with TTL if it doesn't exist
-        added = cache.add(key, 1, timeout=window)
-        if not added:
-            try:
-                cache.incr(key)
-            except Exception:
-                # Fallback to set with TTL
-                current = cache.get(key) or 0
-                cache.set(key, current + 1, timeout=window)
+            response['Retry-After'] = str(int(result.retry_after) + 1)
+            return response
 
         response = self.get_response(request)
         return response
 
     def _get_client_ip(self, request):
-        xff = request.META.get('HTTP_X_FORWARDED_FOR')
-        if xff:
-            return xff.split(',')[0].strip()
-        return request.META.get('REMOTE_ADDR', 'unknown')
+        return get_client_ip(request) or 'unknown'
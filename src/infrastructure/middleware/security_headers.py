@@ -1,90 +1,176 @@
 """
 Middleware de seguridad para headers CSP, XSS y otros.
+
+Los headers se calculan una sola vez al iniciar el proceso en bundles
+inmutables por perfil y se eligen por prefijo de URL:
+
+- ``html``: páginas HTML (admin, templates, Swagger / Scalar / ReDoc y
+  GraphiQL; la CSP incluye los CDNs de los visores)
+- ``api``: respuestas JSON (sin CSP de frames, Permissions-Policy ni
+  X-XSS-Protection, que solo aplican a HTML)
+- ``download``: descargas de archivos (CSP ``sandbox``)
+
+Toda respuesta JSON usa el perfil ``api`` y toda ``FileResponse`` el perfil
+``download``, independientemente de la ruta. Las rutas se pueden sobrescribir
+con ``SECURITY_HEADERS_ROUTES`` (lista de pares prefijo/perfil).
 """
-from django.utils.deprecation import MiddlewareMixin
+from types import MappingProxyType
+
 from django.conf import settings
+from django.http import FileResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from .xss_protection import XSSProtectionMiddleware as _XSSProtectionMiddleware
+
+
+# ============================================================================
+# POLÍTICAS
+# ============================================================================
+
+_CLOUDFLARE = 'https://challenges.cloudflare.com'
+_JSDELIVR = 'https://cdn.jsdelivr.net'
+
+# Permissions Policy (Feature Policy)
+PERMISSIONS_POLICY = (
+    "geolocation=(), "
+    "microphone=(), "
+    "camera=(), "
+    "payment=(), "
+    "usb=(), "
+    "magnetometer=(), "
+    "gyroscope=()"
+)
+
+# Prefijo de URL -> perfil (se evalúa el prefijo más largo primero)
+# (lo que no coincide usa ``html``)
+DEFAULT_ROUTE_PROFILES = (
+    ('/media/', 'download'),
+    ('/api/', 'api'),
+)
+
+
+def build_csp_policy(debug=None):
+    """Construye la política CSP para páginas HTML (con soporte para Swagger y Scalar)."""
+    debug = settings.DEBUG if debug is None else debug
+    script_src = ["'self'", "'unsafe-inline'", "'unsafe-eval'", _CLOUDFLARE, _JSDELIVR]
+    connect_src = ["'self'", _CLOUDFLARE]
+
+    # En desarrollo, permitir localhost
+    if debug:
+        script_src.insert(3, 'http://localhost:*')
+        connect_src[1:1] = ['http://localhost:*', 'ws://localhost:*']
+
+    policy_parts = [
+        "default-src 'self'",
+        "script-src " + ' '.join(script_src),
+        f"style-src 'self' 'unsafe-inline' https://fonts.googleapis.com {_JSDELIVR}",
+        "font-src 'self' https://fonts.gstatic.com data:",
+        "img-src 'self' data: https:",
+        "connect-src " + ' '.join(connect_src),
+        f"frame-src {_CLOUDFLARE}",
+        "object-src 'none'",
+        "base-uri 'self'",
+        "form-action 'self'",
+    ]
+    return '; '.join(policy_parts)
+
+
+def _csp_header_name():
+    return 'Content-Security-Policy-Report-Only' if settings.DEBUG else 'Content-Security-Policy'
+
+
+def build_header_profiles():
+    """Headers por perfil (dicts simples, antes de congelarlos)."""
+    csp_enabled = getattr(settings, 'CSP_ENABLED', True)
+    csp_name = _csp_header_name()
+
+    html = {
+        'X-Content-Type-Options': 'nosniff',
+        'X-Frame-Options': 'DENY',
+        'X-XSS-Protection': '1; mode=block',
+        'Referrer-Policy': 'strict-origin-when-cross-origin',
+        'Permissions-Policy': PERMISSIONS_POLICY,
+    }
+    if csp_enabled:
+        html[csp_name] = build_csp_policy()
+
+    api = {
+        'X-Content-Type-Options': 'nosniff',
+        'Referrer-Policy': 'strict-origin-when-cross-origin',
+    }
+    if csp_enabled:
+        api[csp_name] = "default-src 'none'; frame-ancestors 'none'"
+
+    download = {
+        'X-Content-Type-Options': 'nosniff',
+        'X-Frame-Options': 'DENY',
+        'Referrer-Policy': 'strict-origin-when-cross-origin',
+    }
+    if csp_enabled:
+        download[csp_name] = "default-src 'none'; sandbox"
+
+    return {
+        'html': html,
+        'api': api,
+        'download': download,
+    }
+
+
+class HeaderBundle:
+    """Conjunto inmutable de headers calculado una vez por proceso."""
+
+    __slots__ = ('name', 'headers', '_items')
+
+    def __init__(self, name, headers):
+        self.name = name
+        self.headers = MappingProxyType(dict(headers))
+        self._items = tuple(self.headers.items())
+
+    def apply(self, response):
+        # API pública de HttpResponse.headers (valida y codifica cada valor)
+        headers = response.headers
+        for name, value in self._items:
+            headers[name] = value
 
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """Middleware para agregar headers de seguridad."""
-    
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.bundles = {
+            name: HeaderBundle(name, headers)
+            for name, headers in build_header_profiles().items()
+        }
+        routes = getattr(settings, 'SECURITY_HEADERS_ROUTES', None) or DEFAULT_ROUTE_PROFILES
+        self.routes = tuple(sorted(
+            ((prefix, self.bundles[profile]) for prefix, profile in routes),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        ))
+        self.default_bundle = self.bundles['html']
+
+    def select_bundle(self, request, response):
+        """Elige el bundle por tipo de respuesta y prefijo de URL."""
+        if isinstance(response, FileResponse):
+            return self.bundles['download']
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            return self.bundles['api']
+
+        path = request.path_info
+        for prefix, bundle in self.routes:
+            if path.startswith(prefix):
+                # API navegable de DRF (HTML) bajo /api/
+                if bundle.name == 'api' and content_type.startswith('text/html'):
+                    return self.default_bundle
+                return bundle
+        return self.default_bundle
+
     def process_response(self, request, response):
-        # Content Security Policy
-        if getattr(settings, 'CSP_ENABLED', True):
-            csp_policy = self._build_csp_policy()
-            if settings.DEBUG:
-                response['Content-Security-Policy-Report-Only'] = csp_policy
-            else:
-                response['Content-Security-Policy'] = csp_policy
-        
-        # Headers adicionales de seguridad
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-XSS-Protection'] = '1; mode=block'
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Permissions Policy (Feature Policy)
-        permissions_policy = (
-            "geolocation=(), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=(), "
-            "usb=(), "
-            "magnetometer=(), "
-            "gyroscope=()"
-        )
-        response['Permissions-Policy'] = permissions_policy
-        
+        self.select_bundle(request, response).apply(response)
         return response
-    
-    def _build_csp_policy(self):
-        """Construye la política CSP basada en configuración."""
-        # Política base restrictiva con soporte para Swagger y Scalar
-        policy_parts = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://challenges.cloudflare.com https://cdn.jsdelivr.net",
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com https://cdn.jsdelivr.net",
-            "font-src 'self' https://fonts.gstatic.com data:",
-            "img-src 'self' data: https:",
-            "connect-src 'self' https://challenges.cloudflare.com",
-            "frame-src https://challenges.cloudflare.com",
-            "object-src 'none'",
-            "base-uri 'self'",
-            "form-action 'self'",
-        ]
-        
-        # En desarrollo, permitir localhost
-        if settings.DEBUG:
-            policy_parts.extend([
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval' http://localhost:* https://challenges.cloudflare.com https://cdn.jsdelivr.net",
-                "connect-src 'self' http://localhost:* ws://localhost:* https://challenges.cloudflare.com",
-            ])
-        
-        return '; '.join(policy_parts)
-
-
-class XSSProtectionMiddleware(MiddlewareMixin):
-    """Middleware adicional para protección XSS."""
-    
-    def process_request(self, request):
-        # Sanitizar parámetros GET que podrían contener XSS
-        if request.GET:
-            for key, value in request.GET.items():
-                if self._contains_suspicious_content(value):
-                    # Log del intento de XSS
-                    import logging
-                    logger = logging.getLogger('security')
-                    logger.warning(f'Posible intento XSS detectado: {key}={value[:100]}')
-        
-        return None
-    
-    def _contains_suspicious_content(self, value):
-        """Detecta contenido sospechoso de XSS."""
-        suspicious_patterns = [
-            '<script', '</script>', 'javascript:', 'onload=', 'onerror=',
-            'onclick=', 'onmouseover=', 'onfocus=', 'onblur=', 'eval(',
-            'alert(', 'confirm(', 'prompt('
-        ]
-        
-        value_lower = value.lower()
-        return any(pattern in value_lower for pattern in suspicious_patterns)
+
+
+# Compatibilidad: el escáner XSS está consolidado en xss_protection.py
+XSSProtectionMiddleware = _XSSProtectionMiddleware
@@ -0,0 +1,84 @@
+"""
+Publicación de snapshots por proceso en la caché compartida.
+
+Los registros en memoria del proceso (``middleware/timing.py`` y
+``graphql_api/tracing.py``) publican su snapshot para que los comandos de
+gestión y el endpoint de administración combinen todos los workers.
+
+Cada proceso ocupa una ranura ``<prefix>:slot:<n>`` reclamada con
+``cache.add`` (atómico en Redis/memcached) y con TTL: no hay una lista
+compartida de pids que leer y reescribir, y las ranuras de procesos muertos
+caducan solas. Si la ranura del proceso caducó o la tomó otro proceso, el
+siguiente publish reclama una libre.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class SnapshotPublisher:
+    """Ranura del proceso en la caché compartida para un tipo de snapshot."""
+
+    def __init__(self, prefix: str, interval_setting: str, slots: int = 64, timeout: int = 3600):
+        self.prefix = prefix
+        self.interval_setting = interval_setting
+        self.slots = slots
+        self.timeout = timeout
+        self._slot: Optional[int] = None
+        self._next_publish = 0.0
+        self._lock = threading.Lock()
+
+    def _key(self, slot: int) -> str:
+        return f"{self.prefix}:slot:{slot}"
+
+    def _keys(self) -> List[str]:
+        return [self._key(slot) for slot in range(self.slots)]
+
+    def maybe_publish(self, build: Callable[[], Any]) -> None:
+        """Publica ``build()`` si pasó el intervalo de ``interval_setting``."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_publish:
+                return
+            self._next_publish = now + float(getattr(settings, self.interval_setting, 10))
+        self.publish(build())
+
+    def publish(self, data) -> None:
+        """Guarda ``data`` en la ranura del proceso (la reclama si hace falta)."""
+        entry = {'pid': os.getpid(), 'data': data}
+        try:
+            slot = self._slot
+            if slot is not None:
+                current = cache.get(self._key(slot))
+                if current is not None and current.get('pid') == entry['pid']:
+                    cache.set(self._key(slot), entry, timeout=self.timeout)
+                    return
+            self._slot = self._claim(entry)
+        except Exception:
+            # La instrumentación nunca debe romper la request
+            pass
+
+    def _claim(self, entry) -> Optional[int]:
+        for slot in range(self.slots):
+            if cache.add(self._key(slot), entry, timeout=self.timeout):
+                return slot
+        return None
+
+    def published(self, exclude_own: bool = False) -> List[Any]:
+        """Snapshots publicados (una sola lectura ``get_many``)."""
+        own_pid = os.getpid()
+        return [
+            entry['data']
+            for entry in cache.get_many(self._keys()).values()
+            if isinstance(entry, dict) and not (exclude_own and entry.get('pid') == own_pid)
+        ]
+
+    def clear(self) -> None:
+        """Borra todas las ranuras publicadas."""
+        cache.delete_many(self._keys())
+        self._slot = None
@@ -0,0 +1,307 @@
+"""
+Instrumentación opcional de latencia por middleware.
+
+Con ``MIDDLEWARE_TIMING_ENABLED`` activo, ``config/settings.py`` pasa la
+lista ``MIDDLEWARE`` por ``instrument()``: cada entrada se sustituye por un
+envoltorio (``TimedLayer<n>``, resuelto por el ``__getattr__`` del módulo)
+que mide por separado las fases de request y de response de esa capa::
+
+    request  = bajada a la siguiente capa - entrada
+    response = salida - regreso de la siguiente capa
+
+Si la capa corta la cadena (responde sin llamar a la siguiente) todo su
+tiempo cuenta como fase de request.
+
+Los tiempos se agregan en histogramas en memoria del proceso (p50/p95/p99
+por capa y por ruta). Cada ``MIDDLEWARE_TIMING_PUBLISH_INTERVAL`` segundos
+el proceso publica su snapshot en la caché compartida (``snapshots.py``)
+para que el endpoint
+de administración y el comando ``middleware_timings`` combinen todos los
+workers.
+
+Deshabilitado, la lista ``MIDDLEWARE`` no se modifica: costo cero.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from django.utils.module_loading import import_string
+
+from .snapshots import SnapshotPublisher
+
+_LAYER_PREFIX = 'TimedLayer'
+_CACHE_PREFIX = 'mw_timing'
+_MARKS_ATTR = '_middleware_timing_marks'
+ALL_ROUTES = '*'
+
+# Límites de los buckets en microsegundos (crecimiento geométrico ~20%)
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(
+    round(1.2 ** i, 1) for i in range(0, 90)  # 1 us .. ~13 s
+)
+
+# Rutas de las capas instrumentadas (índice = n de TimedLayer<n>)
+_layers: List[str] = []
+
+
+def instrument(middleware: List[str]) -> List[str]:
+    """Sustituye cada middleware por su envoltorio con medición."""
+    wrapped = []
+    for path in middleware:
+        _layers.append(path)
+        wrapped.append(f"{__name__}.{_LAYER_PREFIX}{len(_layers) - 1}")
+    return wrapped
+
+
+# ============================================================================
+# HISTOGRAMAS
+# ============================================================================
+
+class LatencyHistogram:
+    """Histograma de buckets fijos (microsegundos)."""
+
+    __slots__ = ('counts', 'total', 'count', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, micros: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, micros)] += 1
+        self.total += micros
+        self.count += 1
+        if micros > self.max:
+            self.max = micros
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for i, value in enumerate(other.counts):
+            self.counts[i] += value
+        self.total += other.total
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Límite superior del bucket que contiene el percentil ``pct``."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for i, value in enumerate(self.counts):
+            seen += value
+            if seen >= target:
+                return min(BUCKET_BOUNDS[i], self.max) if i < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {'counts': self.counts, 'total': self.total, 'count': self.count, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.counts = list(data['counts'])
+        histogram.total = data['total']
+        histogram.count = data['count']
+        histogram.max = data['max']
+        return histogram
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_us': round(self.total / self.count, 1) if self.count else 0.0,
+            'p50_us': round(self.percentile(50), 1),
+            'p95_us': round(self.percentile(95), 1),
+            'p99_us': round(self.percentile(99), 1),
+            'max_us': round(self.max, 1),
+        }
+
+
+# (capa, fase, ruta) -> histograma
+HistogramKey = Tuple[str, str, str]
+
+
+class TimingRegistry:
+    """Histogramas del proceso y publicación en la caché compartida."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[HistogramKey, LatencyHistogram] = {}
+        self.publisher = SnapshotPublisher(_CACHE_PREFIX, 'MIDDLEWARE_TIMING_PUBLISH_INTERVAL')
+
+    def record(self, layer: str, phase: str, route: str, micros: float) -> None:
+        with self._lock:
+            for key in ((layer, phase, ALL_ROUTES), (layer, phase, route)):
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.record(micros)
+        self._maybe_publish()
+
+    def snapshot(self) -> Dict[HistogramKey, LatencyHistogram]:
+        with self._lock:
+            return {key: LatencyHistogram.from_dict(h.to_dict()) for key, h in self._histograms.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    # ---- Publicación entre workers ----
+
+    def _maybe_publish(self) -> None:
+        self.publisher.maybe_publish(self._published_data)
+
+    def _published_data(self) -> list:
+        return [[*key, h.to_dict()] for key, h in self.snapshot().items()]
+
+    def publish(self) -> None:
+        """Guarda el snapshot del proceso en su ranura de la caché compartida."""
+        self.publisher.publish(self._published_data())
+
+
+registry = TimingRegistry()
+
+
+def collect(include_local: bool = True) -> Dict[HistogramKey, LatencyHistogram]:
+    """Combina los snapshots publicados por todos los procesos."""
+    merged: Dict[HistogramKey, LatencyHistogram] = {}
+
+    def _merge(key, histogram):
+        if key in merged:
+            merged[key].merge(histogram)
+        else:
+            merged[key] = histogram
+
+    # El snapshot propio publicado se sustituye por el local (más reciente)
+    for snapshot in registry.publisher.published(exclude_own=include_local):
+        for layer, phase, route, data in snapshot:
+            _merge((layer, phase, route), LatencyHistogram.from_dict(data))
+
+    if include_local:
+        for key, histogram in registry.snapshot().items():
+            _merge(key, histogram)
+    return merged
+
+
+def summarize(histograms: Dict[HistogramKey, LatencyHistogram],
+              by_route: bool = False) -> List[dict]:
+    """Filas ordenadas por p99 descendente (por capa, o por capa y ruta)."""
+    rows = []
+    for (layer, phase, route), histogram in histograms.items():
+        if (route == ALL_ROUTES) == by_route:
+            continue
+        row = {'layer': layer, 'phase': phase}
+        if by_route:
+            row['route'] = route
+        row.update(histogram.summary())
+        rows.append(row)
+    rows.sort(key=lambda row: row['p99_us'], reverse=True)
+    return rows
+
+
+def reset_all() -> None:
+    """Borra los histogramas locales y los publicados."""
+    registry.reset()
+    registry.publisher.clear()
+
+
+# ============================================================================
+# ENVOLTORIO DE CAPA
+# ============================================================================
+
+def _route_of(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.route:
+        return '/' + match.route
+    return '<unresolved>'
+
+
+class TimedMiddleware:
+    """Envuelve una capa de middleware y mide sus dos fases."""
+
+    layer_index = None
+    layer_path = None
+    layer_class = None
+    # El envoltorio es síncrono; Django adapta si el handler es async
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self._next = get_response
+        self._inner = self.layer_class(self._downstream)
+
+    def __call__(self, request):
+        marks = getattr(request, _MARKS_ATTR, None)
+        if marks is None:
+            marks = {}
+            setattr(request, _MARKS_ATTR, marks)
+
+        start = time.perf_counter()
+        response = self._inner(request)
+        end = time.perf_counter()
+
+        down_up = marks.get(self.layer_index)
+        if down_up is None:
+            request_phase, response_phase = end - start, 0.0
+        else:
+            request_phase, response_phase = down_up[0] - start, end - down_up[1]
+
+        route = _route_of(request)
+        registry.record(self.layer_path, 'request', route, request_phase * 1e6)
+        registry.record(self.layer_path, 'response', route, response_phase * 1e6)
+        return response
+
+    def _downstream(self, request):
+        down = time.perf_counter()
+        response = self._next(request)
+        getattr(request, _MARKS_ATTR)[self.layer_index] = (down, time.perf_counter())
+        return response
+
+
+
+# Hooks que Django registra si la instancia los tiene
+_HOOKS = ('process_view', 'process_exception', 'process_template_response')
+
+
+def _forward(hook):
+    def method(self, *args, **kwargs):
+        return getattr(self._inner, hook)(*args, **kwargs)
+    method.__name__ = hook
+    return method
+
+
+def _build_layer_class(name: str, index: int, path: str) -> type:
+    """
+    Clase envoltorio de la capa ``path``.
+
+    Hereda de la clase original para que los checks que buscan middlewares
+    por subclase (admin, axes) la sigan encontrando; los hooks se reenvían a
+    la instancia interna.
+    """
+    original = import_string(path)
+    attrs = {'layer_index': index, 'layer_path': path, 'layer_class': original}
+    for hook in _HOOKS:
+        if hasattr(original, hook):
+            attrs[hook] = _forward(hook)
+    # Middlewares función (no clase) solo se envuelven
+    bases = (TimedMiddleware, original) if isinstance(original, type) else (TimedMiddleware,)
+    return type(name, bases, attrs)
+
+
+_layer_classes: Dict[int, type] = {}
+
+
+def __getattr__(name):
+    if not name.startswith(_LAYER_PREFIX):
+        raise AttributeError(name)
+    try:
+        index = int(name[len(_LAYER_PREFIX):])
+        path = _layers[index]
+    except (ValueError, IndexError):
+        raise AttributeError(name) from None
+    cls = _layer_classes.get(index)
+    if cls is None:
+        cls = _build_layer_class(name, index, path)
+        _layer_classes[index] = cls
+    return cls
@@ -2,49 +2,30 @@
 Middleware adicional para protección XSS avanzada.
 """
 
-import re
 from django.utils.deprecation import MiddlewareMixin
 from django.http import HttpResponseBadRequest
 from django.conf import settings
 from src.infrastructure.security.logging import security_event_logger, get_client_ip
+from src.infrastructure.security.xss_screening import (
+    get_screening_limits,
+    screen_headers,
+    screen_json_body,
+    screen_query_params,
+)
 
 
 class XSSProtectionMiddleware(MiddlewareMixin):
     """
     Middleware para detectar y bloquear intentos de XSS en headers y parámetros.
-    """
-    
-    # Patrones sospechosos en headers
-    SUSPICIOUS_HEADER_PATTERNS = [
-        r'<script[^>]*>.*?</script>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'<iframe[^>]*>',
-        r'<object[^>]*>',
-        r'<embed[^>]*>',
-        r'<link[^>]*>',
-        r'<meta[^>]*>',
-        r'vbscript:',
-        r'data:text/html',
-    ]
     
-    # Headers que deben ser validados
-    HEADERS_TO_CHECK = [
-        'HTTP_USER_AGENT',
-        'HTTP_REFERER',
-        'HTTP_X_FORWARDED_FOR',
-        'HTTP_X_REAL_IP',
-        'HTTP_ACCEPT',
-        'HTTP_ACCEPT_LANGUAGE',
-        'HTTP_ACCEPT_ENCODING',
-    ]
+    Usa el motor de una sola pasada de ``security/xss_screening.py`` sobre
+    headers, parámetros GET y, si ``XSS_SCREEN_JSON_BODY`` está activo, el
+    cuerpo de las requests JSON.
+    """
     
     def __init__(self, get_response):
         self.get_response = get_response
-        self.compiled_patterns = [
-            re.compile(pattern, re.IGNORECASE | re.DOTALL)
-            for pattern in self.SUSPICIOUS_HEADER_PATTERNS
-        ]
+        self.max_length, self.json_max_bytes = get_screening_limits()
         super().__init__(get_response)
     
     def process_request(self, request):
@@ -54,59 +35,24 @@ class XSSProtectionMiddleware(MiddlewareMixin):
         if not getattr(settings, 'XSS_PROTECTION_ENABLED', True):
             return None
         
-        # Verificar headers sospechosos
-        suspicious_headers = self._check_headers(request)
-        if suspicious_headers:
-            self._log_suspicious_activity(request, 'headers', suspicious_headers)
-            # En desarrollo, solo logear. En producción, considerar bloquear.
-            if not settings.DEBUG:
-                return HttpResponseBadRequest("Request blocked due to security policy")
-        
-        # Verificar parámetros GET sospechosos
-        suspicious_params = self._check_get_parameters(request)
-        if suspicious_params:
-            self._log_suspicious_activity(request, 'get_params', suspicious_params)
-            if not settings.DEBUG:
-                return HttpResponseBadRequest("Request blocked due to security policy")
-        
-        return None
-    
-    def _check_headers(self, request):
-        """
-        Verifica headers por contenido sospechoso.
-        
-        Returns:
-            Dict con headers sospechosos encontrados
-        """
-        suspicious = {}
-        
-        for header_name in self.HEADERS_TO_CHECK:
-            header_value = request.META.get(header_name, '')
-            if header_value:
-                for pattern in self.compiled_patterns:
-                    if pattern.search(header_value):
-                        suspicious[header_name] = header_value
-                        break
-        
-        return suspicious
-    
-    def _check_get_parameters(self, request):
-        """
-        Verifica parámetros GET por contenido sospechoso.
+        checks = [
+            ('headers', screen_headers(request, self.max_length)),
+            ('get_params', screen_query_params(request, self.max_length)),
+        ]
+        if getattr(settings, 'XSS_SCREEN_JSON_BODY', False) and request.method in ('POST', 'PUT', 'PATCH'):
+            checks.append(('json_body', screen_json_body(request, self.json_max_bytes)))
         
-        Returns:
-            Dict con parámetros sospechosos encontrados
-        """
-        suspicious = {}
+        blocked = False
+        for activity_type, suspicious in checks:
+            if suspicious:
+                self._log_suspicious_activity(request, activity_type, suspicious)
+                blocked = True
         
-        for param_name, param_value in request.GET.items():
-            if isinstance(param_value, str):
-                for pattern in self.compiled_patterns:
-                    if pattern.search(param_value):
-                        suspicious[param_name] = param_value
-                        break
+        # Por defecto solo se registra; XSS_PROTECTION_BLOCK activa el bloqueo
+        if blocked and getattr(settings, 'XSS_PROTECTION_BLOCK', False):
+            return HttpResponseBadRequest("Request blocked due to security policy")
         
-        return suspicious
+        return None
     
     def _log_suspicious_activity(self, request, activity_type, details):
         """
@@ -114,7 +60,7 @@ class XSSProtectionMiddleware(MiddlewareMixin):
         
         Args:
             request: Objeto request de Django
-            activity_type: Tipo de actividad ('headers', 'get_params')
+            activity_type: Tipo de actividad ('headers', 'get_params', 'json_body')
             details: Detalles de la actividad sospechosa
         """
         user_id = None
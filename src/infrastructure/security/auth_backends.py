@@ -5,10 +5,32 @@ ADAPTADO para modelo User con campo 'correo' en lugar de 'username'.
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
 
+def get_login_queryset():
+    """
+    Queryset del camino rápido de login: usuario + rol + perfiles en una sola
+    consulta. El filtro por LOWER(correo) usa el índice funcional
+    upeu_usuario_correo_lower_idx (migración 0022).
+    """
+    return User.objects.select_related(
+        'rol_id', 'student_profile', 'supervisor_profile'
+    ).alias(correo_lower=Lower('correo'))
+
+
+def get_user_for_login(correo):
+    """
+    Obtiene el usuario para login por correo (case-insensitive).
+    
+    Raises:
+        User.DoesNotExist
+    """
+    return get_login_queryset().get(correo_lower=correo.lower())
+
+
 class EmailBackend(ModelBackend):
     """
     Backend de autenticación que permite login con email (correo).
@@ -32,7 +54,7 @@ class EmailBackend(ModelBackend):
         try:
             # Buscar usuario por correo (case-insensitive)
             # El formulario de Django admin envía 'username', pero nosotros buscamos por 'correo'
-            user = User.objects.get(correo__iexact=username)
+            user = get_user_for_login(username)
             
             # Verificar contraseña
             if user.check_password(password):
@@ -0,0 +1,43 @@
+"""
+Contadores de versión en la caché compartida.
+
+Invalidan datos derivados (permisos efectivos, índice de roles, filtro de
+JTIs) en todos los procesos sin buscar ni borrar claves: quien lee compara
+la versión actual con la que usó al construir su copia.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Backends cuyo contenido no se comparte entre procesos
+LOCAL_CACHE_BACKENDS = frozenset({
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+})
+
+
+def cache_is_shared() -> bool:
+    """
+    True si ``CACHES['default']`` es visible para todos los procesos.
+
+    Con una caché local un contador subido en un worker no lo ven los demás.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+def bump_version(key: str) -> None:
+    """
+    Incrementa el contador ``key`` (lo crea si no existe).
+
+    El primer valor es 2 para que difiera del 1 que los lectores asumen
+    cuando la clave no existe. Los contadores no expiran: si se perdieran,
+    una entrada vieja podría volver a coincidir con una versión reiniciada.
+    """
+    if cache.add(key, 2, timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # La clave desapareció entre add() e incr() (evicción/reinicio)
+        cache.set(key, 2, timeout=None)
@@ -0,0 +1,190 @@
+"""
+Filtro en memoria de JTIs en blacklist.
+
+Cada proceso mantiene ``{jti: exp}`` con los refresh tokens revocados que aún
+no expiraron. Verificar un token pasa a ser una búsqueda en un dict:
+
+- JTI ausente  -> no está en blacklist (sin consulta a BD).
+- JTI presente -> se confirma contra ``BlacklistedToken`` (la BD manda).
+
+Sincronización incremental entre workers: cada evento de blacklist se publica
+en la caché compartida como ``jwt:bl:evt:<n>`` con un contador de secuencia
+``jwt:bl:seq``; los procesos leen solo los eventos nuevos como mucho cada
+``JWT_BLACKLIST_SYNC_INTERVAL`` segundos. Las entradas expiradas se descartan
+solas en cada sincronización.
+
+Si la secuencia retrocede, faltan las claves de secuencia/generación
+(reinicio o evicción de Redis) o falta algún evento pendiente se recarga
+todo desde la BD; si publicar un evento falla se sube la generación. Con una caché
+local al proceso (LocMem/Dummy) el filtro no descarta nada: cada
+verificación se confirma en la BD.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_versions import bump_version, cache_is_shared
+
+logger = logging.getLogger(__name__)
+
+SEQ_KEY = 'jwt:bl:seq'
+GENERATION_KEY = 'jwt:bl:gen'
+EVENT_KEY = 'jwt:bl:evt:{seq}'
+
+
+def _sync_interval() -> float:
+    return float(getattr(settings, 'JWT_BLACKLIST_SYNC_INTERVAL', 1))
+
+
+def _event_ttl() -> int:
+    """Los eventos viven lo que dura un refresh token (después ya no importan)."""
+    lifetime = getattr(settings, 'SIMPLE_JWT', {}).get('REFRESH_TOKEN_LIFETIME')
+    return int(lifetime.total_seconds()) if lifetime else 7 * 24 * 3600
+
+
+def _ensure_counters() -> None:
+    """
+    Crea la secuencia si falta. Recrearla (primer uso o pérdida de la caché)
+    sube la generación: los procesos con una secuencia anterior recargan
+    desde la BD aunque la nueva secuencia ya haya superado la suya.
+    """
+    if cache.add(SEQ_KEY, 0, timeout=None):
+        bump_version(GENERATION_KEY)
+
+
+class JTIBlacklistFilter:
+    """Conjunto compacto de JTIs revocados con expiración."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, float] = {}
+        self._seq: Optional[int] = None
+        self._generation = None
+        self._next_sync = 0.0
+
+    # ---- Carga y sincronización ----
+
+    def _load_from_db(self) -> None:
+        """Carga inicial: blacklist vigente desde la BD."""
+        from django.utils import timezone
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        rows = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list('token__jti', 'token__expires_at')
+        self._entries = {jti: expires_at.timestamp() for jti, expires_at in rows}
+
+    def _reload(self) -> None:
+        """Recarga desde la BD y fija la línea base de secuencia y generación."""
+        _ensure_counters()
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        # Leer la secuencia antes de la BD: un evento concurrente se vuelve a
+        # aplicar en la siguiente sincronización en lugar de perderse
+        state = cache.get_many([SEQ_KEY, GENERATION_KEY])
+        self._load_from_db()
+        self._seq = state.get(SEQ_KEY, 0)
+        self._generation = state.get(GENERATION_KEY)
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+
+        with self._lock:
+            if now < self._next_sync:
+                return
+
+            state = cache.get_many([SEQ_KEY, GENERATION_KEY])
+            current = state.get(SEQ_KEY)
+            generation = state.get(GENERATION_KEY)
+            if (
+                self._seq is None
+                or current is None
+                or generation is None
+                or generation != self._generation
+                or current < self._seq
+            ):
+                # Primera carga, invalidate_all() o contadores perdidos
+                # (reinicio/evicción de la caché): los eventos intermedios ya
+                # no son fiables y se recarga todo desde la BD
+                self._reload()
+            elif current > self._seq:
+                keys = [EVENT_KEY.format(seq=n) for n in range(self._seq + 1, current + 1)]
+                events = cache.get_many(keys)
+                if len(events) < len(keys):
+                    # Evento aún no escrito (incr antes del set), evictado o
+                    # cuya publicación falló: saltarlo perdería la revocación
+                    self._reload()
+                else:
+                    for jti, exp in events.values():
+                        self._entries[jti] = exp
+                    self._seq = current
+
+            # Purga de expirados
+            wall = time.time()
+            expired = [jti for jti, exp in self._entries.items() if exp <= wall]
+            for jti in expired:
+                del self._entries[jti]
+
+            self._next_sync = now + _sync_interval()
+
+    # ---- API pública ----
+
+    def add(self, jti: str, exp: float) -> None:
+        """Registra un JTI revocado y lo publica al resto de procesos."""
+        if not jti:
+            return
+        with self._lock:
+            self._entries[jti] = exp
+        try:
+            _ensure_counters()
+            seq = cache.incr(SEQ_KEY)
+            cache.set(EVENT_KEY.format(seq=seq), (jti, exp), timeout=_event_ttl())
+        except Exception as exc:
+            logger.warning("No se pudo publicar el evento de blacklist %s: %s", jti, exc)
+            try:
+                # Sin evento los demás procesos no lo verían: que recarguen de la BD
+                bump_version(GENERATION_KEY)
+            except Exception:
+                logger.warning("No se pudo invalidar la blacklist de JTIs tras el fallo")
+
+    def invalidate_all(self) -> None:
+        """
+        Fuerza a todos los procesos a recargar desde la BD.
+
+        Para cargas masivas (``bulk_create`` no emite señales y publicar un
+        evento por token no escala).
+        """
+        bump_version(GENERATION_KEY)
+        self._next_sync = 0.0
+
+    def might_contain(self, jti: str) -> bool:
+        """True si el JTI puede estar revocado (requiere confirmar en BD)."""
+        if not cache_is_shared():
+            # Sin caché compartida cada proceso tendría sus propios contadores
+            # y no vería las revocaciones de los demás: siempre a la BD
+            return True
+        try:
+            self._sync()
+        except Exception as exc:
+            # Sin filtro fiable se consulta siempre la BD
+            logger.warning("No se pudo sincronizar la blacklist de JTIs: %s", exc)
+            return True
+        exp = self._entries.get(jti)
+        return exp is not None and exp > time.time()
+
+    def is_blacklisted(self, jti: str) -> bool:
+        """Verificación completa: memoria primero, BD solo ante un positivo."""
+        if not self.might_contain(jti):
+            return False
+
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+jti_blacklist = JTIBlacklistFilter()
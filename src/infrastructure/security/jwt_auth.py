@@ -4,15 +4,33 @@ Sistema de autenticación JWT PURO.
 
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.settings import api_settings
+from django.core.exceptions import ValidationError
 from .logging import security_event_logger, get_client_ip
+from .jti_blacklist import jti_blacklist
+from .last_seen import record_last_seen
+from .principal import ClaimsUser, get_user_state
 
 User = get_user_model()
 
 
+class FilteredRefreshToken(RefreshToken):
+    """
+    RefreshToken cuya verificación de blacklist consulta primero el filtro
+    en memoria de JTIs; la BD solo se consulta ante un posible positivo.
+    """
+    
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if jti_blacklist.is_blacklisted(jti):
+            raise TokenError("Token is blacklisted")
+
+
 class JWTAuthenticationService:
     """
     Servicio de autenticación JWT puro.
@@ -24,10 +42,15 @@ class JWTAuthenticationService:
     - Validación de tokens
     """
     
+    @staticmethod
     def authenticate_request(request):
         """
         Autentica una request usando JWT desde cookies.
         
+        Con JWT_CLAIMS_PRINCIPAL=True retorna un ClaimsUser construido desde
+        los claims del token (sin consultar upeu_usuario); el estado
+        activo/rol se valida contra un snapshot cacheado con TTL corto.
+        
         Args:
             request: Request de Django
             
@@ -44,7 +67,12 @@ class JWTAuthenticationService:
         try:
             # Validar y decodificar token
             validated_token = AccessToken(access_token)
-            user_id = validated_token['user_id']
+            user_id = User._meta.pk.to_python(validated_token['user_id'])
+            
+            if getattr(settings, 'JWT_CLAIMS_PRINCIPAL', False):
+                return JWTAuthenticationService._authenticate_from_claims(
+                    user_id, validated_token
+                )
             
             # Obtener usuario
             user = User.objects.get(id=user_id)
@@ -54,16 +82,47 @@ class JWTAuthenticationService:
             
             # Actualizar ultimo_acceso si está configurado
             if getattr(settings, 'JWT_UPDATE_LAST_LOGIN', True):
-                user.ultimo_acceso = timezone.now()
-                user.save(update_fields=['ultimo_acceso'])
+                record_last_seen(user)
             
             return user
             
-        except (TokenError, InvalidToken) as e:
+        except (TokenError, InvalidToken, KeyError, ValidationError) as e:
             return None
         except User.DoesNotExist:
             return None
     
+    @staticmethod
+    def _authenticate_from_claims(user_id, validated_token):
+        """
+        Construye el principal ligero desde los claims del token.
+        
+        Args:
+            user_id: ID del usuario (claim user_id)
+            validated_token: AccessToken ya validado
+            
+        Returns:
+            ClaimsUser o None si el usuario no existe o está inactivo
+        """
+        state = get_user_state(user_id)
+        if state is None:
+            return None
+        
+        activo, rol_id = state
+        if not activo:
+            return None
+        
+        user = ClaimsUser(
+            user_id,
+            rol_id=rol_id,
+            correo=validated_token.get('correo'),
+            claims=validated_token.payload,
+        )
+        
+        if getattr(settings, 'JWT_UPDATE_LAST_LOGIN', True):
+            record_last_seen(user)
+        
+        return user
+    
     @staticmethod
     def _get_token_from_cookies(request, token_type):
         """
@@ -137,31 +196,14 @@ class JWTAuthenticationService:
         ip_address = get_client_ip(request) if request else None
         user_agent = request.META.get('HTTP_USER_AGENT', '') if request else ''
         
-        # Crear JWT tokens
-        refresh = RefreshToken.for_user(user)
+        # Crear JWT tokens (OutstandingToken + ultimo_acceso en una transacción)
+        refresh = JWTAuthenticationService.issue_login_tokens(user)
         access_token = refresh.access_token
         
-        # Crear OutstandingToken para tracking
-        try:
-            outstanding_token, created = OutstandingToken.objects.get_or_create(
-                jti=refresh['jti'],
-                defaults={
-                    'user': user,
-                    'token': str(refresh),
-                    'expires_at': timezone.datetime.fromtimestamp(refresh['exp'])
-                }
-            )
-        except Exception:
-            pass  # Continuar sin OutstandingToken si falla
-        
-        # Actualizar ultimo_acceso (last_login es un property que apunta a este campo)
-        user.ultimo_acceso = timezone.now()
-        user.save(update_fields=['ultimo_acceso'])
-        
         # Log de seguridad
         security_event_logger.log_security_event(
             'jwt_session_created',
-            f"New JWT session created for user {user.email}",
+            "New JWT session created",
             user_id=str(user.id),
             extra_data={
                 'jwt_id': refresh['jti'],
@@ -186,6 +228,32 @@ class JWTAuthenticationService:
         
         return str(access_token), str(refresh), response_data
     
+    @staticmethod
+    def issue_login_tokens(user, token_factory=None):
+        """
+        Emite el refresh token de un login y registra ultimo_acceso.
+        
+        RefreshToken.for_user ya inserta el OutstandingToken (app token_blacklist);
+        ese INSERT y el UPDATE de ultimo_acceso van en una sola transacción.
+        
+        Args:
+            user: Usuario autenticado
+            token_factory: Callable(user) -> RefreshToken (por defecto RefreshToken.for_user)
+            
+        Returns:
+            RefreshToken
+        """
+        token_factory = token_factory or RefreshToken.for_user
+        now = timezone.now()
+        
+        with transaction.atomic():
+            refresh = token_factory(user)
+            User.objects.filter(pk=user.pk).update(ultimo_acceso=now)
+        
+        # last_login es un property que apunta a este campo
+        user.ultimo_acceso = now
+        return refresh
+    
     @staticmethod
     def refresh_jwt_tokens(request):
         """
@@ -202,16 +270,8 @@ class JWTAuthenticationService:
             return None, None, False
         
         try:
-            # Validar refresh token
-            refresh = RefreshToken(refresh_token)
-            
-            # Verificar que no esté en blacklist
-            try:
-                outstanding_token = OutstandingToken.objects.get(jti=refresh['jti'])
-                if hasattr(outstanding_token, 'blacklistedtoken'):
-                    return None, None, False
-            except OutstandingToken.DoesNotExist:
-                pass
+            # Validar refresh token (incluye verificación de blacklist vía filtro en memoria)
+            refresh = FilteredRefreshToken(refresh_token)
             
             # Crear nuevo access token
             new_access_token = refresh.access_token
@@ -247,7 +307,7 @@ class JWTAuthenticationService:
             return False, "No hay sesión activa"
         
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = FilteredRefreshToken(refresh_token)
             user_id = refresh.get('user_id')
             
             if logout_all and user_id:
@@ -0,0 +1,166 @@
+"""
+Buffer write-behind para ``upeu_usuario.ultimo_acceso``.
+
+En lugar de un UPDATE por request, ``touch()`` registra el timestamp en
+memoria y lo coalesce por usuario:
+
+- Como mucho una escritura por usuario cada ``LAST_SEEN_GRANULARITY``
+  segundos. La ventana se comparte entre workers con ``cache.add``.
+- Un hilo daemon vacía el buffer cada ``LAST_SEEN_FLUSH_INTERVAL`` segundos
+  con un único ``bulk_update`` (UPDATE ... CASE WHEN por lote) y cierra su
+  conexión a la BD después de cada flush.
+- ``atexit`` vacía lo pendiente al apagar el proceso.
+
+El buffer vive en cada proceso web; un task de Celery beat correría en otro
+proceso y no podría vaciarlo, por eso el flush lo hace un hilo local.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WINDOW_KEY = 'auth:last_seen:{user_id}'
+
+
+class LastSeenBuffer:
+    """Acumula ``ultimo_acceso`` por usuario y lo escribe en lote."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[object, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+
+    @property
+    def granularity(self) -> int:
+        return int(getattr(settings, 'LAST_SEEN_GRANULARITY', 300))
+
+    @property
+    def flush_interval(self) -> float:
+        return float(getattr(settings, 'LAST_SEEN_FLUSH_INTERVAL', 60))
+
+    def touch(self, user_id, when: Optional[datetime] = None, force: bool = False) -> bool:
+        """
+        Registra actividad del usuario.
+
+        Args:
+            user_id: ID del usuario
+            when: Momento del acceso (por defecto ahora)
+            force: Ignorar la ventana de granularidad (p. ej. en login)
+
+        Returns:
+            bool: True si se encoló una escritura
+        """
+        if user_id is None:
+            return False
+
+        # Una sola escritura por usuario y ventana entre todos los workers
+        if not force and not cache.add(WINDOW_KEY.format(user_id=user_id), 1, timeout=self.granularity):
+            return False
+
+        with self._lock:
+            self._pending[user_id] = when or timezone.now()
+        self._ensure_worker()
+        return True
+
+    def flush(self) -> int:
+        """
+        Escribe los timestamps pendientes en un único bulk UPDATE.
+
+        Returns:
+            int: Número de usuarios actualizados
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        from src.adapters.secondary.database.models import User
+
+        users = [User(id=user_id, ultimo_acceso=when) for user_id, when in pending.items()]
+        try:
+            User.objects.bulk_update(users, ['ultimo_acceso'], batch_size=500)
+        except Exception as exc:
+            # Reencolar sin pisar timestamps más recientes
+            with self._lock:
+                for user_id, when in pending.items():
+                    self._pending.setdefault(user_id, when)
+            logger.warning("No se pudo escribir ultimo_acceso en lote: %s", exc)
+            return 0
+        return len(users)
+
+    def _ensure_worker(self) -> None:
+        """Arranca el hilo de flush (una vez por proceso, también tras fork)."""
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='last-seen-flush', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self._flush_in_worker()
+
+    def _flush_in_worker(self) -> None:
+        """Flush desde el hilo daemon, cerrando su conexión al terminar."""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Error en el flush de ultimo_acceso")
+        finally:
+            # La conexión del hilo no pasa por request_finished: sin cerrarla
+            # queda abierta entre flushes y falla cuando el servidor la corta
+            connections.close_all()
+
+    def shutdown(self) -> None:
+        """Detiene el hilo y vacía lo pendiente."""
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Error en el flush final de ultimo_acceso")
+
+
+last_seen_buffer = LastSeenBuffer()
+atexit.register(last_seen_buffer.shutdown)
+
+
+def record_last_seen(user, force: bool = False) -> None:
+    """
+    Actualiza ``ultimo_acceso`` en memoria y lo encola para escritura diferida.
+
+    Con ``LAST_SEEN_WRITE_BEHIND=False`` escribe de forma síncrona (comportamiento
+    anterior).
+    """
+    now = timezone.now()
+    user_id = getattr(user, 'pk', None)
+
+    if not getattr(settings, 'LAST_SEEN_WRITE_BEHIND', True):
+        from src.adapters.secondary.database.models import User
+        User.objects.filter(pk=user_id).update(ultimo_acceso=now)
+    else:
+        last_seen_buffer.touch(user_id, now, force=force)
+
+    # Mantener la instancia en memoria coherente (respuestas de login la usan).
+    # Un ClaimsUser no debe cargarse solo para esto.
+    if 'ultimo_acceso' in getattr(user, '__dict__', {}):
+        user.__dict__['ultimo_acceso'] = now
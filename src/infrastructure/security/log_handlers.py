@@ -0,0 +1,115 @@
+"""
+Pipeline de logging no bloqueante para el logger ``security``.
+
+- ``AsyncSecurityFileHandler``: ``QueueHandler`` que encola el ``LogRecord``
+  sin formatearlo; un ``QueueListener`` con hilo propio formatea y escribe en
+  el archivo. El hilo de la request solo paga un ``put_nowait``.
+- ``SecurityJSONFormatter``: una línea JSON por evento con los campos
+  ``extra`` del registro (event_type, user_id, ip_address...).
+
+Solo depende de la librería estándar: se carga desde ``LOGGING`` antes de
+que las apps de Django estén listas.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Atributos estándar de LogRecord (no se copian como campos extra)
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime',
+}
+
+
+class SecurityJSONFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON."""
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_') and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class AsyncSecurityFileHandler(QueueHandler):
+    """
+    Handler asíncrono: cola acotada + hilo escritor.
+
+    Si la cola se llena, el registro se descarta (y se cuenta en
+    ``dropped``) en lugar de bloquear la request.
+
+    Args:
+        filename: Archivo de destino
+        json_format: Usar ``SecurityJSONFormatter`` (si no, ``fmt``/``style``)
+        max_queue_size: Capacidad de la cola
+    """
+
+    def __init__(self, filename, json_format=True, max_queue_size=10000,
+                 fmt=None, style='%', encoding='utf-8'):
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self.target = logging.FileHandler(filename, encoding=encoding, delay=True)
+        if json_format:
+            self.target.setFormatter(SecurityJSONFormatter())
+        elif fmt:
+            self.target.setFormatter(logging.Formatter(fmt, style=style))
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def setFormatter(self, fmt):
+        # El formateo ocurre en el hilo escritor
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def _ensure_listener(self):
+        # El hilo no sobrevive a un fork (gunicorn --preload): se relanza
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Sin formateo en el hilo de la request: el registro viaja tal cual
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Vacía la cola y detiene el hilo escritor."""
+        listener = self._listener
+        if listener is not None and self._pid == os.getpid():
+            self._listener = None
+            self._pid = None
+            listener.stop()
+        self.target.close()
+
+    def close(self):
+        self.stop()
+        super().close()
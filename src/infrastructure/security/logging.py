@@ -1,17 +1,30 @@
 """
 Sistema de logging de seguridad para detectar y registrar intentos de XSS.
+
+Los eventos se construyen solo si el nivel está habilitado en el logger
+``security`` y el mensaje se formatea de forma perezosa (lo hace el handler,
+en el hilo escritor de ``log_handlers.AsyncSecurityFileHandler``). Los tipos
+de evento de alto volumen se muestrean con ``SECURITY_LOG_SAMPLE_RATES``.
 """
 
 import logging
+import random
 from typing import Optional, Dict, Any
 from django.conf import settings
-from django.utils import timezone
 
 
 # Logger específico para eventos de seguridad
 security_logger = logging.getLogger('security')
 
 
+def _should_log(level: int, event_type: str) -> bool:
+    """Nivel habilitado y evento dentro de la tasa de muestreo."""
+    if not security_logger.isEnabledFor(level):
+        return False
+    rate = getattr(settings, 'SECURITY_LOG_SAMPLE_RATES', {}).get(event_type)
+    return rate is None or random.random() < rate
+
+
 class SecurityEventLogger:
     """Clase para registrar eventos de seguridad."""
     
@@ -39,7 +52,7 @@ class SecurityEventLogger:
             return
             
         # Solo registrar si hubo cambios (posible XSS)
-        if original_content != sanitized_content:
+        if original_content != sanitized_content and _should_log(logging.WARNING, 'xss_attempt'):
             extra_data = {
                 'event_type': 'xss_attempt',
                 'user_id': user_id,
@@ -49,13 +62,12 @@ class SecurityEventLogger:
                 'original_length': len(original_content),
                 'sanitized_length': len(sanitized_content),
                 'original_preview': original_content[:200],  # Primeros 200 caracteres
-                'timestamp': timezone.now().isoformat(),
                 'severity': 'WARNING'
             }
             
             security_logger.warning(
-                f"Potential XSS attempt detected - Field: {field_name or 'unknown'}, "
-                f"User: {user_id or 'anonymous'}, Endpoint: {endpoint or 'unknown'}",
+                "Potential XSS attempt detected - Field: %s, User: %s, Endpoint: %s",
+                field_name or 'unknown', user_id or 'anonymous', endpoint or 'unknown',
                 extra=extra_data
             )
     
@@ -79,6 +91,9 @@ class SecurityEventLogger:
             endpoint: Endpoint donde ocurrió
             ip_address: IP del cliente
         """
+        if not _should_log(logging.INFO, 'suspicious_input'):
+            return
+        
         extra_data = {
             'event_type': 'suspicious_input',
             'user_id': user_id,
@@ -88,13 +103,12 @@ class SecurityEventLogger:
             'content_length': len(content),
             'content_preview': content[:100],
             'reason': reason,
-            'timestamp': timezone.now().isoformat(),
             'severity': 'INFO'
         }
         
         security_logger.info(
-            f"Suspicious input detected - Reason: {reason}, "
-            f"Field: {field_name or 'unknown'}, User: {user_id or 'anonymous'}",
+            "Suspicious input detected - Reason: %s, Field: %s, User: %s",
+            reason, field_name or 'unknown', user_id or 'anonymous',
             extra=extra_data
         )
     
@@ -116,18 +130,32 @@ class SecurityEventLogger:
             severity: Nivel de severidad (INFO, WARNING, ERROR, CRITICAL)
             extra_data: Datos adicionales del evento
         """
+        log_level = getattr(logging, severity.upper(), logging.INFO)
+        if not _should_log(log_level, event_type):
+            return
+        
         log_data = {
             'event_type': event_type,
             'user_id': user_id,
-            'timestamp': timezone.now().isoformat(),
             'severity': severity
         }
         
         if extra_data:
             log_data.update(extra_data)
         
-        log_level = getattr(logging, severity.upper(), logging.INFO)
         security_logger.log(log_level, message, extra=log_data)
+    
+    @staticmethod
+    def log_debug_event(event_type: str, message: str, *args, **fields):
+        """
+        Registra un evento estructurado de depuración (nivel DEBUG).
+        
+        No construye nada si DEBUG no está habilitado en el logger ``security``.
+        """
+        if not _should_log(logging.DEBUG, event_type):
+            return
+        fields['event_type'] = event_type
+        security_logger.debug(message, *args, extra=fields)
 
 
 def get_client_ip(request) -> Optional[str]:
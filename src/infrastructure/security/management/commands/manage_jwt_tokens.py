@@ -6,7 +6,9 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.db import models
+from django.db.models import Count, Q
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from src.infrastructure.security.jti_blacklist import jti_blacklist
 
 User = get_user_model()
 
@@ -39,9 +41,25 @@ class Command(BaseCommand):
             action='store_true',
             help='Forzar acción sin confirmación'
         )
+        
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Filas por lote en cleanup/blacklist (default: 1000)'
+        )
+        
+        parser.add_argument(
+            '--since-id',
+            type=int,
+            default=0,
+            help='Reanudar desde este id de OutstandingToken (checkpoint del progreso)'
+        )
     
     def handle(self, *args, **options):
         action = options['action']
+        self.batch_size = max(1, options['batch_size'])
+        self.since_id = options['since_id']
         
         if action == 'cleanup':
             self.cleanup_tokens(options['force'])
@@ -54,10 +72,57 @@ class Command(BaseCommand):
         elif action == 'blacklist_all':
             self.blacklist_all_tokens(options['force'])
     
+    # ===== ITERACIÓN POR LOTES =====
+    
+    def _iter_id_batches(self, queryset):
+        """
+        Recorre el queryset por keyset (id > último id) en lotes de --batch-size.
+        
+        Yields:
+            list: ids del lote (ordenados)
+        """
+        last_id = self.since_id
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+    
+    def _report_progress(self, done, total, last_id):
+        """Progreso por lote; el último id sirve como --since-id para reanudar."""
+        self.stdout.write(f'  ... {done}/{total} procesados (--since-id {last_id})')
+    
+    def _blacklist_in_batches(self, queryset, total):
+        """
+        Inserta en BlacklistedToken por lotes con bulk_create(ignore_conflicts=True).
+        
+        Returns:
+            int: tokens procesados
+        """
+        done = 0
+        for ids in self._iter_id_batches(queryset):
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token_id=token_id) for token_id in ids],
+                ignore_conflicts=True,
+            )
+            # bulk_create no emite post_save: recargar el filtro de JTIs de
+            # todos los procesos tras cada lote, así una ejecución interrumpida
+            # (reanudable con --since-id) no deja tokens revocados aceptados
+            jti_blacklist.invalidate_all()
+            done += len(ids)
+            self._report_progress(done, total, ids[-1])
+        return done
+    
     def cleanup_tokens(self, force=False):
-        """Limpia tokens expirados."""
+        """Limpia tokens expirados (DELETE por lotes de ids)."""
         expired_tokens = OutstandingToken.objects.filter(
-            expires_at__lt=timezone.now()
+            expires_at__lt=timezone.now(),
+            id__gt=self.since_id,
         )
         expired_count = expired_tokens.count()
         
@@ -73,25 +138,26 @@ class Command(BaseCommand):
                 self.stdout.write('Operación cancelada.')
                 return
         
-        # Eliminar tokens expirados
-        deleted_count = expired_tokens.delete()[0]
+        # Eliminar tokens expirados en lotes cortos (locks breves)
+        deleted_count = 0
+        for ids in self._iter_id_batches(expired_tokens):
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted_count += len(ids)
+            self._report_progress(deleted_count, expired_count, ids[-1])
+        
         self.stdout.write(
             self.style.SUCCESS(f'Se eliminaron {deleted_count} tokens expirados.')
         )
     
     def list_tokens(self):
         """Lista tokens activos."""
-        tokens = OutstandingToken.objects.select_related('user').filter(
-            expires_at__gt=timezone.now()
+        active_tokens = OutstandingToken.objects.select_related('user').filter(
+            expires_at__gt=timezone.now(),
+            blacklistedtoken__isnull=True,
         ).order_by('-created_at')
         
-        # Filtrar tokens no blacklisted
-        active_tokens = []
-        for token in tokens:
-            if not hasattr(token, 'blacklistedtoken'):
-                active_tokens.append(token)
-        
-        if not active_tokens:
+        active_count = active_tokens.count()
+        if not active_count:
             self.stdout.write('No hay tokens activos.')
             return
         
@@ -100,59 +166,52 @@ class Command(BaseCommand):
         
         for token in active_tokens[:20]:  # Mostrar solo los primeros 20
             token_short = token.jti[:8] + '...'
-            user_email = token.user.email[:22] + '...' if len(token.user.email) > 25 else token.user.email
-            created_at = token.created_at.strftime('%Y-%m-%d %H:%M:%S')
+            email = token.user.email if token.user else 'N/A'
+            user_email = email[:22] + '...' if len(email) > 25 else email
+            created_at = token.created_at.strftime('%Y-%m-%d %H:%M:%S') if token.created_at else '-'
             expires_at = token.expires_at.strftime('%Y-%m-%d %H:%M:%S')
             
-            # Verificar si está blacklisted
-            is_blacklisted = hasattr(token, 'blacklistedtoken')
-            status = 'BLACKLIST' if is_blacklisted else 'ACTIVO'
-            
             self.stdout.write(
-                f'{token_short:<12} {user_email:<25} {created_at:<20} {expires_at:<20} {status:<10}'
+                f'{token_short:<12} {user_email:<25} {created_at:<20} {expires_at:<20} {"ACTIVO":<10}'
             )
         
-        if len(active_tokens) > 20:
-            self.stdout.write(f'\n... y {len(active_tokens) - 20} tokens más')
+        if active_count > 20:
+            self.stdout.write(f'\n... y {active_count - 20} tokens más')
     
     def show_stats(self, days):
         """Muestra estadísticas de tokens."""
         now = timezone.now()
         since = now - timezone.timedelta(days=days)
         
-        # Estadísticas generales
-        total_tokens = OutstandingToken.objects.count()
-        active_tokens = OutstandingToken.objects.filter(
-            expires_at__gt=now
-        ).count()
-        blacklisted_tokens = BlacklistedToken.objects.count()
-        expired_tokens = OutstandingToken.objects.filter(
-            expires_at__lt=now
-        ).count()
-        recent_tokens = OutstandingToken.objects.filter(
-            created_at__gte=since
-        ).count()
+        # Estadísticas generales en una sola consulta agregada
+        totals = OutstandingToken.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(expires_at__gt=now)),
+            expired=Count('id', filter=Q(expires_at__lt=now)),
+            recent=Count('id', filter=Q(created_at__gte=since)),
+            blacklisted=Count('blacklistedtoken'),
+        )
         
         # Usuarios más activos
         active_users = OutstandingToken.objects.filter(
             created_at__gte=since
-        ).values('user__email').annotate(
+        ).values('user__correo').annotate(
             token_count=models.Count('id')
         ).order_by('-token_count')[:10]
         
         self.stdout.write(self.style.SUCCESS(f'\n=== Estadísticas de Tokens JWT (últimos {days} días) ==='))
         
         self.stdout.write(f'\n📊 Resumen General:')
-        self.stdout.write(f'  • Total tokens: {total_tokens}')
-        self.stdout.write(f'  • Tokens activos: {active_tokens}')
-        self.stdout.write(f'  • Tokens blacklisted: {blacklisted_tokens}')
-        self.stdout.write(f'  • Tokens expirados: {expired_tokens}')
-        self.stdout.write(f'  • Tokens creados (período): {recent_tokens}')
+        self.stdout.write(f'  • Total tokens: {totals["total"]}')
+        self.stdout.write(f'  • Tokens activos: {totals["active"]}')
+        self.stdout.write(f'  • Tokens blacklisted: {totals["blacklisted"]}')
+        self.stdout.write(f'  • Tokens expirados: {totals["expired"]}')
+        self.stdout.write(f'  • Tokens creados (período): {totals["recent"]}')
         
         if active_users:
             self.stdout.write(f'\n👥 Usuarios Más Activos:')
             for user in active_users:
-                email = user['user__email'] or 'N/A'
+                email = user['user__correo'] or 'N/A'
                 count = user['token_count']
                 self.stdout.write(f'  • {email}: {count} tokens')
     
@@ -165,50 +224,40 @@ class Command(BaseCommand):
             return
         
         try:
-            user = User.objects.get(email=user_email)
-            tokens = OutstandingToken.objects.filter(user=user)
-            
-            # Contar tokens activos (no blacklisted)
-            active_count = 0
-            for token in tokens:
-                if not hasattr(token, 'blacklistedtoken'):
-                    active_count += 1
-            
-            if active_count == 0:
-                self.stdout.write(f'No hay tokens activos para {user_email}')
-                return
-            
-            if not force:
-                confirm = input(f'¿Agregar {active_count} tokens de {user_email} a blacklist? (y/N): ')
-                if confirm.lower() != 'y':
-                    self.stdout.write('Operación cancelada.')
-                    return
-            
-            # Agregar a blacklist
-            blacklisted_count = 0
-            for token in tokens:
-                if not hasattr(token, 'blacklistedtoken'):
-                    BlacklistedToken.objects.get_or_create(token=token)
-                    blacklisted_count += 1
-            
-            self.stdout.write(
-                self.style.SUCCESS(f'Se agregaron {blacklisted_count} tokens a blacklist para {user_email}')
-            )
-            
+            user = User.objects.get(correo__iexact=user_email)
         except User.DoesNotExist:
             self.stdout.write(
                 self.style.ERROR(f'Usuario no encontrado: {user_email}')
             )
+            return
+        
+        tokens = OutstandingToken.objects.filter(
+            user=user, blacklistedtoken__isnull=True, id__gt=self.since_id
+        )
+        active_count = tokens.count()
+        
+        if active_count == 0:
+            self.stdout.write(f'No hay tokens activos para {user_email}')
+            return
+        
+        if not force:
+            confirm = input(f'¿Agregar {active_count} tokens de {user_email} a blacklist? (y/N): ')
+            if confirm.lower() != 'y':
+                self.stdout.write('Operación cancelada.')
+                return
+        
+        blacklisted_count = self._blacklist_in_batches(tokens, active_count)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Se agregaron {blacklisted_count} tokens a blacklist para {user_email}')
+        )
     
     def blacklist_all_tokens(self, force=False):
         """Agrega todos los tokens activos a blacklist."""
-        tokens = OutstandingToken.objects.all()
-        
-        # Contar tokens activos (no blacklisted)
-        active_count = 0
-        for token in tokens:
-            if not hasattr(token, 'blacklistedtoken'):
-                active_count += 1
+        tokens = OutstandingToken.objects.filter(
+            blacklistedtoken__isnull=True, id__gt=self.since_id
+        )
+        active_count = tokens.count()
         
         if active_count == 0:
             self.stdout.write('No hay tokens activos para agregar a blacklist.')
@@ -220,12 +269,7 @@ class Command(BaseCommand):
                 self.stdout.write('Operación cancelada.')
                 return
         
-        # Agregar todos a blacklist
-        blacklisted_count = 0
-        for token in tokens:
-            if not hasattr(token, 'blacklistedtoken'):
-                BlacklistedToken.objects.get_or_create(token=token)
-                blacklisted_count += 1
+        blacklisted_count = self._blacklist_in_batches(tokens, active_count)
         
         self.stdout.write(
             self.style.SUCCESS(f'Se agregaron {blacklisted_count} tokens a blacklist.')
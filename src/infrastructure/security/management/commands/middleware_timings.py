@@ -0,0 +1,105 @@
+"""
+Comando de gestión para la latencia por capa de middleware.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from src.infrastructure.middleware import timing
+
+
+class Command(BaseCommand):
+    help = 'Muestra los histogramas de latencia por middleware (p50/p95/p99)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--by-route',
+            action='store_true',
+            help='Desglosar por ruta'
+        )
+        
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Salida en JSON'
+        )
+        
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reiniciar los histogramas publicados'
+        )
+        
+        parser.add_argument(
+            '--probe',
+            type=str,
+            help='Medir en este proceso N requests GET a esta ruta (ej: /api/v1/)'
+        )
+        
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Requests para --probe (default: 100)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['reset']:
+            timing.reset_all()
+            self.stdout.write(self.style.SUCCESS('✅ Histogramas reiniciados'))
+            return
+        
+        if options['probe']:
+            histograms = self._probe(options['probe'], options['requests'])
+        else:
+            if not getattr(settings, 'MIDDLEWARE_TIMING_ENABLED', False):
+                self.stdout.write(self.style.WARNING(
+                    'MIDDLEWARE_TIMING_ENABLED está desactivado: solo se muestran datos ya publicados'
+                ))
+            histograms = timing.collect(include_local=False)
+        
+        rows = timing.summarize(histograms, by_route=options['by_route'])
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        
+        if not rows:
+            self.stdout.write('Sin datos. ¿La caché es compartida entre procesos (Redis)?')
+            return
+        
+        self._print_table(rows, options['by_route'])
+    
+    def _probe(self, path, count):
+        """Ejecuta requests con la pila instrumentada dentro de este proceso."""
+        middleware = list(settings.MIDDLEWARE)
+        if not getattr(settings, 'MIDDLEWARE_TIMING_ENABLED', False):
+            middleware = timing.instrument(middleware)
+        
+        timing.registry.reset()
+        host = (settings.ALLOWED_HOSTS or ['localhost'])[0].lstrip('.').replace('*', 'localhost')
+        with override_settings(MIDDLEWARE=middleware):
+            client = Client(HTTP_HOST=host)
+            for _ in range(count):
+                client.get(path)
+        
+        self.stdout.write(f'📊 {count} requests GET {path}\n')
+        return timing.registry.snapshot()
+    
+    def _print_table(self, rows, by_route):
+        header = f"{'Capa':<60} {'Fase':<9} {'n':>7} {'p50':>9} {'p95':>9} {'p99':>9}"
+        if by_route:
+            header = f"{'Ruta':<30} " + header
+        self.stdout.write(self.style.SUCCESS(header))
+        for row in rows:
+            line = (
+                f"{row['layer'][-60:]:<60} {row['phase']:<9} {row['count']:>7} "
+                f"{row['p50_us']:>9.1f} {row['p95_us']:>9.1f} {row['p99_us']:>9.1f}"
+            )
+            if by_route:
+                line = f"{row['route'][:30]:<30} " + line
+            self.stdout.write(line)
+        self.stdout.write('\n(μs; buckets geométricos ~20%)')
@@ -0,0 +1,95 @@
+"""
+Caché versionada de permisos efectivos por usuario.
+
+El conjunto de permisos efectivos (rol + overrides del usuario) se guarda como
+``frozenset`` en dos niveles:
+
+1. Memo local a la request: atributo en la instancia del usuario
+   (igual que ``_perm_cache`` de ``ModelBackend``).
+2. Caché compartida (``django.core.cache``): clave que incluye la versión de
+   permisos del rol y del usuario, de modo que cualquier cambio invalida las
+   entradas antiguas sin tener que buscarlas ni borrarlas.
+
+Las versiones se incrementan desde ``signals.py`` cuando cambia
+``Role.permisos`` (incluye ``Role.add_permission``) o un ``UserPermission``.
+"""
+
+from typing import Callable, FrozenSet, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_versions import bump_version
+
+
+# Atributo usado como memo dentro de la request
+_MEMO_ATTR = '_effective_permissions_cache'
+
+ROLE_VERSION_KEY = 'perm:ver:role:{role_id}'
+USER_VERSION_KEY = 'perm:ver:user:{user_id}'
+EFFECTIVE_KEY = 'perm:eff:{user_id}:{role_id}:{role_version}:{user_version}'
+
+
+def _timeout() -> int:
+    """TTL de las entradas de permisos efectivos en la caché compartida."""
+    return int(getattr(settings, 'PERMISSIONS_CACHE_TIMEOUT', 300))
+
+
+def bump_role_version(role_id) -> None:
+    """Invalida los permisos efectivos de todos los usuarios de un rol."""
+    if role_id is not None:
+        bump_version(ROLE_VERSION_KEY.format(role_id=role_id))
+
+
+def bump_user_version(user_id) -> None:
+    """Invalida los permisos efectivos de un usuario."""
+    if user_id is not None:
+        bump_version(USER_VERSION_KEY.format(user_id=user_id))
+
+
+def _effective_key(user_id, role_id) -> str:
+    """Construye la clave de caché con las versiones actuales de rol y usuario."""
+    role_key = ROLE_VERSION_KEY.format(role_id=role_id)
+    user_key = USER_VERSION_KEY.format(user_id=user_id)
+    versions = cache.get_many([role_key, user_key])
+    return EFFECTIVE_KEY.format(
+        user_id=user_id,
+        role_id=role_id,
+        role_version=versions.get(role_key, 1),
+        user_version=versions.get(user_key, 1),
+    )
+
+
+def get_effective_permissions(user, compute: Callable[[], Iterable[str]]) -> FrozenSet[str]:
+    """
+    Obtiene los permisos efectivos del usuario usando memo + caché compartida.
+
+    Args:
+        user: Instancia de User
+        compute: Función que calcula los códigos desde la BD (camino frío)
+
+    Returns:
+        frozenset: Códigos de permisos efectivos
+    """
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is not None:
+        return memo
+
+    user_id = getattr(user, 'pk', None)
+    if user_id is None or not getattr(settings, 'PERMISSIONS_CACHE_ENABLED', True):
+        permissions = frozenset(compute())
+        setattr(user, _MEMO_ATTR, permissions)
+        return permissions
+
+    # rol_id_id evita cargar el Role solo para construir la clave
+    role_id = getattr(user, 'rol_id_id', None)
+    key = _effective_key(user_id, role_id)
+
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = frozenset(compute())
+        cache.set(key, permissions, timeout=_timeout())
+
+    setattr(user, _MEMO_ATTR, permissions)
+    return permissions
+
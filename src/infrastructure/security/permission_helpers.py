@@ -5,9 +5,10 @@ Estos helpers complementan las clases de permisos de DRF y pueden
 ser utilizados en resolvers de GraphQL, tareas de Celery, etc.
 """
 
-from typing import Optional
 from django.contrib.auth import get_user_model
 
+from .role_index import get_role_name_for_user
+
 User = get_user_model()
 
 
@@ -28,13 +29,18 @@ def get_user_role(user) -> str:
     if not user or not user.is_authenticated:
         return ''
     
+    try:
+        role_name = get_role_name_for_user(user)
+    except Exception:
+        role_name = None
+    
+    if role_name:
+        return role_name
+    
     if user.is_superuser:
         return 'ADMINISTRADOR'
     
-    try:
-        return user.rol_id.nombre if user.rol_id else ''
-    except Exception:
-        return ''
+    return ''
 
 
 # ============================================================================
@@ -504,13 +510,6 @@ def can_export_data(user) -> bool:
 # UTILIDADES GENERALES
 # ============================================================================
 
-def get_user_role(user) -> Optional[str]:
-    """Retorna el rol del usuario o None."""
-    if user and user.is_authenticated:
-        return getattr(user, 'role', None)
-    return None
-
-
 def has_any_role(user, roles: list) -> bool:
     """Verifica si el usuario tiene alguno de los roles especificados."""
     if not user or not user.is_authenticated:
@@ -11,6 +11,8 @@ Roles del sistema:
 
 from rest_framework import permissions
 
+from .role_index import get_role_name_for_user
+
 
 # ============================================================================
 # HELPER FUNCTION - Obtener rol del usuario
@@ -27,9 +29,11 @@ def get_user_role(user):
     if not user or not user.is_authenticated:
         return None
     
-    # user.rol_id es FK a Role (upeu_rol)
-    if hasattr(user, 'rol_id') and user.rol_id:
-        return user.rol_id.nombre  # upeu_rol.nombre
+    # user.rol_id es FK a Role (upeu_rol); se resuelve con el índice compilado
+    # para no cargar el Role de cada usuario
+    role_name = get_role_name_for_user(user)
+    if role_name:
+        return role_name
     
     # Fallback: si es superuser, considerarlo ADMINISTRADOR
     if user.is_superuser:
@@ -1,6 +1,14 @@
-from typing import Optional
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional
+
+from django.conf import settings
 from django.db import connection
 
+from .role_index import role_has_permission
+
 
 def _role_has_permission_from_json(role, permission_code: str) -> bool:
     """Check role.permisos JSON structure for permission like 'module.action'.
@@ -27,33 +35,75 @@ def _role_has_permission_from_json(role, permission_code: str) -> bool:
     return bool(permisos.get(permission_code))
 
 
-def _role_has_permission_from_tables(role_id: int, permission_code: str) -> bool:
-    """Fallback: check upeu_permiso and upeu_rol_permiso tables using raw SQL.
+# ---------------------------------------------------------------------------
+# Snapshot of upeu_rol_permiso / upeu_permiso (role_id -> frozenset(codes))
+# ---------------------------------------------------------------------------
 
-    This avoids requiring Django models for these optional tables.
-    """
-    if not role_id:
-        return False
+_snapshot_lock = threading.Lock()
+_tables_exist: Optional[bool] = None
+_snapshot: Mapping[int, FrozenSet[str]] = MappingProxyType({})
+_snapshot_loaded_at: Optional[float] = None
 
-    with connection.cursor() as cur:
-        # Ensure tables exist (simple, tolerant check)
-        cur.execute("SELECT to_regclass('public.upeu_permiso')")
-        perm_table = cur.fetchone()[0]
-        if not perm_table:
-            return False
 
-        # Query mapping
+def _permission_tables_exist() -> bool:
+    """Probe for upeu_permiso once per process (the schema does not change at runtime)."""
+    global _tables_exist
+    if _tables_exist is None:
+        with connection.cursor() as cur:
+            cur.execute("SELECT to_regclass('public.upeu_permiso')")
+            _tables_exist = bool(cur.fetchone()[0])
+    return _tables_exist
+
+
+def _load_role_tables_snapshot() -> Mapping[int, FrozenSet[str]]:
+    """Load the whole role -> permission codes mapping in a single query."""
+    mapping = {}
+    with connection.cursor() as cur:
         cur.execute(
             """
-            SELECT 1
-            FROM upeu_permiso p
-            JOIN upeu_rol_permiso rp ON rp.permiso_id = p.id
-            WHERE rp.rol_id = %s AND p.codigo = %s
-            LIMIT 1
-            """,
-            [role_id, permission_code]
+            SELECT rp.rol_id, p.codigo
+            FROM upeu_rol_permiso rp
+            JOIN upeu_permiso p ON p.id = rp.permiso_id
+            """
         )
-        return cur.fetchone() is not None
+        for role_id, codigo in cur.fetchall():
+            mapping.setdefault(role_id, set()).add(sys.intern(codigo))
+    return MappingProxyType({k: frozenset(v) for k, v in mapping.items()})
+
+
+def get_role_tables_snapshot() -> Mapping[int, FrozenSet[str]]:
+    """Return the cached mapping, reloading it every PERMISSION_TABLES_SNAPSHOT_TTL seconds.
+
+    Nothing in the application writes upeu_rol_permiso (it is edited directly
+    in the database), so the TTL is the only invalidation.
+    """
+    global _snapshot, _snapshot_loaded_at
+
+    if not _permission_tables_exist():
+        return _snapshot
+
+    now = time.monotonic()
+    ttl = float(getattr(settings, 'PERMISSION_TABLES_SNAPSHOT_TTL', 300))
+    if _snapshot_loaded_at is not None and now - _snapshot_loaded_at < ttl:
+        return _snapshot
+
+    with _snapshot_lock:
+        if _snapshot_loaded_at is None or now - _snapshot_loaded_at >= ttl:
+            _snapshot = _load_role_tables_snapshot()
+            _snapshot_loaded_at = now
+    return _snapshot
+
+
+def _role_has_permission_from_tables(role_id: int, permission_code: str) -> bool:
+    """Fallback: check upeu_permiso and upeu_rol_permiso tables.
+
+    Uses an in-memory snapshot of the mapping instead of querying per check.
+    """
+    if not role_id:
+        return False
+
+    codes = get_role_tables_snapshot().get(role_id)
+    return codes is not None and permission_code in codes
 
 
 def has_permission(user, permission_code: str) -> bool:
@@ -73,6 +123,18 @@ def has_permission(user, permission_code: str) -> bool:
     if getattr(user, 'is_superuser', False):
         return True
 
+    # Fast path: compiled role index keyed by the raw FK column (no Role load)
+    role_id = getattr(user, 'rol_id_id', None)
+    if role_id is not None:
+        indexed = role_has_permission(role_id, permission_code)
+        if indexed:
+            return True
+        if indexed is False:
+            try:
+                return _role_has_permission_from_tables(role_id, permission_code)
+            except Exception:
+                return False
+
     # Try to get role object (we store rol_id FK and role property alias)
     role_obj = getattr(user, 'rol', None) or getattr(user, 'role', None)
 
@@ -0,0 +1,187 @@
+"""
+Principal autenticado ligero construido desde los claims del JWT.
+
+``ClaimsUser`` expone lo que la capa de autorización necesita (id, correo,
+rol, is_active, is_staff, is_superuser) sin consultar ``upeu_usuario``. El
+``User`` completo del ORM se carga solo cuando una vista accede a cualquier
+otro atributo (``nombres``, ``save()``, relaciones...).
+
+La desactivación y los cambios de rol se cubren con un snapshot
+``(activo, rol_id)`` en la caché compartida con TTL corto
+(``JWT_USER_STATE_CACHE_TTL``), invalidado por ``signals.py`` al guardar
+o eliminar un usuario.
+"""
+
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .permission_cache import get_effective_permissions
+from .role_index import get_role_entry
+
+USER_STATE_KEY = 'auth:user_state:{user_id}'
+
+_MISSING = object()
+
+
+def _state_ttl() -> int:
+    return int(getattr(settings, 'JWT_USER_STATE_CACHE_TTL', 30))
+
+
+def get_user_state(user_id) -> Optional[Tuple[bool, Optional[int]]]:
+    """
+    Retorna ``(activo, rol_id)`` del usuario, cacheado con TTL corto.
+
+    Returns:
+        tuple o None si el usuario no existe
+    """
+    key = USER_STATE_KEY.format(user_id=user_id)
+    state = cache.get(key, _MISSING)
+    if state is not _MISSING:
+        return state
+
+    User = get_user_model()
+    state = User.objects.filter(pk=user_id).values_list('activo', 'rol_id').first()
+    cache.set(key, state, timeout=_state_ttl())
+    return state
+
+
+def invalidate_user_state(user_id) -> None:
+    """Elimina el snapshot de estado del usuario (activación/rol cambiados)."""
+    if user_id is not None:
+        cache.delete(USER_STATE_KEY.format(user_id=user_id))
+
+
+class ClaimsUser:
+    """
+    Usuario perezoso respaldado por los claims del token.
+
+    ``isinstance(obj, User)`` es verdadero (``__class__`` apunta al modelo),
+    por lo que puede asignarse a FKs; en ese caso se carga el User real.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, rol_id=None, correo=None, claims=None):
+        object.__setattr__(self, '_local', {
+            'id': user_id,
+            'rol_id_id': rol_id,
+            'correo': correo,
+            'claims': claims or {},
+        })
+        object.__setattr__(self, '_wrapped', None)
+
+    # ---- Atributos resueltos sin BD ----
+
+    @property
+    def id(self):
+        return self._local['id']
+
+    pk = id
+
+    @property
+    def rol_id_id(self):
+        return self._local['rol_id_id']
+
+    @property
+    def correo(self):
+        if self._local['correo'] is None:
+            return self._load().correo
+        return self._local['correo']
+
+    email = correo
+
+    @property
+    def is_active(self):
+        # Solo se construye para usuarios activos (ver authenticate_request)
+        return True
+
+    @property
+    def role_name(self):
+        entry = get_role_entry(self.rol_id_id)
+        if entry is not None:
+            return entry.name
+        return self._local['claims'].get('role')
+
+    @property
+    def is_staff(self):
+        return self.role_name in ['ADMINISTRADOR', 'COORDINADOR']
+
+    @property
+    def is_superuser(self):
+        return self.role_name == 'ADMINISTRADOR'
+
+    # ---- Permisos (caché versionada, el User se carga solo en frío) ----
+
+    def get_effective_permissions(self):
+        return get_effective_permissions(self, lambda: self._load()._compute_permissions())
+
+    def get_all_permissions(self):
+        return list(self.get_effective_permissions())
+
+    def has_permission(self, permission_code):
+        return permission_code in self.get_effective_permissions()
+
+    def has_any_permission(self, permission_codes):
+        return not self.get_effective_permissions().isdisjoint(permission_codes)
+
+    def has_all_permissions(self, permission_codes):
+        return self.get_effective_permissions().issuperset(permission_codes)
+
+    def has_perm(self, perm, obj=None):
+        if self.is_superuser:
+            return True
+        return self.has_permission(perm)
+
+    def has_module_perms(self, app_label):
+        return self.is_staff or self.is_superuser
+
+    @property
+    def __class__(self):
+        return get_user_model()
+
+    @property
+    def _meta(self):
+        return get_user_model()._meta
+
+    # ---- Carga perezosa del User completo ----
+
+    def _load(self):
+        wrapped = self._wrapped
+        if wrapped is None:
+            User = get_user_model()
+            wrapped = User.objects.get(pk=self.id)
+            object.__setattr__(self, '_wrapped', wrapped)
+        return wrapped
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos no definidos en ClaimsUser. Sondeos
+        # del ORM/DRF (hasattr(value, 'resolve_expression'), ...) no deben
+        # forzar la carga: solo se delega lo que existe en el modelo.
+        if name != '_state' and (name.startswith('__') or not hasattr(get_user_model(), name)):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        # Atributos del modelo van al User real; el resto (memos) se guardan aquí
+        if hasattr(get_user_model(), name):
+            setattr(self._load(), name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, get_user_model()):
+            return NotImplemented
+        return self.pk is not None and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return str(self._load())
+
+    def __repr__(self):
+        return f"<ClaimsUser id={self.id} rol_id={self.rol_id_id}>"
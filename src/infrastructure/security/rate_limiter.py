@@ -0,0 +1,272 @@
+"""
+Motor de rate limiting con ventana deslizante.
+
+Una sola operación atómica por verificación:
+
+- ``RedisSlidingWindowBackend``: script Lua (un round trip, EVALSHA).
+- ``LocalSlidingWindowBackend``: implementación en memoria del proceso
+  (desarrollo con LocMemCache y tests).
+
+La ventana deslizante se aproxima con dos ventanas fijas ponderadas::
+
+    estimado = previa * (1 - transcurrido / ventana) + actual
+
+lo que elimina las ráfagas 2x en el borde de las ventanas fijas.
+
+Opcionalmente ``LocalPrecheckLimiter`` delante del backend acumula deltas por
+clave en el proceso y los sincroniza cada ``RATE_LIMIT_PRECHECK_SYNC_INTERVAL``
+segundos: las requests entre sincronizaciones se resuelven sin red.
+
+Lo usan tanto ``RateLimitMiddleware`` como los throttles de DRF
+(``security/throttling.py``); ``charge()`` evita cobrar dos veces la misma
+clave dentro de una request.
+"""
+
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+
+class RateLimitResult(NamedTuple):
+    """Resultado de una verificación."""
+    allowed: bool
+    count: float
+    limit: int
+    retry_after: float
+
+
+def _window_ids(window: int, now: float) -> Tuple[int, float]:
+    """Id de la ventana actual y peso de la anterior."""
+    current = int(now // window)
+    elapsed = now - current * window
+    return current, (window - elapsed) / window
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local weight = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimated = previous * weight + current
+if estimated + cost > limit then
+    return {0, tostring(estimated)}
+end
+redis.call('INCRBY', KEYS[1], cost)
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {1, tostring(estimated + cost)}
+"""
+
+
+class LocalSlidingWindowBackend:
+    """Ventana deslizante en memoria del proceso (LocMem / tests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, int], float] = {}
+        self._last_purge = 0.0
+
+    def hit(self, key: str, limit: int, window: int, cost: int = 1,
+            now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        current_id, weight = _window_ids(window, now)
+
+        with self._lock:
+            current = self._counters.get((key, current_id), 0)
+            previous = self._counters.get((key, current_id - 1), 0)
+            estimated = previous * weight + current
+            if estimated + cost > limit:
+                allowed = False
+            else:
+                self._counters[(key, current_id)] = current + cost
+                estimated += cost
+                allowed = True
+            self._purge(now, window)
+
+        retry_after = 0.0 if allowed else window * weight
+        return RateLimitResult(allowed, estimated, limit, retry_after)
+
+    def record(self, key: str, window: int, cost: int, now: Optional[float] = None) -> None:
+        """Suma ``cost`` sin verificar el límite (hits ya admitidos)."""
+        now = time.time() if now is None else now
+        current_id, _ = _window_ids(window, now)
+        with self._lock:
+            self._counters[(key, current_id)] = self._counters.get((key, current_id), 0) + cost
+
+    def _purge(self, now: float, window: int) -> None:
+        # Descarta ventanas antiguas como mucho una vez por minuto
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+        stale = [k for k in self._counters if (k[1] + 2) * window < now]
+        for k in stale:
+            del self._counters[k]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class RedisSlidingWindowBackend:
+    """Ventana deslizante atómica en Redis (script Lua, un round trip)."""
+
+    def __init__(self, client=None, prefix: str = 'rl'):
+        if client is None:
+            from django_redis import get_redis_connection
+            client = get_redis_connection('default')
+        self._client = client
+        self._script = client.register_script(SLIDING_WINDOW_LUA)
+        self._prefix = prefix
+
+    def hit(self, key: str, limit: int, window: int, cost: int = 1,
+            now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        current_id, weight = _window_ids(window, now)
+        keys = [
+            f"{self._prefix}:{key}:{current_id}",
+            f"{self._prefix}:{key}:{current_id - 1}",
+        ]
+        allowed, estimated = self._script(keys=keys, args=[limit, window, weight, cost])
+        allowed = bool(int(allowed))
+        retry_after = 0.0 if allowed else window * weight
+        return RateLimitResult(allowed, float(estimated), limit, retry_after)
+
+    def record(self, key: str, window: int, cost: int, now: Optional[float] = None) -> None:
+        """Suma ``cost`` sin verificar el límite (hits ya admitidos)."""
+        now = time.time() if now is None else now
+        current_id, _ = _window_ids(window, now)
+        redis_key = f"{self._prefix}:{key}:{current_id}"
+        pipe = self._client.pipeline()
+        pipe.incrby(redis_key, cost)
+        pipe.expire(redis_key, window * 2)
+        pipe.execute()
+
+
+class LocalPrecheckLimiter:
+    """
+    Nivel local opcional delante de un backend compartido.
+
+    Acumula las requests admitidas por clave y las envía al backend en un
+    solo ``record(cost=delta)`` como mucho cada ``sync_interval`` segundos
+    (antes de verificar la request que dispara la sincronización). Si
+    el último conteo global conocido más el delta local ya supera el límite,
+    rechaza sin consultar el backend. La precisión cae en proporción al
+    intervalo de sincronización y al número de workers.
+    """
+
+    def __init__(self, backend, sync_interval: float = 1.0):
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        # key -> [conteo_global_conocido, delta_local, próxima_sincronización, ventana]
+        self._state: Dict[str, list] = {}
+
+    def hit(self, key: str, limit: int, window: int, cost: int = 1,
+            now: Optional[float] = None) -> RateLimitResult:
+        mono = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None and state[3] == window:
+                known, delta, next_sync, _ = state
+                if known + delta + cost > limit and mono < next_sync:
+                    return RateLimitResult(False, known + delta, limit, next_sync - mono)
+                if mono < next_sync:
+                    state[1] = delta + cost
+                    return RateLimitResult(True, known + state[1], limit, 0.0)
+                pending = delta
+            else:
+                pending = 0
+
+        if pending:
+            # Lo admitido localmente ya ocurrió: se registra aparte, sin
+            # límite, para que un rechazo de la request nueva no lo pierda
+            self.backend.record(key, window, pending, now=now)
+        result = self.backend.hit(key, limit, window, cost=cost, now=now)
+        with self._lock:
+            self._state[key] = [result.count, 0, mono + self.sync_interval, window]
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Acceso al motor
+# ---------------------------------------------------------------------------
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def _build_limiter():
+    backend_name = getattr(settings, 'RATE_LIMIT_BACKEND', 'auto')
+    backend = None
+    if backend_name in ('auto', 'redis'):
+        cache_backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+        if backend_name == 'redis' or 'django_redis' in cache_backend:
+            backend = RedisSlidingWindowBackend()
+    if backend is None:
+        backend = LocalSlidingWindowBackend()
+
+    if getattr(settings, 'RATE_LIMIT_LOCAL_PRECHECK', False):
+        return LocalPrecheckLimiter(
+            backend,
+            sync_interval=float(getattr(settings, 'RATE_LIMIT_PRECHECK_SYNC_INTERVAL', 1)),
+        )
+    return backend
+
+
+def get_rate_limiter():
+    """Motor compartido del proceso (se construye en el primer uso)."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = _build_limiter()
+    return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Descarta el motor actual (tests / cambio de settings)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
+
+
+def charge(request, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+    """
+    Cobra ``cost`` unidades a ``key`` una sola vez por request.
+
+    Si la misma clave ya se cobró en esta request (middleware + throttle de
+    DRF), se reutiliza el conteo sin volver a incrementar y solo se evalúa
+    contra ``limit``. Si ``cost`` es mayor que lo ya cobrado (coste de una
+    operación GraphQL conocido después del middleware) solo se cobra la
+    diferencia.
+    """
+    # DRF envuelve el HttpRequest: el registro va en el request de Django
+    django_request = getattr(request, '_request', request)
+    charged = getattr(django_request, '_rate_limit_charged', None)
+    if charged is None:
+        charged = {}
+        try:
+            django_request._rate_limit_charged = charged
+        except AttributeError:
+            pass
+
+    previous = charged.get(key)
+    if previous is not None:
+        result, paid = previous
+        if cost <= paid or not result.allowed:
+            allowed = result.allowed and result.count <= limit
+            return RateLimitResult(allowed, result.count, limit, result.retry_after)
+        result = get_rate_limiter().hit(key, limit, window, cost=cost - paid)
+    else:
+        paid = 0
+        result = get_rate_limiter().hit(key, limit, window, cost=cost)
+
+    charged[key] = (result, cost if result.allowed else paid)
+    return result
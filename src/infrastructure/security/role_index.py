@@ -0,0 +1,187 @@
+"""
+Índice compilado e inmutable de permisos por rol.
+
+Se construye una vez por proceso a partir de ``upeu_rol`` y queda en memoria
+como ``{rol_id: RoleEntry}``. Cada entrada guarda el nombre del rol, el flag
+``all`` y los códigos ``'module.action'`` ya separados e internados, de modo
+que una verificación de permisos es una búsqueda en un frozenset sin volver a
+recorrer el JSONB ``permisos``.
+
+La invalidación entre workers se hace con una clave de versión en la caché
+compartida: ``signals.py`` la incrementa al guardar/eliminar un ``Role`` y
+cada proceso la consulta como mucho cada ``ROLE_INDEX_CHECK_INTERVAL`` segundos.
+
+Los cambios que no emiten señales (``QuerySet.update``, SQL directo, otra
+aplicación sobre ``upeu_rol``) solo los cubre la antigüedad máxima: el índice
+se recarga siempre pasados ``ROLE_INDEX_MAX_AGE`` segundos. Con una caché
+local al proceso (LocMem) la versión no se comparte y se recarga en cada
+verificación.
+"""
+
+import logging
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, FrozenSet
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_versions import bump_version as bump_cache_version, cache_is_shared
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'perm:role_index:ver'
+
+
+class RoleEntry(NamedTuple):
+    """Entrada compilada de un rol."""
+    name: str
+    all: bool
+    codes: FrozenSet[str]
+    modules: FrozenSet[str]
+
+    def has_permission(self, permission_code: str) -> bool:
+        """'module.action' o 'module' (presencia del módulo)."""
+        if self.all:
+            return True
+        if '.' in permission_code:
+            return permission_code in self.codes
+        return permission_code in self.modules
+
+
+_EMPTY: Mapping[int, RoleEntry] = MappingProxyType({})
+
+_lock = threading.Lock()
+_index: Mapping[int, RoleEntry] = _EMPTY
+_loaded_version = None
+_loaded = False
+_loaded_at = 0.0
+_next_check = 0.0
+
+
+def compile_role(nombre: str, permisos) -> RoleEntry:
+    """Compila el JSONB ``permisos`` de un rol en una RoleEntry."""
+    if not isinstance(permisos, dict):
+        permisos = {}
+
+    codes = set()
+    modules = set()
+    for module, actions in permisos.items():
+        if isinstance(actions, list):
+            if actions:
+                modules.add(sys.intern(module))
+            for action in actions:
+                codes.add(sys.intern(f"{module}.{action}"))
+        elif actions:
+            modules.add(sys.intern(module))
+
+    return RoleEntry(
+        name=sys.intern(nombre or ''),
+        all=permisos.get('all') is True,
+        codes=frozenset(codes),
+        modules=frozenset(modules),
+    )
+
+
+def _load() -> Mapping[int, RoleEntry]:
+    """Lee todos los roles de la BD y construye el índice."""
+    from src.adapters.secondary.database.models import Role
+
+    rows = Role.objects.values_list('id', 'nombre', 'permisos')
+    return MappingProxyType({
+        role_id: compile_role(nombre, permisos)
+        for role_id, nombre, permisos in rows
+    })
+
+
+def _check_interval() -> float:
+    return float(getattr(settings, 'ROLE_INDEX_CHECK_INTERVAL', 5))
+
+
+def _max_age() -> float:
+    if not cache_is_shared():
+        # La versión de otro worker no se ve: recargar en cada verificación
+        return _check_interval()
+    return float(getattr(settings, 'ROLE_INDEX_MAX_AGE', 60))
+
+
+def get_role_index() -> Mapping[int, RoleEntry]:
+    """
+    Retorna el índice de roles, recargándolo si cambió la versión compartida
+    o si superó su antigüedad máxima.
+
+    Returns:
+        Mapping[int, RoleEntry]: Índice de solo lectura por id de rol
+    """
+    global _index, _loaded_version, _loaded, _loaded_at, _next_check
+
+    now = time.monotonic()
+    if _loaded and now < _next_check:
+        return _index
+
+    with _lock:
+        if _loaded and now < _next_check:
+            return _index
+
+        version = cache.get(VERSION_KEY)
+        if not _loaded or version != _loaded_version or now - _loaded_at >= _max_age():
+            try:
+                _index = _load()
+                _loaded = True
+                _loaded_version = version
+                _loaded_at = now
+            except Exception as exc:
+                # Sin BD disponible se mantiene el índice anterior
+                logger.warning("No se pudo cargar el índice de roles: %s", exc)
+        _next_check = now + _check_interval()
+
+    return _index
+
+
+def bump_version() -> None:
+    """Fuerza la recarga del índice en todos los procesos."""
+    global _next_check
+    bump_cache_version(VERSION_KEY)
+    # El proceso actual recarga en la siguiente consulta
+    _next_check = 0.0
+
+
+def get_role_entry(role_id) -> Optional[RoleEntry]:
+    """Entrada compilada para un id de rol (o None si no existe)."""
+    if role_id is None:
+        return None
+    return get_role_index().get(role_id)
+
+
+def get_role_name_for_user(user) -> Optional[str]:
+    """
+    Nombre del rol del usuario sin cargar el objeto Role.
+
+    Usa ``rol_id_id`` (columna cruda) contra el índice; si el rol no está en
+    el índice (p. ej. creado hace instantes en otro proceso) cae al FK.
+    """
+    role_id = getattr(user, 'rol_id_id', None)
+    if role_id is None:
+        return None
+
+    entry = get_role_entry(role_id)
+    if entry is not None:
+        return entry.name
+
+    role = getattr(user, 'rol_id', None)
+    return getattr(role, 'nombre', None)
+
+
+def role_has_permission(role_id, permission_code: str) -> Optional[bool]:
+    """
+    Verifica un permiso contra el índice.
+
+    Returns:
+        bool o None si el rol no está en el índice
+    """
+    entry = get_role_entry(role_id)
+    if entry is None:
+        return None
+    return entry.has_permission(permission_code)
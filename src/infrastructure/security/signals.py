@@ -0,0 +1,67 @@
+"""
+Señales de seguridad.
+
+Invalidan la caché de permisos efectivos (``permission_cache``) cuando cambian
+los permisos de un rol o los permisos personalizados de un usuario.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from src.adapters.secondary.database.models import Role, User
+
+from . import role_index
+from .jti_blacklist import jti_blacklist
+from .permission_cache import bump_role_version, bump_user_version
+from .principal import invalidate_user_state
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_permissions(sender, instance, **kwargs):
+    """Cambios en Role.permisos (incluye Role.add_permission) invalidan a sus usuarios."""
+    bump_role_version(instance.pk)
+    role_index.bump_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_auth_state(sender, instance, update_fields=None, **kwargs):
+    """Activación/desactivación o cambio de rol invalida el snapshot de autenticación."""
+    # Guardar solo ultimo_acceso no cambia el estado cacheado
+    if update_fields and set(update_fields) <= {'ultimo_acceso'}:
+        return
+    invalidate_user_state(instance.pk)
+
+
+def invalidate_user_permissions(sender, instance, **kwargs):
+    """Un GRANT/REVOKE de UserPermission invalida los permisos del usuario."""
+    bump_user_version(getattr(instance, 'usuario_id', None))
+
+
+def publish_blacklisted_jti(sender, instance, created=False, **kwargs):
+    """Propaga un token revocado al filtro de JTIs en memoria de cada proceso."""
+    if created:
+        token = instance.token
+        # Tras el commit: un proceso que recargue al ver el evento debe
+        # encontrar la fila en la BD
+        transaction.on_commit(lambda: jti_blacklist.add(token.jti, token.expires_at.timestamp()))
+
+
+post_save.connect(publish_blacklisted_jti, sender=BlacklistedToken,
+                  dispatch_uid='jti_blacklist_publish')
+
+
+# UserPermission se define de forma opcional en models.py
+try:
+    from src.adapters.secondary.database.models import UserPermission
+
+    post_save.connect(invalidate_user_permissions, sender=UserPermission,
+                      dispatch_uid='permission_cache_user_permission_save')
+    post_delete.connect(invalidate_user_permissions, sender=UserPermission,
+                        dispatch_uid='permission_cache_user_permission_delete')
+except ImportError:
+    pass
@@ -0,0 +1,75 @@
+"""
+Throttles de DRF sobre el motor de rate limiting compartido.
+
+Sustituyen a ``AnonRateThrottle``/``UserRateThrottle`` de DRF (que hacen
+get + set de la lista de timestamps en la caché) por una operación atómica
+de ventana deslizante (``security/rate_limiter.py``). Las tasas siguen en
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``.
+
+``LoginRateThrottle`` protege el login REST (``auth/views.py``) y el login
+GraphQL (``CustomGraphQLView``) con la misma clave ``login:<ip>``.
+"""
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .logging import get_client_ip
+from .rate_limiter import charge
+
+
+class EngineRateThrottle(SimpleRateThrottle):
+    """Base: evalúa ``scope`` contra el motor compartido."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.result = charge(request, self.key, self.num_requests, self.duration)
+        return self.result.allowed
+
+    def get_ident(self, request):
+        # Misma identificación de IP que RateLimitMiddleware (claves compartidas)
+        return get_client_ip(request) or 'unknown'
+
+    def wait(self):
+        result = getattr(self, 'result', None)
+        if result is None or result.allowed:
+            return None
+        return result.retry_after
+
+
+class AnonRateThrottle(EngineRateThrottle):
+    """Usuarios anónimos, por IP."""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return f"{self.scope}:{self.get_ident(request)}"
+
+
+class UserRateThrottle(EngineRateThrottle):
+    """Usuarios autenticados por id; anónimos por IP."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return f"{self.scope}:{ident}"
+
+
+class ScopedIPRateThrottle(EngineRateThrottle):
+    """Base para scopes por IP compartidos con RateLimitMiddleware."""
+
+    def get_cache_key(self, request, view):
+        return f"{self.scope}:{self.get_ident(request)}"
+
+
+class LoginRateThrottle(ScopedIPRateThrottle):
+    """Intentos de login (misma clave que el bucket 'login' del middleware)."""
+    scope = 'login'
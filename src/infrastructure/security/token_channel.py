@@ -0,0 +1,164 @@
+"""
+Canal de tokens JWT por request.
+
+Las mutations/vistas que emiten o revocan tokens los publican en
+``request._jwt_tokens``; quien arma la respuesta (``CustomGraphQLView`` o
+``JWTCookieMiddleware``) escribe las cookies solo a partir de este canal,
+sin volver a parsear el cuerpo de la request ni el de la respuesta.
+
+Las cookies se aplican una sola vez por request aunque ambos consumidores
+estén activos.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+
+from .logging import security_event_logger
+
+_REQUEST_ATTR = '_jwt_tokens'
+
+
+class TokenChannel:
+    """Tokens emitidos (o limpieza solicitada) durante una request."""
+
+    __slots__ = ('access', 'refresh', 'clear', 'applied')
+
+    def __init__(self):
+        self.access: Optional[str] = None
+        self.refresh: Optional[str] = None
+        self.clear = False
+        self.applied = False
+
+    def __bool__(self):
+        return bool(self.access or self.refresh or self.clear)
+
+
+def get_token_channel(request) -> Optional[TokenChannel]:
+    """Canal de la request o None si nadie publicó tokens."""
+    # DRF envuelve el HttpRequest: el canal vive en el request de Django
+    request = getattr(request, '_request', request)
+    channel = getattr(request, _REQUEST_ATTR, None)
+    return channel if isinstance(channel, TokenChannel) else None
+
+
+def _channel_for(request) -> TokenChannel:
+    request = getattr(request, '_request', request)
+    channel = get_token_channel(request)
+    if channel is None:
+        channel = TokenChannel()
+        setattr(request, _REQUEST_ATTR, channel)
+    return channel
+
+
+def publish_tokens(request, access: Optional[str] = None, refresh: Optional[str] = None) -> None:
+    """Publica tokens emitidos (login/refresh) para escribirlos como cookies."""
+    channel = _channel_for(request)
+    if access:
+        channel.access = access
+    if refresh:
+        channel.refresh = refresh
+    channel.clear = False
+
+
+def publish_clear(request) -> None:
+    """Solicita limpiar las cookies JWT (logout)."""
+    channel = _channel_for(request)
+    channel.access = None
+    channel.refresh = None
+    channel.clear = True
+
+
+# ============================================================================
+# ESCRITURA DE COOKIES (configuración de SIMPLE_JWT)
+# ============================================================================
+
+def _cookie_options(simple_jwt):
+    return {
+        'path': simple_jwt.get('AUTH_COOKIE_PATH', '/'),
+        'domain': simple_jwt.get('AUTH_COOKIE_DOMAIN'),
+        'samesite': simple_jwt.get('AUTH_COOKIE_SAMESITE', 'Lax' if settings.DEBUG else 'None'),
+    }
+
+
+def set_access_cookie(response, token):
+    """Establece cookie de access token."""
+    simple_jwt = getattr(settings, 'SIMPLE_JWT', {})
+    cookie_name = simple_jwt.get('AUTH_COOKIE', 'djgredis_session')
+
+    # Calcular max_age desde ACCESS_TOKEN_LIFETIME
+    access_lifetime = simple_jwt.get('ACCESS_TOKEN_LIFETIME')
+    max_age = int(access_lifetime.total_seconds()) if access_lifetime else 900  # 15 min default
+
+    response.set_cookie(
+        cookie_name,
+        token,
+        max_age=max_age,
+        secure=simple_jwt.get('AUTH_COOKIE_SECURE', not settings.DEBUG),
+        httponly=simple_jwt.get('AUTH_COOKIE_HTTP_ONLY', True),
+        **_cookie_options(simple_jwt)
+    )
+
+    # Evento estructurado de depuración (sin el token)
+    security_event_logger.log_debug_event(
+        'jwt_cookie_set', "JWT cookie set: %s", cookie_name,
+        cookie_name=cookie_name,
+        max_age=max_age,
+        path=simple_jwt.get('AUTH_COOKIE_PATH', '/'),
+        secure=simple_jwt.get('AUTH_COOKIE_SECURE', not settings.DEBUG),
+        samesite=simple_jwt.get('AUTH_COOKIE_SAMESITE', 'Lax' if settings.DEBUG else 'None'),
+    )
+
+
+def set_refresh_cookie(response, token):
+    """Establece cookie de refresh token."""
+    simple_jwt = getattr(settings, 'SIMPLE_JWT', {})
+    cookie_name = simple_jwt.get('AUTH_COOKIE_REFRESH', 'djgredis_auth')
+
+    # Calcular max_age desde REFRESH_TOKEN_LIFETIME
+    refresh_lifetime = simple_jwt.get('REFRESH_TOKEN_LIFETIME')
+    max_age = int(refresh_lifetime.total_seconds()) if refresh_lifetime else 432000  # 5 días default
+
+    response.set_cookie(
+        cookie_name,
+        token,
+        max_age=max_age,
+        secure=simple_jwt.get('AUTH_COOKIE_SECURE', not settings.DEBUG),
+        httponly=simple_jwt.get('AUTH_COOKIE_HTTP_ONLY', True),
+        **_cookie_options(simple_jwt)
+    )
+
+
+def clear_jwt_cookies(response):
+    """Limpia todas las cookies JWT."""
+    simple_jwt = getattr(settings, 'SIMPLE_JWT', {})
+    options = _cookie_options(simple_jwt)
+    response.delete_cookie(simple_jwt.get('AUTH_COOKIE', 'djgredis_session'), **options)
+    response.delete_cookie(simple_jwt.get('AUTH_COOKIE_REFRESH', 'djgredis_auth'), **options)
+
+    # También limpiar cookies comunes de Django
+    response.delete_cookie('sessionid', path='/', domain=None)
+    response.delete_cookie('csrftoken', path='/', domain=None)
+
+
+def apply_token_cookies(request, response) -> bool:
+    """
+    Escribe en la respuesta las cookies publicadas en el canal.
+
+    Returns:
+        bool: True si se escribió alguna cookie en esta llamada
+    """
+    channel = get_token_channel(request)
+    if not channel or channel.applied:
+        return False
+
+    if channel.clear:
+        clear_jwt_cookies(response)
+    else:
+        if channel.access:
+            set_access_cookie(response, channel.access)
+        if channel.refresh:
+            set_refresh_cookie(response, channel.refresh)
+
+    channel.applied = True
+    return True
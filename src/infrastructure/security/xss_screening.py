@@ -0,0 +1,124 @@
+"""
+Motor de detección de XSS en entradas de la request.
+
+Por cada valor:
+
+1. Prefiltro: solo se analizan valores que contienen ``<``, ``:``, ``=`` o
+   ``(`` (todo patrón sospechoso incluye al menos uno de ellos). La mayoría
+   de parámetros se descartan aquí.
+2. El valor (como mucho ``XSS_SCAN_MAX_LENGTH`` caracteres) se pasa a
+   minúsculas una vez y se analiza con dos expresiones que empiezan por el
+   carácter disparador, de modo que el motor de ``re`` salta directamente
+   entre disparadores:
+
+   - ``TAG_PATTERN``: ``<script``, ``<iframe``... (hacia adelante)
+   - ``REVERSED_PATTERN``: ``onX=``, ``eval(``, ``javascript:``,
+     ``data:text/html``... sobre el valor invertido, porque la palabra clave
+     va antes del disparador.
+
+Lo usa ``XSSProtectionMiddleware`` (``middleware/xss_protection.py``) para
+headers, parámetros GET y, opcionalmente, cuerpos JSON.
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+# Patrones de los dos escáneres anteriores, anclados en el disparador.
+# Se aplican sobre el valor en minúsculas.
+TAG_PATTERN = re.compile(
+    r'<\s*/?\s*(?:script|iframe|object|embed|link|meta)(?![a-z0-9_])'
+)
+REVERSED_PATTERN = re.compile(
+    r'=\s*[a-z]+no(?![a-z0-9_])'                          # onX=
+    r'|\(\s*(?:lave|trela|mrifnoc|tpmorp)(?![a-z0-9_])'    # eval( alert( confirm( prompt(
+    r'|:\s*tpircs(?:avaj|bv)'                              # javascript: vbscript:
+    r'|:atad(?<=lmth/txet:atad)'                           # data:text/html
+)
+
+# Headers que deben ser validados
+HEADERS_TO_CHECK = (
+    'HTTP_USER_AGENT',
+    'HTTP_REFERER',
+    'HTTP_X_FORWARDED_FOR',
+    'HTTP_X_REAL_IP',
+    'HTTP_ACCEPT',
+    'HTTP_ACCEPT_LANGUAGE',
+    'HTTP_ACCEPT_ENCODING',
+)
+
+DEFAULT_MAX_LENGTH = 4096
+DEFAULT_JSON_MAX_BYTES = 65536
+
+
+def _may_contain_payload(value: str) -> bool:
+    return '<' in value or ':' in value or '=' in value or '(' in value
+
+
+def find_suspicious(value, max_length: int = DEFAULT_MAX_LENGTH) -> Optional[str]:
+    """
+    Devuelve el fragmento sospechoso encontrado en ``value`` o None.
+
+    Args:
+        value: Valor a analizar (se ignoran los que no son str)
+        max_length: Máximo de caracteres analizados
+    """
+    if not value or not isinstance(value, str) or not _may_contain_payload(value):
+        return None
+    lowered = value[:max_length].lower()
+    match = TAG_PATTERN.search(lowered)
+    if match:
+        return match.group(0)
+    match = REVERSED_PATTERN.search(lowered[::-1])
+    return match.group(0)[::-1] if match else None
+
+
+def screen_items(items: Iterable[Tuple[str, str]],
+                 max_length: int = DEFAULT_MAX_LENGTH) -> Dict[str, str]:
+    """Analiza pares (nombre, valor) y devuelve los sospechosos."""
+    suspicious = {}
+    for name, value in items:
+        if find_suspicious(value, max_length):
+            suspicious[name] = value[:max_length]
+    return suspicious
+
+
+def screen_headers(request, max_length: int = DEFAULT_MAX_LENGTH) -> Dict[str, str]:
+    meta = request.META
+    return screen_items(((name, meta.get(name, '')) for name in HEADERS_TO_CHECK), max_length)
+
+
+def screen_query_params(request, max_length: int = DEFAULT_MAX_LENGTH) -> Dict[str, str]:
+    if not request.GET:
+        return {}
+    return screen_items(request.GET.items(), max_length)
+
+
+def screen_json_body(request, max_bytes: int = DEFAULT_JSON_MAX_BYTES) -> Dict[str, str]:
+    """
+    Analiza el cuerpo JSON crudo (sin decodificar el JSON).
+
+    Solo se leen los primeros ``max_bytes`` bytes; el texto se analiza como
+    un único valor.
+    """
+    content_type = (request.META.get('CONTENT_TYPE') or '').split(';')[0].strip().lower()
+    if content_type != 'application/json':
+        return {}
+    try:
+        body = request.body
+    except Exception:
+        return {}
+    if not body:
+        return {}
+    text = body[:max_bytes].decode('utf-8', errors='ignore')
+    found = find_suspicious(text, max_bytes)
+    return {'body': found} if found else {}
+
+
+def get_screening_limits() -> Tuple[int, int]:
+    """(XSS_SCAN_MAX_LENGTH, XSS_SCAN_JSON_MAX_BYTES) desde settings."""
+    return (
+        int(getattr(settings, 'XSS_SCAN_MAX_LENGTH', DEFAULT_MAX_LENGTH)),
+        int(getattr(settings, 'XSS_SCAN_JSON_MAX_BYTES', DEFAULT_JSON_MAX_BYTES)),
+    )
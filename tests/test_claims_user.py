@@ -0,0 +1,52 @@
+"""
+Tests del principal ligero construido desde los claims del JWT.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+
+from src.infrastructure.security import principal
+from src.infrastructure.security.principal import ClaimsUser
+
+
+class ClaimsUserTest(SimpleTestCase):
+    """Tests para isinstance/__class__, atributos sin BD y carga perezosa."""
+
+    def setUp(self):
+        self.User = get_user_model()
+        patcher = mock.patch.object(principal, 'get_role_entry', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = ClaimsUser(7, rol_id=2, correo='ana@upeu.edu.pe', claims={'role': 'COORDINADOR'})
+
+    def test_isinstance_y_clase_del_modelo(self):
+        """Verificar que se comporta como User para isinstance, FKs y comparación."""
+        self.assertIsInstance(self.user, self.User)
+        self.assertIs(self.user.__class__, self.User)
+        self.assertIs(self.user._meta, self.User._meta)
+        self.assertEqual(self.user, self.User(pk=7))
+        self.assertNotEqual(self.user, self.User(pk=8))
+        self.assertEqual(hash(self.user), hash(7))
+
+    def test_atributos_de_claims_sin_bd(self):
+        """Verificar id, rol, correo y flags de staff sin cargar el User."""
+        with mock.patch.object(ClaimsUser, '_load', side_effect=AssertionError('carga')):
+            self.assertEqual((self.user.pk, self.user.id, self.user.rol_id_id), (7, 7, 2))
+            self.assertEqual(self.user.correo, 'ana@upeu.edu.pe')
+            self.assertTrue(self.user.is_staff)
+            self.assertFalse(self.user.is_superuser)
+            # Sondeos del ORM/DRF y memos no fuerzan la carga
+            self.assertFalse(hasattr(self.user, 'resolve_expression'))
+            self.user._effective_permissions_cache = frozenset({'practices.view'})
+            self.assertTrue(self.user.has_permission('practices.view'))
+
+    def test_carga_perezosa_una_vez(self):
+        """Verificar que un atributo del modelo carga el User real una sola vez."""
+        real = self.User(pk=7, nombres='Ana', correo='ana@upeu.edu.pe')
+        with mock.patch.object(self.User.objects, 'get', return_value=real) as get:
+            self.assertEqual(self.user.nombres, 'Ana')
+            self.user.nombres = 'Ana María'
+            self.assertEqual(real.nombres, 'Ana María')
+        get.assert_called_once_with(pk=7)
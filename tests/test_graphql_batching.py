@@ -0,0 +1,80 @@
+"""
+Tests del batching de operaciones GraphQL en un solo POST.
+"""
+
+import json
+from types import SimpleNamespace
+
+import graphene
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from src.adapters.primary.graphql_api.dataloaders import get_loaders
+from src.adapters.primary.graphql_api.urls import CustomGraphQLView
+
+
+class Item(graphene.ObjectType):
+    name = graphene.String()
+
+
+class Query(graphene.ObjectType):
+    items = graphene.List(Item)
+    loaders = graphene.Int()
+
+    def resolve_items(root, info):
+        return [{'name': 'a'}, {'name': 'b'}]
+
+    def resolve_loaders(root, info):
+        return id(get_loaders(info.context))
+
+
+class BatchingTest(SimpleTestCase):
+    """Tests para la respuesta en lista, los límites y el coste acumulado."""
+
+    def setUp(self):
+        self.view = CustomGraphQLView.as_view(schema=graphene.Schema(query=Query), middleware=[])
+
+    def _post(self, operations):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps(operations), content_type='application/json',
+        )
+        request.user = SimpleNamespace(is_authenticated=True, is_staff=False, is_superuser=False)
+        response = self.view(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_cuerpo_escalar_es_400(self):
+        """Verificar que un JSON escalar (no objeto ni lista) se rechaza con 400, no 500."""
+        for body in (123, 'x', None):
+            with self.subTest(body=body):
+                status, payload = self._post(body)
+                self.assertEqual(status, 400)
+                self.assertIn('errors', payload)
+
+    def test_lista_con_contexto_compartido(self):
+        """Verificar una respuesta por operación y los loaders compartidos."""
+        status, payload = self._post([
+            {'id': 1, 'query': '{ loaders }'},
+            {'id': 2, 'query': '{ loaders items { name } }'},
+        ])
+        self.assertEqual(status, 200)
+        self.assertEqual([entry['id'] for entry in payload], [1, 2])
+        self.assertEqual(payload[0]['data']['loaders'], payload[1]['data']['loaders'])
+        self.assertEqual(payload[1]['extensions']['cost']['batchQueryCost'], 20)
+
+    @override_settings(GRAPHQL_BATCH_MAX_OPERATIONS=2)
+    def test_limites_del_batch(self):
+        """Verificar el rechazo de batches vacíos, largos o con login."""
+        self.assertEqual(self._post([])[0], 400)
+        self.assertEqual(self._post([{'query': '{ loaders }'}] * 3)[0], 400)
+        status, payload = self._post([
+            {'query': '{ loaders }'},
+            {'query': 'mutation { jwtLogin(email: "a", password: "b") { success } }'},
+        ])
+        self.assertEqual(status, 400)
+        self.assertIn('login', payload['errors'][0]['message'])
+
+    @override_settings(GRAPHQL_COST_BUDGETS={'DEFAULT': 30})
+    def test_presupuesto_acumulado(self):
+        """Verificar que el presupuesto del rol cubre la suma del batch."""
+        _, payload = self._post([{'query': '{ items { name } }'}] * 2)
+        self.assertEqual(payload[0]['status'], 200)
+        self.assertEqual(payload[1]['errors'][0]['extensions']['code'], 'QUERY_COST_EXCEEDED')
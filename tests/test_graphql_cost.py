@@ -0,0 +1,142 @@
+"""
+Tests del análisis de coste y profundidad de operaciones GraphQL.
+"""
+
+import json
+
+import graphene
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from graphql import get_operation_ast, parse
+
+from src.adapters.primary.graphql_api import cost
+from src.adapters.primary.graphql_api.urls import CustomGraphQLView
+from src.infrastructure.security.rate_limiter import reset_rate_limiter
+
+
+class Node(graphene.ObjectType):
+    name = graphene.String()
+    children = graphene.List(lambda: Node)
+    parent = graphene.Field(lambda: Node)
+
+
+class Page(graphene.ObjectType):
+    total_count = graphene.Int()
+    items = graphene.List(Node)
+
+
+class Query(graphene.ObjectType):
+    nodes = graphene.Field(Page, page_size=graphene.Int(default_value=20))
+    node = graphene.Field(Node)
+
+    def resolve_node(root, info):
+        return {'name': 'raíz'}
+
+
+schema = graphene.Schema(query=Query)
+
+
+class Mutation(graphene.ObjectType):
+    jwt_login = graphene.String()
+
+    def resolve_jwt_login(root, info):
+        return 'token'
+
+
+login_schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+def _analyze(query, variables=None):
+    document = parse(query)
+    return cost.analyze(schema.graphql_schema, document, get_operation_ast(document), variables)
+
+
+class QueryCostTest(SimpleTestCase):
+    """Tests para multiplicadores, profundidad y rechazo en la vista."""
+
+    def setUp(self):
+        reset_rate_limiter()
+        self.view = CustomGraphQLView.as_view(schema=schema, middleware=[])
+
+    def _post(self, query):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': query}), content_type='application/json'
+        )
+        return json.loads(self.view(request).content)
+
+    @override_settings(GRAPHQL_COST_DEFAULT_LIST_SIZE=10)
+    def test_multiplicadores(self):
+        """Verificar pageSize (literal, variable, default) y listas sin tamaño."""
+        query = 'query($n: Int) { nodes(pageSize: $n) { totalCount items { name children { name } } } }'
+        # n * (nodes + items + 10 * children)
+        self.assertEqual(_analyze(query, {'n': 100}), cost.QueryCost(100 * 12, 4))
+        self.assertEqual(_analyze(query).cost, 20 * 12)
+        self.assertEqual(_analyze('{ node { name } __typename }'), cost.QueryCost(1, 2))
+
+    def test_tamano_no_positivo_no_abarata(self):
+        """Verificar que pageSize 0 o negativo cuesta lo mismo que pageSize 1."""
+        query = '{ nodes(pageSize: %s) { items { name children { name } } } }'
+        minimum = _analyze(query % 1).cost
+        self.assertGreater(minimum, 0)
+        for size in (0, -3):
+            with self.subTest(size=size):
+                self.assertEqual(_analyze(query % size).cost, minimum)
+        variable = 'query($n: Int) { nodes(pageSize: $n) { items { name children { name } } } }'
+        self.assertEqual(_analyze(variable, {'n': 0}).cost, minimum)
+
+    @override_settings(GRAPHQL_MAX_DEPTH=3)
+    def test_profundidad_maxima(self):
+        """Verificar que una consulta demasiado anidada no se ejecuta."""
+        payload = self._post('{ node { parent { parent { name } } } }')
+        self.assertEqual(payload['errors'][0]['extensions']['code'], cost.TOO_DEEP)
+        self.assertNotIn('data', payload)
+
+    @override_settings(GRAPHQL_COST_BUDGETS={'ANONYMOUS': 100})
+    def test_presupuesto_y_extensions(self):
+        """Verificar el coste en extensions y el rechazo por presupuesto del rol."""
+        payload = self._post('{ node { name } }')
+        self.assertEqual(payload['data'], {'node': {'name': 'raíz'}})
+        self.assertEqual(payload['extensions']['cost']['requestedQueryCost'], 1)
+        self.assertEqual(payload['extensions']['cost']['maximumAvailable'], 100)
+
+        payload = self._post('{ nodes(pageSize: 500) { items { name } } }')
+        self.assertEqual(payload['errors'][0]['extensions']['code'], cost.COST_EXCEEDED)
+        self.assertEqual(payload['extensions']['cost']['requestedQueryCost'], 1000)
+
+    @override_settings(RATE_LIMIT_REQUESTS_PER_MINUTE=5, GRAPHQL_COST_PER_RATE_UNIT=10)
+    def test_coste_consume_cuota(self):
+        """Verificar que una consulta costosa consume varias unidades del rate limiter."""
+        payload = self._post('{ nodes(pageSize: 20) { items { name } } }')
+        self.assertEqual(payload['extensions']['cost']['rateLimitUnits'], 4)
+        payload = self._post('{ nodes(pageSize: 20) { items { name } } }')
+        self.assertEqual(payload['errors'][0]['extensions']['code'], cost.RATE_LIMITED)
+
+
+class LoginBucketTest(SimpleTestCase):
+    """Tests para el bucket de cobro según la operación validada."""
+
+    def setUp(self):
+        reset_rate_limiter()
+        self.addCleanup(reset_rate_limiter)
+        self.view = CustomGraphQLView.as_view(schema=login_schema, middleware=[])
+
+    def _post(self, payload, ip='10.1.2.3'):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps(payload), content_type='application/json', REMOTE_ADDR=ip
+        )
+        return json.loads(self.view(request).content)
+
+    @override_settings(RATE_LIMIT_REQUESTS_PER_MINUTE=5, GRAPHQL_COST_PER_RATE_UNIT=10)
+    def test_operation_name_login_no_exime_del_cobro(self):
+        """Verificar que una query llamada 'Login' se cobra al bucket 'graphql'."""
+        payload = {'query': 'query Login { nodes(pageSize: 20) { items { name } } }', 'operationName': 'Login'}
+        self.assertNotIn('errors', self._post(payload))
+        payload = self._post(payload)
+        self.assertEqual(payload['errors'][0]['extensions']['code'], cost.RATE_LIMITED)
+
+    def test_login_en_fragmento_usa_el_bucket_login(self):
+        """Verificar que jwtLogin dentro de un fragmento consume la tasa 'login' (10/min)."""
+        payload = {'query': 'mutation { ...F } fragment F on Mutation { jwtLogin }'}
+        results = [self._post(payload) for _ in range(11)]
+        self.assertEqual([r.get('data') for r in results[:10]], [{'jwtLogin': 'token'}] * 10)
+        self.assertEqual(results[10]['errors'][0]['extensions']['code'], cost.RATE_LIMITED)
+        self.assertEqual(self._post(payload, ip='10.1.2.4')['data'], {'jwtLogin': 'token'})
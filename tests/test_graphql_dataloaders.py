@@ -0,0 +1,82 @@
+"""
+Tests de los DataLoaders por request de GraphQL.
+"""
+
+import graphene
+from django.test import RequestFactory, SimpleTestCase
+from graphql import execute, parse
+
+from src.adapters.primary.graphql_api.dataloaders import (
+    BatchingExecutionContext,
+    DataLoader,
+    get_loaders,
+)
+from src.adapters.secondary.database.models import Role, User
+
+
+class DataLoaderTest(SimpleTestCase):
+    """Tests para el batching por hermanos y el memo."""
+
+    def setUp(self):
+        self.request = RequestFactory().post('/graphql/')
+        self.loaders = get_loaders(self.request)
+        self.calls = []
+
+        def batch(keys):
+            self.calls.append(sorted(keys))
+            return {key: f'rol-{key}' for key in keys if key != 99}
+
+        self.loader = DataLoader(self.loaders, batch, key_of=lambda user: user.rol_id_id)
+
+    def test_hermanos_se_resuelven_en_un_batch(self):
+        """Verificar que el primer load resuelve las claves de todos los hermanos."""
+        users = [User(id=i, rol_id_id=i % 3 + 1) for i in range(6)]
+        self.loaders.register_siblings(users)
+
+        values = [self.loader.load(user.rol_id_id, parent=user) for user in users]
+
+        self.assertEqual(self.calls, [[1, 2, 3]])
+        self.assertEqual(values[0], 'rol-1')
+        self.assertIs(get_loaders(self.request), self.loaders)
+
+    def test_claves_sin_resultado_se_memorizan(self):
+        """Verificar que una clave inexistente no repite la query."""
+        self.assertIsNone(self.loader.load(99))
+        self.assertIsNone(self.loader.load(99))
+        self.assertIsNone(self.loader.load(None))
+        self.assertEqual(self.calls, [[99]])
+
+    def test_execution_context_registra_listas(self):
+        """Verificar que una lista GraphQL se resuelve con un único batch."""
+        loader = self.loader
+
+        class UserNode(graphene.ObjectType):
+            role = graphene.String()
+
+            def resolve_role(self, info):
+                return loader.load(self.rol_id_id, parent=self)
+
+        class Query(graphene.ObjectType):
+            users = graphene.List(UserNode)
+
+            def resolve_users(self, info):
+                return [User(id=i, rol_id_id=i) for i in range(1, 5)]
+
+        schema = graphene.Schema(query=Query)
+        result = execute(
+            schema.graphql_schema,
+            parse('{ users { role } }'),
+            context_value=self.request,
+            execution_context_class=BatchingExecutionContext,
+        )
+
+        self.assertIsNone(result.errors)
+        self.assertEqual([row['role'] for row in result.data['users']], ['rol-1', 'rol-2', 'rol-3', 'rol-4'])
+        self.assertEqual(self.calls, [[1, 2, 3, 4]])
+
+    def test_roles_cargados_forman_grupo(self):
+        """Verificar que los objetos de un batch quedan registrados como hermanos."""
+        roles = {1: Role(id=1, nombre='PRACTICANTE'), 2: Role(id=2, nombre='SUPERVISOR')}
+        loader = DataLoader(self.loaders, lambda keys: {key: roles[key] for key in keys})
+        loader.load_many([1, 2])
+        self.assertEqual(self.loaders.siblings_of(roles[1]), (roles[1], roles[2]))
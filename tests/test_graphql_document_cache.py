@@ -0,0 +1,74 @@
+"""
+Tests de la caché de documentos GraphQL validados.
+"""
+
+import json
+
+import graphene
+from django.test import RequestFactory, SimpleTestCase
+
+from src.adapters.primary.graphql_api.document_cache import (
+    DocumentCache,
+    document_key,
+    get_document_cache,
+)
+from src.adapters.primary.graphql_api.urls import CustomGraphQLView
+
+
+class Query(graphene.ObjectType):
+    hello = graphene.String()
+
+    def resolve_hello(root, info):
+        return 'hola'
+
+
+class DocumentCacheTest(SimpleTestCase):
+    """Tests para hits/misses y claves por versión de schema."""
+
+    def setUp(self):
+        self.schema = graphene.Schema(query=Query)
+        # Sin DjangoDebugMiddleware (envuelve el cursor de la BD en DEBUG)
+        self.view = CustomGraphQLView.as_view(schema=self.schema, middleware=[])
+        self.cache = get_document_cache()
+        self.cache.clear()
+
+    def _post(self, query):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': query}), content_type='application/json'
+        )
+        return json.loads(self.view(request).content)
+
+    def test_segunda_request_es_hit(self):
+        """Verificar que la misma query se parsea y valida una sola vez."""
+        self.assertEqual(self._post('{ hello }')['data'], {'hello': 'hola'})
+        self.assertEqual(self._post('{ hello }')['data'], {'hello': 'hola'})
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+
+    def test_documentos_invalidos_no_se_guardan(self):
+        """Verificar que una query inválida devuelve errores y no entra en la caché."""
+        for _ in range(2):
+            self.assertIn('errors', self._post('{ noExiste }'))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_clave_depende_del_schema(self):
+        """Verificar que un schema con otro SDL no reutiliza entradas."""
+        class OtherQuery(graphene.ObjectType):
+            hello = graphene.Int()
+
+        other = graphene.Schema(query=OtherQuery)
+        self.assertNotEqual(
+            document_key(self.schema.graphql_schema, '{ hello }'),
+            document_key(other.graphql_schema, '{ hello }'),
+        )
+
+    def test_lru_acotada(self):
+        """Verificar que se descarta la entrada menos usada."""
+        cache = DocumentCache(max_size=2)
+        for key in ('a', 'b'):
+            cache.put(key, object())
+        cache.get('a')
+        cache.put('c', object())
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
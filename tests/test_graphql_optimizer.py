@@ -0,0 +1,69 @@
+"""
+Tests del optimizador de querysets por selection set.
+"""
+
+import graphene
+from django.test import SimpleTestCase
+
+from src.adapters.primary.graphql_api.optimizer import optimize
+from src.adapters.primary.graphql_api.types import PracticeType
+from src.adapters.secondary.database.models import Practice
+
+
+class PracticePage(graphene.ObjectType):
+    items = graphene.List(PracticeType)
+
+
+class OptimizerTest(SimpleTestCase):
+    """Tests para select_related / only derivados de la consulta."""
+
+    def setUp(self):
+        captured = self.captured = []
+
+        class Query(graphene.ObjectType):
+            practices = graphene.List(PracticeType)
+            practice_page = graphene.Field(PracticePage)
+
+            def resolve_practices(root, info):
+                captured.append(optimize(Practice.objects.all(), info))
+                return []
+
+            def resolve_practice_page(root, info):
+                captured.append(optimize(Practice.objects.all(), info))
+                return PracticePage(items=[])
+
+        self.schema = graphene.Schema(query=Query)
+
+    def _optimized(self, query):
+        result = self.schema.execute(query)
+        self.assertIsNone(result.errors)
+        return self.captured[-1]
+
+    def test_relaciones_y_columnas_seleccionadas(self):
+        """Verificar que los alias legacy se traducen a joins y columnas reales."""
+        queryset = self._optimized(
+            '{ practices { titulo status student { codigoEstudiante user { email } } '
+            'company { nombreComercial } } }'
+        )
+        self.assertEqual(
+            queryset.query.select_related,
+            {'practicante': {'usuario': {}}, 'empresa': {}},
+        )
+        only, defer = queryset.query.deferred_loading
+        self.assertFalse(defer)
+        self.assertTrue({
+            'titulo', 'estado', 'practicante__codigo',
+            'practicante__usuario__correo', 'empresa__nombre',
+        } <= set(only))
+        self.assertNotIn('descripcion', only)
+
+    def test_campo_desconocido_desactiva_only(self):
+        """Verificar que un campo sin mapeo no provoca columnas diferidas."""
+        queryset = self._optimized('{ practices { titulo student { user { photoUrl } } } }')
+        self.assertEqual(queryset.query.select_related, {'practicante': {'usuario': {}}})
+        self.assertEqual(queryset.query.deferred_loading, (frozenset(), True))
+
+    def test_envoltorio_paginado(self):
+        """Verificar que el tipo se encuentra dentro de ``items``."""
+        queryset = self._optimized('{ practicePage { items { id company { ruc } } } }')
+        self.assertEqual(queryset.query.select_related, {'empresa': {}})
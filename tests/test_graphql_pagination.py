@@ -0,0 +1,93 @@
+"""
+Tests de la paginación keyset/offset de las listas GraphQL.
+"""
+
+import datetime
+
+import graphene
+from django.test import SimpleTestCase
+from graphql import GraphQLError
+
+from src.adapters.primary.graphql_api import pagination
+from src.adapters.primary.graphql_api.queries import (
+    PRACTICE_ORDER_FIELDS, USER_ORDER_FIELDS, PracticeListType,
+)
+from src.adapters.secondary.database.models import Practice, User
+
+
+class CountingQuerySet:
+    """Sustituto mínimo de QuerySet que cuenta los COUNT ejecutados."""
+
+    def __init__(self, total):
+        self.total = total
+        self.counts = 0
+
+    def count(self):
+        self.counts += 1
+        return self.total
+
+
+class PaginationTest(SimpleTestCase):
+    """Tests para cursores, filtro (clave, id) y totalCount perezoso."""
+
+    def test_cursor_opaco_y_ligado_al_orden(self):
+        """Verificar ida y vuelta del cursor y rechazo con otro ordenamiento."""
+        when = datetime.datetime(2024, 3, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+        cursor = pagination.encode_cursor('-fecha_creacion', when, 42)
+        self.assertNotIn('fecha_creacion', cursor)
+        value, pk = pagination.decode_cursor(cursor, '-fecha_creacion')
+        self.assertEqual((Practice._meta.get_field('fecha_creacion').to_python(value), pk), (when, 42))
+        with self.assertRaises(GraphQLError):
+            pagination.decode_cursor(cursor, 'titulo')
+        with self.assertRaises(GraphQLError):
+            pagination.decode_cursor('no-es-un-cursor', 'titulo')
+
+    def test_orden_estable_y_filtro_keyset(self):
+        """Verificar el desempate por id y la condición posterior al cursor."""
+        field, descending = pagination.resolve_order(Practice, '-created_at', PRACTICE_ORDER_FIELDS, '-id')
+        self.assertEqual((field.name, descending), ('fecha_creacion', True))
+
+        queryset = pagination._ordered(Practice.objects.all(), field, descending)
+        self.assertEqual(queryset.query.order_by[-1], '-id')
+
+        filtered = pagination._after(queryset, field, descending, '2024-03-01T10:00:00+00:00', 7)
+        where = str(filtered.query.where)
+        self.assertIn('fecha_creacion', where)
+        self.assertIn('LessThan', where)
+
+        with self.assertRaises(GraphQLError):
+            pagination.resolve_order(Practice, 'no_existe', {}, '-id')
+
+    def test_order_by_fuera_de_la_allowlist(self):
+        """Verificar que un campo concreto no listado (p. ej. el hash) no ordena ni viaja en el cursor."""
+        for order_by in ('hash_contraseña', '-hash_contraseña', 'dni', '-pk'):
+            with self.subTest(order_by=order_by), self.assertRaises(GraphQLError):
+                pagination.resolve_order(User, order_by, USER_ORDER_FIELDS, '-id')
+        field, descending = pagination.resolve_order(User, '-email', USER_ORDER_FIELDS, '-id')
+        self.assertEqual((field.name, descending), ('correo', True))
+
+    def test_modo_offset_sin_cursores(self):
+        """Verificar que la paginación offset no construye startCursor/endCursor."""
+        item = Practice(id=3)
+        page = pagination.QuerySetPage(CountingQuerySet(total=1), [item], False, False, page=1, page_size=20)
+        self.assertIsNone(page.start_cursor)
+        self.assertIsNone(page.end_cursor)
+
+    def test_total_count_solo_si_se_selecciona(self):
+        """Verificar que el COUNT se ejecuta solo al pedir totalCount."""
+        queryset = CountingQuerySet(total=45)
+
+        class Query(graphene.ObjectType):
+            practices = graphene.Field(PracticeListType)
+
+            def resolve_practices(root, info):
+                return pagination.QuerySetPage(queryset, [], True, False, page=1, page_size=20)
+
+        schema = graphene.Schema(query=Query)
+        result = schema.execute('{ practices { pageInfo { hasNextPage } pagination { hasNext } } }')
+        self.assertIsNone(result.errors)
+        self.assertEqual(queryset.counts, 0)
+
+        result = schema.execute('{ practices { totalCount pagination { totalPages } } }')
+        self.assertEqual(result.data['practices'], {'totalCount': 45, 'pagination': {'totalPages': 3}})
+        self.assertEqual(queryset.counts, 1)
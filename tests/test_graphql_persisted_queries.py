@@ -0,0 +1,109 @@
+"""
+Tests de Automatic Persisted Queries en el endpoint GraphQL.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import graphene
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from src.adapters.primary.graphql_api import persisted_queries
+from src.adapters.primary.graphql_api.envelope import get_graphql_envelope
+from src.adapters.primary.graphql_api.urls import CustomGraphQLView
+
+
+class Query(graphene.ObjectType):
+    hello = graphene.String()
+
+    def resolve_hello(root, info):
+        return 'hola'
+
+
+QUERY = '{ hello }'
+SHA = hashlib.sha256(QUERY.encode()).hexdigest()
+
+
+def _extensions(sha=SHA):
+    return {'persistedQuery': {'version': 1, 'sha256Hash': sha}}
+
+
+class PersistedQueriesTest(SimpleTestCase):
+    """Tests para registro, GET cacheable y modo allowlist."""
+
+    def setUp(self):
+        self.view = CustomGraphQLView.as_view(schema=graphene.Schema(query=Query), middleware=[])
+        cache.delete(f'apq:{SHA}')
+        persisted_queries._local.clear()
+        persisted_queries.reset_allowlist()
+        self.addCleanup(persisted_queries.reset_allowlist)
+
+    def _post(self, body):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps(body), content_type='application/json'
+        )
+        return json.loads(self.view(request).content)
+
+    def _error_code(self, payload):
+        return payload['errors'][0]['extensions']['code']
+
+    def test_hash_desconocido_y_registro(self):
+        """Verificar el ciclo NotFound -> hash + query -> solo hash."""
+        payload = self._post({'extensions': _extensions()})
+        self.assertEqual(self._error_code(payload), persisted_queries.NOT_FOUND)
+
+        payload = self._post({'query': QUERY, 'extensions': _extensions()})
+        self.assertEqual(payload['data'], {'hello': 'hola'})
+        self.assertEqual(self._post({'extensions': _extensions()})['data'], {'hello': 'hola'})
+
+    def test_hash_que_no_coincide(self):
+        """Verificar que no se registra una query con un hash ajeno."""
+        payload = self._post({'query': '{ __typename }', 'extensions': _extensions()})
+        self.assertEqual(self._error_code(payload), persisted_queries.HASH_MISMATCH)
+        self.assertIsNone(persisted_queries.lookup(SHA))
+
+    @override_settings(GRAPHQL_APQ_GET_MAX_AGE=60)
+    def test_get_cacheable_y_envelope(self):
+        """Verificar Cache-Control en GET y que el envelope ve el texto registrado."""
+        persisted_queries.register(QUERY)
+        request = RequestFactory().get(
+            '/graphql/', {'extensions': json.dumps(_extensions())}, HTTP_ACCEPT='application/json'
+        )
+        self.assertEqual(get_graphql_envelope(request).query, QUERY)
+        response = self.view(request)
+        self.assertEqual(json.loads(response.content)['data'], {'hello': 'hola'})
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def _manifest(self, entries):
+        manifest = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        with manifest:
+            json.dump(entries, manifest)
+        self.addCleanup(os.unlink, manifest.name)
+        return manifest.name
+
+    def test_modo_allowlist(self):
+        """Verificar que solo se ejecutan documentos del manifiesto, aunque la caché se vacíe."""
+        path = self._manifest({SHA: QUERY})
+        with override_settings(GRAPHQL_APQ_ALLOWLIST_ONLY=True, GRAPHQL_APQ_MANIFEST=path):
+            payload = self._post({'query': '{ __typename }'})
+            self.assertEqual(self._error_code(payload), persisted_queries.NOT_ALLOWED)
+
+            cache.clear()
+            self.assertEqual(self._post({'query': QUERY})['data'], {'hello': 'hola'})
+            self.assertEqual(self._post({'extensions': _extensions()})['data'], {'hello': 'hola'})
+
+    @override_settings(GRAPHQL_APQ_ALLOWLIST_ONLY=True)
+    def test_allowlist_no_sale_de_la_cache(self):
+        """Verificar que lo cargado solo en la caché no habilita documentos en modo allowlist."""
+        persisted_queries.register_many([(SHA, QUERY)])
+        with self.assertLogs(persisted_queries.logger, 'ERROR'):
+            payload = self._post({'query': QUERY})
+        self.assertEqual(self._error_code(payload), persisted_queries.NOT_ALLOWED)
+        with self.assertRaises(CommandError):
+            call_command('persisted_queries', self._manifest({SHA: QUERY}))
@@ -0,0 +1,69 @@
+"""
+Tests del número de consultas de las estadísticas del dashboard.
+"""
+
+from contextlib import contextmanager
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models.sql.compiler import SQLCompiler
+from django.db.models.sql.constants import SINGLE
+from django.test import SimpleTestCase, override_settings
+
+from src.adapters.primary.graphql_api import statistics
+
+
+@contextmanager
+def captured_sql():
+    """
+    Compila cada consulta en lugar de ejecutarla (no hay BD en los tests):
+    devuelve la lista de SQL generados y resultados vacíos.
+    """
+    queries = []
+
+    def execute_sql(compiler, result_type=None, *args, **kwargs):
+        sql, params = compiler.as_sql()
+        queries.append(sql)
+        return None if result_type == SINGLE else iter([])
+
+    with mock.patch.object(SQLCompiler, 'execute_sql', execute_sql):
+        yield queries
+
+
+class DashboardStatisticsTest(SimpleTestCase):
+    """Tests para el número fijo de consultas y el snapshot cacheado."""
+
+    def setUp(self):
+        cache.delete(statistics.CACHE_KEY.format(name='dashboard'))
+
+    def test_bloques_con_consultas_fijas(self):
+        """Verificar semestres y sectores como agregaciones, no bucles de COUNT."""
+        with captured_sql() as queries:
+            students = statistics.student_statistics()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(students['by_semester']), 12)
+        self.assertIn('EXISTS', queries[0])
+
+        with captured_sql() as queries:
+            statistics.company_statistics()
+        self.assertEqual(len(queries), 2)
+        self.assertIn('GROUP BY', queries[1])
+
+    def test_dashboard_un_snapshot(self):
+        """Verificar 7 consultas en frío y ninguna con el snapshot en caché."""
+        with captured_sql() as queries:
+            snapshot = statistics.dashboard_statistics()
+        self.assertEqual(len(queries), 7)
+        self.assertEqual(snapshot['practices']['total'], 0)
+
+        with captured_sql() as queries:
+            self.assertEqual(statistics.dashboard_statistics(), snapshot)
+        self.assertEqual(queries, [])
+
+    @override_settings(GRAPHQL_STATISTICS_CACHE_TTL=0)
+    def test_sin_cache(self):
+        """Verificar que con TTL 0 siempre se recalcula."""
+        for _ in range(2):
+            with captured_sql() as queries:
+                statistics.dashboard_statistics()
+            self.assertEqual(len(queries), 7)
@@ -0,0 +1,74 @@
+"""
+Tests de las trazas por campo de GraphQL.
+"""
+
+import json
+from types import SimpleNamespace
+
+import graphene
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from src.adapters.primary.graphql_api import tracing
+from src.adapters.primary.graphql_api.urls import CustomGraphQLView
+
+
+class Item(graphene.ObjectType):
+    name = graphene.String()
+
+
+class Query(graphene.ObjectType):
+    items = graphene.List(Item)
+
+    def resolve_items(root, info):
+        return [{'name': 'a'}, {'name': 'b'}]
+
+
+class TracingTest(SimpleTestCase):
+    """Tests para la traza por campo, su visibilidad y el costo cero apagado."""
+
+    def setUp(self):
+        self.view = CustomGraphQLView.as_view(schema=graphene.Schema(query=Query), middleware=[])
+        tracing.registry.reset()
+
+    def _post(self, is_staff):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': '{ items { name } }'}),
+            content_type='application/json',
+        )
+        request.user = SimpleNamespace(is_authenticated=True, is_staff=is_staff, is_superuser=False)
+        return json.loads(self.view(request).content)
+
+    @override_settings(GRAPHQL_TRACING_ENABLED=True)
+    def test_traza_para_staff_y_registro(self):
+        """Verificar extensions.tracing para staff y el acumulado del proceso."""
+        payload = self._post(is_staff=True)
+        fields = {row['field']: row for row in payload['extensions']['tracing']['fields']}
+        self.assertEqual(fields['Query.items']['calls'], 1)
+        self.assertEqual(fields['Item.name']['calls'], 2)
+
+        self.assertNotIn('tracing', self._post(is_staff=False)['extensions'])
+        report = {row['field']: row for row in tracing.report(tracing.registry.snapshot())}
+        self.assertEqual(report['Item.name']['calls'], 4)
+
+    def test_consultas_y_duplicados_por_campo(self):
+        """Verificar la atribución de SQL al campo activo o al último resuelto."""
+        trace = tracing.RequestTrace()
+        execute = lambda sql, params, many, context: None  # noqa: E731
+        trace.enter('Query.practices')
+        trace.leave('Query.practices', 10.0)
+        # Iteración del QuerySet devuelto: fuera del resolver
+        trace.sql_wrapper(execute, 'SELECT 1 WHERE id = %s', (1,), False, {})
+        trace.enter('PracticeType.student')
+        trace.sql_wrapper(execute, 'SELECT 1 WHERE id = %s', (1,), False, {})
+        trace.leave('PracticeType.student', 5.0)
+
+        self.assertEqual((trace.queries, trace.duplicates), (2, 1))
+        self.assertEqual(trace.fields['Query.practices'].queries, 1)
+        self.assertEqual(trace.fields['PracticeType.student'].duplicates, 1)
+
+    def test_desactivado_sin_middleware(self):
+        """Verificar que apagado no se añade el middleware ni la traza."""
+        view = CustomGraphQLView(schema=graphene.Schema(query=Query), middleware=[])
+        self.assertEqual(view.get_middleware(None), [])
+        payload = self._post(is_staff=True)
+        self.assertNotIn('tracing', payload['extensions'])
@@ -0,0 +1,128 @@
+"""
+Tests del filtro en memoria de JTIs en blacklist.
+"""
+
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from src.infrastructure.security import jti_blacklist as module
+from src.infrastructure.security.jti_blacklist import JTIBlacklistFilter
+
+
+class JTIBlacklistFilterTest(SimpleTestCase):
+    """Tests para la sincronización entre procesos y la caché no compartida."""
+
+    def setUp(self):
+        cache.clear()
+        self.db = {}
+        self.exp = time.time() + 3600
+
+    def _process(self):
+        """Filtro de otro worker: carga la blacklist de ``self.db``."""
+        blacklist = JTIBlacklistFilter()
+
+        def load():
+            blacklist._entries = dict(self.db)
+
+        blacklist._load_from_db = mock.Mock(side_effect=load)
+        return blacklist
+
+    def _revoke(self, writer, jti):
+        self.db[jti] = self.exp
+        writer.add(jti, self.exp)
+
+    def _sync(self, *processes):
+        for process in processes:
+            process._next_sync = 0.0
+            process._sync()
+
+    @mock.patch.object(module, 'cache_is_shared', return_value=True)
+    def test_eventos_entre_procesos(self, _):
+        """Verificar que una revocación en un proceso llega a los demás."""
+        writer, reader = self._process(), self._process()
+        self._sync(writer, reader)
+        self._revoke(writer, 'jti-1')
+        self._sync(reader)
+        self.assertTrue(reader.might_contain('jti-1'))
+        self.assertFalse(reader.might_contain('jti-2'))
+        self.assertEqual(reader._load_from_db.call_count, 1)
+
+    @mock.patch.object(module, 'cache_is_shared', return_value=True)
+    def test_perdida_de_la_cache_recarga_desde_bd(self, _):
+        """Verificar la recarga si la secuencia retrocede o desaparece."""
+        writer, reader = self._process(), self._process()
+        self._sync(writer, reader)
+        for n in range(3):
+            self._revoke(writer, f'jti-{n}')
+        self._sync(reader)
+
+        # Reinicio de Redis: contadores y eventos perdidos
+        cache.clear()
+        self._revoke(writer, 'tras-reinicio')
+        self._sync(reader)
+        self.assertTrue(reader.might_contain('tras-reinicio'))
+        self.assertEqual(reader._load_from_db.call_count, 2)
+
+        # Secuencia menor que la vista (evicción de la clave de secuencia)
+        cache.set(module.SEQ_KEY, 0, timeout=None)
+        self._sync(reader)
+        self.assertEqual(reader._load_from_db.call_count, 3)
+
+        cache.delete(module.GENERATION_KEY)
+        self._sync(reader)
+        self.assertEqual(reader._load_from_db.call_count, 4)
+
+    @mock.patch.object(module, 'cache_is_shared', return_value=True)
+    def test_secuencia_recreada_que_supera_la_vista(self, _):
+        """Verificar que recrear la secuencia sube la generación."""
+        writer, reader = self._process(), self._process()
+        self._sync(writer, reader)
+        self._revoke(writer, 'antes')
+        self._sync(reader)
+
+        cache.delete(module.SEQ_KEY)
+        for n in range(3):
+            self._revoke(writer, f'nuevo-{n}')
+        self._sync(reader)
+        self.assertTrue(all(reader.might_contain(f'nuevo-{n}') for n in range(3)))
+
+    @mock.patch.object(module, 'cache_is_shared', return_value=True)
+    def test_evento_faltante_recarga_desde_bd(self, _):
+        """Verificar que un evento ausente (evictado o aún no escrito) no se salta."""
+        writer, reader = self._process(), self._process()
+        self._sync(writer, reader)
+        self._revoke(writer, 'jti-1')
+        self._revoke(writer, 'jti-2')
+        cache.delete(module.EVENT_KEY.format(seq=cache.get(module.SEQ_KEY) - 1))
+        self._sync(reader)
+        self.assertTrue(reader.might_contain('jti-1'))
+        self.assertTrue(reader.might_contain('jti-2'))
+        self.assertEqual(reader._load_from_db.call_count, 2)
+
+    @mock.patch.object(module, 'cache_is_shared', return_value=True)
+    def test_fallo_al_publicar_sube_la_generacion(self, _):
+        """Verificar que si no se escribe el evento los demás procesos recargan."""
+        writer, reader = self._process(), self._process()
+        self._sync(writer, reader)
+        self.db['jti-1'] = self.exp
+        with mock.patch.object(module.cache, 'set', side_effect=ConnectionError('caída')):
+            writer.add('jti-1', self.exp)
+        self._sync(reader)
+        self.assertTrue(reader.might_contain('jti-1'))
+        self.assertEqual(reader._load_from_db.call_count, 2)
+
+    def test_cache_local_siempre_confirma_en_bd(self):
+        """Verificar que con LocMem no se descarta ningún JTI sin la BD."""
+        self.assertFalse(module.cache_is_shared())
+        blacklist = self._process()
+        self.assertTrue(blacklist.might_contain('desconocido'))
+        blacklist._load_from_db.assert_not_called()
+
+        with mock.patch.object(BlacklistedToken.objects, 'filter') as query:
+            query.return_value.exists.return_value = True
+            self.assertTrue(blacklist.is_blacklisted('revocado-en-otro-proceso'))
+        query.assert_called_once_with(token__jti='revocado-en-otro-proceso')
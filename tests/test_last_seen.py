@@ -0,0 +1,57 @@
+"""
+Tests del buffer write-behind de ultimo_acceso.
+"""
+
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from src.adapters.secondary.database.models import User
+from src.infrastructure.security import last_seen
+from src.infrastructure.security.last_seen import LastSeenBuffer
+
+
+class LastSeenBufferTest(SimpleTestCase):
+    """Tests para la ventana por usuario, el flush en lote y la conexión del hilo."""
+
+    def setUp(self):
+        cache.clear()
+        self.buffer = LastSeenBuffer()
+        patcher = mock.patch.object(LastSeenBuffer, '_ensure_worker')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.when = datetime.datetime(2024, 3, 1, 10, 0, tzinfo=datetime.timezone.utc)
+
+    def test_una_escritura_por_ventana(self):
+        """Verificar que la ventana coalesce accesos salvo con force."""
+        self.assertTrue(self.buffer.touch(1, self.when))
+        self.assertFalse(self.buffer.touch(1, self.when))
+        self.assertTrue(self.buffer.touch(1, self.when, force=True))
+        self.assertTrue(self.buffer.touch(2, self.when))
+        self.assertEqual(len(self.buffer._pending), 2)
+
+    def test_flush_en_lote_y_reencolado(self):
+        """Verificar un bulk_update por flush y el reencolado si falla."""
+        self.buffer.touch(1, self.when)
+        self.buffer.touch(2, self.when)
+        with mock.patch.object(User.objects, 'bulk_update', side_effect=RuntimeError('sin BD')):
+            with self.assertLogs(last_seen.logger, 'WARNING'):
+                self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(set(self.buffer._pending), {1, 2})
+
+        with mock.patch.object(User.objects, 'bulk_update') as bulk_update:
+            self.assertEqual(self.buffer.flush(), 2)
+            self.assertEqual(self.buffer.flush(), 0)
+        users, fields = bulk_update.call_args[0]
+        self.assertEqual(sorted(user.pk for user in users), [1, 2])
+        self.assertEqual(fields, ['ultimo_acceso'])
+
+    def test_el_hilo_cierra_su_conexion(self):
+        """Verificar que el flush del hilo cierra la conexión aunque falle."""
+        with mock.patch.object(last_seen, 'connections') as connections, \
+                mock.patch.object(LastSeenBuffer, 'flush', side_effect=RuntimeError('caída')):
+            with self.assertLogs(last_seen.logger, 'ERROR'):
+                self.buffer._flush_in_worker()
+        connections.close_all.assert_called_once_with()
@@ -0,0 +1,49 @@
+"""
+Tests del camino rápido de login (consulta única y escritura en transacción).
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from src.infrastructure.security import jwt_auth
+from src.infrastructure.security.auth_backends import get_login_queryset, get_user_for_login
+from src.infrastructure.security.jwt_auth import JWTAuthenticationService
+
+
+class LoginPathTest(SimpleTestCase):
+    """Tests para la consulta de login y la emisión de tokens."""
+
+    def test_una_consulta_por_lower_correo(self):
+        """Verificar LOWER(correo) con rol y perfiles en la misma consulta."""
+        sql = str(get_login_queryset().filter(correo_lower='ana@upeu.edu.pe').query)
+        self.assertIn('LOWER("upeu_usuario"."correo") = ana@upeu.edu.pe', sql)
+        self.assertIn('"upeu_rol"', sql)
+        self.assertIn('"upeu_perfil_practicante"', sql)
+        self.assertIn('"upeu_perfil_supervisor"', sql)
+
+        with mock.patch('src.infrastructure.security.auth_backends.get_login_queryset') as queryset:
+            get_user_for_login('Ana@UPeU.edu.pe')
+        queryset.return_value.get.assert_called_once_with(correo_lower='ana@upeu.edu.pe')
+
+    def test_token_y_ultimo_acceso_en_una_transaccion(self):
+        """Verificar el INSERT del token y el UPDATE de ultimo_acceso dentro de atomic()."""
+        events = []
+        atomic = mock.MagicMock()
+        atomic.return_value.__enter__.side_effect = lambda: events.append('begin')
+        atomic.return_value.__exit__.side_effect = lambda *exc: events.append('commit')
+        user = mock.Mock(pk=7)
+
+        def factory(token_user):
+            events.append('token')
+            return 'refresh'
+
+        with mock.patch.object(jwt_auth.transaction, 'atomic', atomic), \
+                mock.patch.object(jwt_auth.User.objects, 'filter') as query:
+            query.return_value.update.side_effect = lambda **kwargs: events.append('update')
+            refresh = JWTAuthenticationService.issue_login_tokens(user, factory)
+
+        self.assertEqual(refresh, 'refresh')
+        self.assertEqual(events, ['begin', 'token', 'update', 'commit'])
+        query.assert_called_once_with(pk=7)
+        self.assertIsNotNone(user.ultimo_acceso)
@@ -0,0 +1,33 @@
+"""
+Tests del blacklist por lotes de manage_jwt_tokens.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from src.infrastructure.security.management.commands import manage_jwt_tokens
+
+
+class BlacklistInBatchesTest(SimpleTestCase):
+    """Tests para la invalidación del filtro de JTIs por lote."""
+
+    def test_invalida_tras_cada_lote(self):
+        """Verificar que una ejecución interrumpida ya invalidó lo insertado."""
+        command = manage_jwt_tokens.Command(stdout=StringIO())
+
+        def batches(queryset):
+            yield [1, 2]
+            yield [3]
+            raise KeyboardInterrupt
+
+        with mock.patch.object(command, '_iter_id_batches', side_effect=batches), \
+                mock.patch.object(BlacklistedToken.objects, 'bulk_create') as bulk_create, \
+                mock.patch.object(manage_jwt_tokens, 'jti_blacklist') as jti_blacklist:
+            with self.assertRaises(KeyboardInterrupt):
+                command._blacklist_in_batches(None, 10)
+
+        self.assertEqual(bulk_create.call_count, 2)
+        self.assertEqual(jti_blacklist.invalidate_all.call_count, 2)
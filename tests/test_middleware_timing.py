@@ -0,0 +1,83 @@
+"""
+Tests de la instrumentación de latencia por middleware.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.test import RequestFactory, SimpleTestCase
+
+from src.infrastructure.middleware import snapshots, timing
+
+
+class LatencyHistogramTest(SimpleTestCase):
+    """Tests para los percentiles del histograma."""
+
+    def test_percentiles_aproximados(self):
+        """Verificar p50/p99 dentro de la resolución de los buckets (~20%)."""
+        histogram = timing.LatencyHistogram()
+        for micros in range(1, 1001):
+            histogram.record(micros)
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=100)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=10)
+        self.assertLessEqual(histogram.percentile(99), histogram.max)
+
+
+class TimedMiddlewareTest(SimpleTestCase):
+    """Tests para el envoltorio de capa."""
+
+    def setUp(self):
+        timing.registry.reset()
+        self.addCleanup(timing.registry.reset)
+
+    def test_registra_ambas_fases_y_reenvia_hooks(self):
+        """Verificar que la capa envuelta se mide y conserva sus hooks."""
+        [path] = timing.instrument(['django.middleware.csrf.CsrfViewMiddleware'])
+        layer_class = getattr(timing, path.rsplit('.', 1)[1])
+        self.assertTrue(issubclass(layer_class, CsrfViewMiddleware))
+
+        layer = layer_class(lambda request: HttpResponse('ok'))
+        self.assertTrue(hasattr(layer, 'process_view'))
+        layer(RequestFactory().get('/'))
+
+        rows = timing.summarize(timing.registry.snapshot())
+        self.assertEqual(
+            {(row['layer'], row['phase']) for row in rows},
+            {('django.middleware.csrf.CsrfViewMiddleware', 'request'),
+             ('django.middleware.csrf.CsrfViewMiddleware', 'response')},
+        )
+
+
+class SnapshotPublisherTest(SimpleTestCase):
+    """Tests para las ranuras por proceso en la caché compartida."""
+
+    def setUp(self):
+        self.publisher = snapshots.SnapshotPublisher('test_snap', 'MIDDLEWARE_TIMING_PUBLISH_INTERVAL', slots=4)
+        self.other = snapshots.SnapshotPublisher('test_snap', 'MIDDLEWARE_TIMING_PUBLISH_INTERVAL', slots=4)
+        self.addCleanup(self.publisher.clear)
+
+    def _publish(self, publisher, pid, data):
+        with mock.patch('os.getpid', return_value=pid):
+            publisher.publish(data)
+
+    def test_un_proceso_por_ranura_sin_lista_de_pids(self):
+        """Verificar que cada proceso publica en su ranura y no pisa la de otro."""
+        self._publish(self.publisher, 101, 'a')
+        self._publish(self.other, 202, 'b')
+        self._publish(self.publisher, 101, 'a2')
+        self.assertNotEqual(self.publisher._slot, self.other._slot)
+        self.assertCountEqual(self.publisher.published(), ['a2', 'b'])
+        self.assertIsNone(cache.get('test_snap:pids'))
+        with mock.patch('os.getpid', return_value=101):
+            self.assertEqual(self.publisher.published(exclude_own=True), ['b'])
+
+    def test_ranura_ajena_se_reclama_de_nuevo(self):
+        """Verificar que si otro proceso ocupó la ranura caducada se reclama otra."""
+        self._publish(self.publisher, 101, 'a')
+        cache.set(self.publisher._key(self.publisher._slot), {'pid': 303, 'data': 'c'})
+        self._publish(self.publisher, 101, 'a2')
+        self.assertCountEqual(self.publisher.published(), ['a2', 'c'])
+        self.publisher.clear()
+        self.assertEqual(self.publisher.published(), [])
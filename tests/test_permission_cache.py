@@ -0,0 +1,68 @@
+"""
+Tests de la caché versionada de permisos efectivos.
+"""
+
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from src.infrastructure.security import permission_cache
+from src.infrastructure.security.cache_versions import bump_version
+
+
+class PermissionCacheTest(SimpleTestCase):
+    """Tests para el memo por instancia y la invalidación por versión."""
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return ['practices.view', 'documents.view']
+
+    def _permissions(self, user_id=1, role_id=3):
+        user = SimpleNamespace(pk=user_id, rol_id_id=role_id)
+        return permission_cache.get_effective_permissions(user, self._compute)
+
+    def test_memo_y_cache_compartida(self):
+        """Verificar un solo cálculo para la misma instancia y para otras."""
+        user = SimpleNamespace(pk=1, rol_id_id=3)
+        first = permission_cache.get_effective_permissions(user, self._compute)
+        self.assertIs(permission_cache.get_effective_permissions(user, self._compute), first)
+        self.assertEqual(self._permissions(), frozenset({'practices.view', 'documents.view'}))
+        self.assertEqual(self.calls, 1)
+
+    def test_invalidacion_por_rol_y_usuario(self):
+        """Verificar que subir la versión del rol o del usuario recalcula."""
+        self._permissions()
+        permission_cache.bump_role_version(3)
+        self._permissions()
+        self.assertEqual(self.calls, 2)
+
+        # Otro rol no se ve afectado
+        permission_cache.bump_role_version(4)
+        self._permissions()
+        self.assertEqual(self.calls, 2)
+
+        permission_cache.bump_user_version(1)
+        self._permissions()
+        self._permissions(user_id=2)
+        self.assertEqual(self.calls, 4)
+
+    @override_settings(PERMISSIONS_CACHE_ENABLED=False)
+    def test_desactivada_siempre_calcula(self):
+        """Verificar que sin caché se calcula en cada instancia."""
+        self._permissions()
+        self._permissions()
+        self.assertEqual(self.calls, 2)
+
+    def test_version_reiniciada(self):
+        """Verificar que el contador se recrea si la clave desaparece."""
+        bump_version('test:ver')
+        bump_version('test:ver')
+        self.assertEqual(cache.get('test:ver'), 3)
+        cache.delete('test:ver')
+        bump_version('test:ver')
+        self.assertEqual(cache.get('test:ver'), 2)
@@ -0,0 +1,68 @@
+"""
+Tests del snapshot de tablas de permisos por rol (permissions_service).
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from src.infrastructure.security import permissions_service
+
+
+class FakeCursor:
+    """Cursor mínimo que registra el SQL ejecutado."""
+
+    def __init__(self, executed, rows):
+        self.executed = executed
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def fetchone(self):
+        return ('upeu_permiso',)
+
+    def fetchall(self):
+        return self.rows
+
+
+class RoleTablesSnapshotTest(SimpleTestCase):
+    """Tests para la sonda única de tablas y el snapshot con TTL."""
+
+    def setUp(self):
+        self.executed = []
+        self.rows = [(2, 'practices.view'), (2, 'documents.view'), (5, 'reports.view')]
+        connection = mock.Mock()
+        connection.cursor.side_effect = lambda: FakeCursor(self.executed, self.rows)
+        patcher = mock.patch.object(permissions_service, 'connection', connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for attr, value in (('_tables_exist', None), ('_snapshot', {}), ('_snapshot_loaded_at', None)):
+            patcher_attr = mock.patch.object(permissions_service, attr, value)
+            patcher_attr.start()
+            self.addCleanup(patcher_attr.stop)
+
+    def test_una_sonda_y_una_carga(self):
+        """Verificar que varias verificaciones usan una sonda y una consulta."""
+        check = permissions_service._role_has_permission_from_tables
+        self.assertTrue(check(2, 'practices.view'))
+        self.assertFalse(check(2, 'reports.view'))
+        self.assertTrue(check(5, 'reports.view'))
+        self.assertFalse(check(None, 'reports.view'))
+        self.assertEqual(len(self.executed), 2)
+        self.assertIn('to_regclass', self.executed[0])
+
+    @override_settings(PERMISSION_TABLES_SNAPSHOT_TTL=0)
+    def test_recarga_al_vencer_el_ttl(self):
+        """Verificar que vencido el TTL se vuelve a leer (sin repetir la sonda)."""
+        permissions_service.get_role_tables_snapshot()
+        self.rows = [(2, 'users.view')]
+        snapshot = permissions_service.get_role_tables_snapshot()
+        self.assertEqual(snapshot[2], frozenset({'users.view'}))
+        self.assertEqual(sum('to_regclass' in sql for sql in self.executed), 1)
@@ -0,0 +1,171 @@
+"""
+Tests del motor de rate limiting (ventana deslizante en memoria).
+"""
+
+import json
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from src.adapters.primary.graphql_api.envelope import get_graphql_envelope
+from src.adapters.primary.rest_api.auth.views import LoginView
+from src.infrastructure.security.rate_limiter import (
+    LocalPrecheckLimiter,
+    LocalSlidingWindowBackend,
+    charge,
+    reset_rate_limiter,
+)
+
+
+class LocalSlidingWindowBackendTest(SimpleTestCase):
+    """Tests para la implementación en memoria."""
+
+    def setUp(self):
+        self.backend = LocalSlidingWindowBackend()
+
+    def test_rechaza_al_superar_el_limite(self):
+        """Verificar que se admite hasta el límite y luego se rechaza."""
+        now = 1000 * 60 + 1
+        results = [self.backend.hit('ip', 5, 60, now=now) for _ in range(6)]
+        self.assertEqual([r.allowed for r in results], [True] * 5 + [False])
+        self.assertGreater(results[-1].retry_after, 0)
+
+    def test_sin_rafaga_en_el_borde_de_ventana(self):
+        """Verificar que el borde de ventana no permite el doble del límite."""
+        end_of_window = 1000 * 60 + 59
+        for _ in range(5):
+            self.assertTrue(self.backend.hit('ip', 5, 60, now=end_of_window).allowed)
+        # Un segundo después (nueva ventana fija) la anterior aún pesa ~98%
+        self.assertFalse(self.backend.hit('ip', 5, 60, now=end_of_window + 1).allowed)
+
+    def test_la_ventana_anterior_deja_de_pesar(self):
+        """Verificar que tras una ventana completa se vuelve a admitir."""
+        start = 1000 * 60
+        for _ in range(5):
+            self.backend.hit('ip', 5, 60, now=start)
+        self.assertTrue(self.backend.hit('ip', 5, 60, now=start + 120).allowed)
+
+    def test_costo_variable(self):
+        """Verificar que cost consume varias unidades."""
+        self.assertTrue(self.backend.hit('ip', 10, 60, cost=8, now=60).allowed)
+        self.assertFalse(self.backend.hit('ip', 10, 60, cost=3, now=60).allowed)
+
+
+class LocalPrecheckLimiterTest(SimpleTestCase):
+    """Tests para el nivel local de pre-verificación."""
+
+    def test_sincroniza_deltas_acumulados(self):
+        """Verificar que las requests locales se envían como un solo delta."""
+        backend = LocalSlidingWindowBackend()
+        limiter = LocalPrecheckLimiter(backend, sync_interval=0)
+        for _ in range(3):
+            limiter.hit('ip', 100, 60, now=60)
+        self.assertEqual(backend.hit('ip', 100, 60, cost=0, now=60).count, 3)
+
+    def test_rechazo_no_pierde_el_delta_local(self):
+        """Verificar que el delta admitido se registra aunque se rechace la request."""
+        backend = LocalSlidingWindowBackend()
+        limiter = LocalPrecheckLimiter(backend, sync_interval=3600)
+        self.assertTrue(limiter.hit('ip', 5, 60, now=60).allowed)
+        for _ in range(3):
+            self.assertTrue(limiter.hit('ip', 5, 60, now=60).allowed)
+        # Otro worker consumió el resto del presupuesto global
+        backend.hit('ip', 5, 60, cost=4, now=60)
+
+        limiter._state['ip'][2] = 0.0
+        self.assertFalse(limiter.hit('ip', 5, 60, now=60).allowed)
+        self.assertEqual(backend.hit('ip', 100, 60, cost=0, now=60).count, 8)
+
+    def test_rechaza_localmente_sin_backend(self):
+        """Verificar que con el presupuesto agotado no se consulta el backend."""
+        backend = LocalSlidingWindowBackend()
+        limiter = LocalPrecheckLimiter(backend, sync_interval=3600)
+        limiter.hit('ip', 2, 60)
+        limiter.hit('ip', 2, 60)
+        self.assertFalse(limiter.hit('ip', 2, 60).allowed)
+
+
+class ChargeOncePerRequestTest(SimpleTestCase):
+    """Tests para el cobro único por request (middleware + throttle)."""
+
+    def setUp(self):
+        reset_rate_limiter()
+        self.addCleanup(reset_rate_limiter)
+
+    def test_misma_clave_se_cobra_una_vez(self):
+        """Verificar que la segunda evaluación de la clave no incrementa."""
+        request = RequestFactory().get('/')
+        first = charge(request, 'login:1.2.3.4', 10, 60)
+        second = charge(request, 'login:1.2.3.4', 10, 60)
+        self.assertEqual(first.count, second.count)
+        other = charge(RequestFactory().get('/'), 'login:1.2.3.4', 10, 60)
+        self.assertEqual(other.count, first.count + 1)
+
+
+class GraphQLLoginDetectionTest(SimpleTestCase):
+    """Tests para la detección de login con el envelope GraphQL."""
+
+    def _post(self, payload):
+        return RequestFactory().post('/graphql/', data=json.dumps(payload),
+                                     content_type='application/json')
+
+    def test_detecta_jwt_login(self):
+        """Verificar que jwtLogin cae en el bucket de login."""
+        request = self._post({'query': 'mutation { jwtLogin(email: "a", password: "b") { success } }'})
+        self.assertTrue(get_graphql_envelope(request).is_login)
+
+    def test_mencion_en_string_no_es_login(self):
+        """Verificar que un argumento que contiene 'jwtLogin' no es un login."""
+        request = self._post({'query': 'query { searchUsers(q: "jwtLogin") { id } }'})
+        envelope = get_graphql_envelope(request)
+        self.assertFalse(envelope.is_login)
+        self.assertIs(get_graphql_envelope(request), envelope)
+
+    def test_relleno_no_oculta_el_login(self):
+        """Verificar que un cuerpo inflado con relleno sigue detectándose como login."""
+        query = '# ' + 'x' * 20000 + '\nmutation { jwtLogin(email: "a", password: "b") { success } }'
+        request = self._post({'query': query, 'padding': 'y' * 20000})
+        self.assertTrue(get_graphql_envelope(request).is_login)
+
+    def test_escape_json_no_oculta_el_login(self):
+        """Verificar que el nombre escapado en el JSON se detecta tras decodificar."""
+        body = '{"query": "mutation { jwt\\u004cogin(email: \\"a\\", password: \\"b\\") { success } }"}'
+        request = RequestFactory().post('/graphql/', data=body, content_type='application/json')
+        self.assertTrue(get_graphql_envelope(request).is_login)
+
+    def test_fragment_spread_es_login(self):
+        """Verificar que un login dentro de un fragmento cuenta como login."""
+        request = self._post({'query': (
+            'mutation { ...F } fragment F on Mutation { jwtLogin(email: "a", password: "b") { success } }'
+        )})
+        envelope = get_graphql_envelope(request)
+        self.assertTrue(envelope.is_login)
+        self.assertIn('jwtLogin', envelope.root_fields)
+
+    def test_fragmento_inline_en_batch_es_login(self):
+        """Verificar que un fragmento inline dentro de un batch cuenta como login."""
+        request = self._post([
+            {'query': 'query { me { id } }'},
+            {'query': 'mutation { ... on Mutation { tokenAuth(email: "a", password: "b") { token } } }'},
+        ])
+        self.assertTrue(get_graphql_envelope(request).is_login)
+
+
+class LoginThrottleTest(SimpleTestCase):
+    """Tests para el bucket 'login' en el login REST."""
+
+    def setUp(self):
+        reset_rate_limiter()
+        self.addCleanup(reset_rate_limiter)
+
+    def test_login_rest_usa_el_bucket_login(self):
+        """Verificar 429 al agotar la tasa 'login' (10/min) por IP."""
+        view = LoginView.as_view()
+        factory = APIRequestFactory()
+        statuses = [
+            view(factory.post('/api/v1/auth/login/', {}, format='json', REMOTE_ADDR='10.9.8.7')).status_code
+            for _ in range(11)
+        ]
+        self.assertEqual(statuses, [400] * 10 + [429])
+        other = view(factory.post('/api/v1/auth/login/', {}, format='json', REMOTE_ADDR='10.9.8.6'))
+        self.assertEqual(other.status_code, 400)
@@ -0,0 +1,95 @@
+"""
+Tests de la paginación keyset de los ViewSets REST.
+"""
+
+import datetime
+from contextlib import contextmanager
+from unittest import mock
+
+from django.db.models.sql.compiler import SQLCompiler
+from django.test import SimpleTestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from src.adapters.primary.rest_api import pagination
+from src.adapters.secondary.database.models import Document, Practice
+
+
+@contextmanager
+def captured_sql():
+    """Compila cada consulta en lugar de ejecutarla (no hay BD en los tests)."""
+    queries = []
+
+    def execute_sql(compiler, *args, **kwargs):
+        sql, params = compiler.as_sql()
+        queries.append(sql)
+        return iter([])
+
+    with mock.patch.object(SQLCompiler, 'execute_sql', execute_sql):
+        yield queries
+
+
+class KeysetPaginationTest(SimpleTestCase):
+    """Tests para cursores multi-columna, el filtro keyset y el modo opt-in."""
+
+    def _request(self, **params):
+        return Request(APIRequestFactory().get('/api/practices/', params))
+
+    def test_cursor_multicolumna_ligado_al_orden(self):
+        """Verificar ida y vuelta del cursor y rechazo con otro ordenamiento."""
+        when = datetime.datetime(2024, 3, 1, 10, 30, tzinfo=datetime.timezone.utc)
+        keys = ['-fecha_aprobacion', '-id']
+        cursor = pagination.encode_cursor(keys, [when, 42])
+        self.assertEqual(pagination.decode_cursor(cursor, keys), ([when.isoformat(), 42], False))
+        with self.assertRaises(NotFound):
+            pagination.decode_cursor(cursor, ['created_at', 'id'])
+        with self.assertRaises(NotFound):
+            pagination.decode_cursor('no-es-un-cursor', keys)
+
+    def test_cursor_manipulado_es_404(self):
+        """Verificar que valores que no convierten al tipo de la columna dan 404, no 500."""
+        paginator = pagination.KeysetPagination()
+        cursor = pagination.encode_cursor(['-fecha_aprobacion', '-id'], ['garbage', 'x'])
+        with captured_sql() as queries, self.assertRaises(NotFound):
+            paginator.paginate_queryset(Document.objects.order_by('-fecha_aprobacion'), self._request(cursor=cursor))
+        self.assertEqual(queries, [])
+
+    def test_filtro_keyset_con_desempate(self):
+        """Verificar columnas + id y la condición (c1, id) < cursor con NULLs al final."""
+        queryset = Document.objects.order_by('-fecha_aprobacion')
+        columns = pagination.resolve_ordering(queryset)
+        self.assertEqual(
+            [(field.name, descending) for field, descending in columns],
+            [('fecha_aprobacion', True), ('id', True)],
+        )
+        condition = pagination.keyset_filter(columns, ['2024-03-01T10:00:00+00:00', 7])
+        sql = str(queryset.filter(condition).query)
+        self.assertIn('"fecha_aprobacion" < ', sql)
+        self.assertIn('"fecha_aprobacion" IS NULL', sql)
+        self.assertIn('"id" < ', sql)
+
+        # Ordenamiento no paginable por keyset: cae en el default
+        columns = pagination.resolve_ordering(Practice.objects.order_by('empresa__nombre'), ['-fecha_creacion'])
+        self.assertEqual(columns[0][0].name, 'fecha_creacion')
+
+    def test_modo_cursor_sin_count(self):
+        """Verificar ?paginate=cursor: una consulta con LIMIT y sin COUNT(*)."""
+        paginator = pagination.PageOrCursorPagination()
+        view = mock.Mock(ordering=['-fecha_creacion'], spec=['ordering'])
+        self.assertFalse(paginator.wants_cursor(self._request(), view))
+
+        with captured_sql() as queries:
+            page = paginator.paginate_queryset(
+                Practice.objects.order_by('-fecha_creacion'), self._request(paginate='cursor'), view,
+            )
+        self.assertEqual(page, [])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0])
+        self.assertIn('LIMIT 21', queries[0])
+        response = paginator.get_paginated_response([])
+        self.assertEqual(list(response.data), ['next', 'previous', 'results'])
+
+        view.pagination_mode = 'cursor'
+        self.assertTrue(paginator.wants_cursor(self._request(), view))
+        self.assertFalse(paginator.wants_cursor(self._request(paginate='page'), view))
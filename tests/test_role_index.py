@@ -0,0 +1,78 @@
+"""
+Tests del índice compilado de permisos por rol.
+"""
+
+from types import MappingProxyType
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from src.infrastructure.security import role_index
+
+
+class RoleIndexTest(SimpleTestCase):
+    """Tests para la compilación de roles y la recarga por versión."""
+
+    def setUp(self):
+        cache.clear()
+        role_index._loaded = False
+        role_index._index = role_index._EMPTY
+        role_index._loaded_at = 0.0
+        self.addCleanup(setattr, role_index, '_loaded', False)
+
+    def test_compilacion_de_permisos(self):
+        """Verificar códigos 'module.action', módulos y el flag all."""
+        entry = role_index.compile_role('COORDINADOR', {'practices': ['view', 'approve'], 'reports': True})
+        self.assertTrue(entry.has_permission('practices.approve'))
+        self.assertFalse(entry.has_permission('practices.delete'))
+        self.assertTrue(entry.has_permission('reports'))
+        self.assertFalse(entry.has_permission('users'))
+        self.assertTrue(role_index.compile_role('ADMINISTRADOR', {'all': True}).has_permission('users.delete'))
+        self.assertEqual(role_index.compile_role('X', None).codes, frozenset())
+
+    def test_recarga_solo_tras_bump(self):
+        """Verificar una carga por proceso y la recarga al subir la versión."""
+        first = MappingProxyType({1: role_index.compile_role('PRACTICANTE', {'practices': ['view']})})
+        second = MappingProxyType({1: role_index.compile_role('PRACTICANTE', {})})
+        with mock.patch.object(role_index, '_load', side_effect=[first, second]) as load:
+            self.assertTrue(role_index.role_has_permission(1, 'practices.view'))
+            role_index._next_check = 0.0
+            self.assertTrue(role_index.role_has_permission(1, 'practices.view'))
+            self.assertEqual(load.call_count, 1)
+
+            role_index.bump_version()
+            self.assertFalse(role_index.role_has_permission(1, 'practices.view'))
+            self.assertEqual(load.call_count, 2)
+            self.assertIsNone(role_index.role_has_permission(99, 'practices.view'))
+
+    def test_sin_bd_mantiene_el_indice(self):
+        """Verificar que un fallo de carga conserva el índice anterior."""
+        index = MappingProxyType({1: role_index.compile_role('SUPERVISOR', {})})
+        with mock.patch.object(role_index, '_load', side_effect=[index, RuntimeError('sin BD')]):
+            role_index.get_role_index()
+            role_index.bump_version()
+            with self.assertLogs(role_index.logger, 'WARNING'):
+                self.assertIs(role_index.get_role_index(), index)
+
+    @mock.patch.object(role_index, 'cache_is_shared', return_value=True)
+    def test_antiguedad_maxima_sin_bump(self, _):
+        """Verificar la recarga por antigüedad aunque la versión no cambie (QuerySet.update)."""
+        first = MappingProxyType({1: role_index.compile_role('PRACTICANTE', {'practices': ['view']})})
+        second = MappingProxyType({1: role_index.compile_role('PRACTICANTE', {})})
+        with mock.patch.object(role_index, '_load', side_effect=[first, second]) as load:
+            self.assertTrue(role_index.role_has_permission(1, 'practices.view'))
+            role_index._next_check = 0.0
+            role_index._loaded_at -= role_index._max_age()
+            self.assertFalse(role_index.role_has_permission(1, 'practices.view'))
+            self.assertEqual(load.call_count, 2)
+
+    @override_settings(ROLE_INDEX_CHECK_INTERVAL=0, ROLE_INDEX_MAX_AGE=3600)
+    def test_cache_local_recarga_en_cada_verificacion(self):
+        """Verificar que con LocMem el bump de otro worker no hace falta para recargar."""
+        self.assertFalse(role_index.cache_is_shared())
+        index = MappingProxyType({1: role_index.compile_role('SUPERVISOR', {})})
+        with mock.patch.object(role_index, '_load', return_value=index) as load:
+            role_index.get_role_index()
+            role_index.get_role_index()
+            self.assertEqual(load.call_count, 2)
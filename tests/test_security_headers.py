@@ -0,0 +1,51 @@
+"""
+Tests de los bundles de headers de seguridad por perfil.
+"""
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from src.infrastructure.middleware.security_headers import SecurityHeadersMiddleware
+
+
+class SecurityHeadersBundleTest(SimpleTestCase):
+    """Tests para la selección de bundle por ruta y tipo de respuesta."""
+
+    def setUp(self):
+        self.middleware = SecurityHeadersMiddleware(lambda request: HttpResponse())
+        self.factory = RequestFactory()
+
+    def _apply(self, path, response):
+        return self.middleware.process_response(self.factory.get(path), response)
+
+    def test_json_sin_headers_de_html(self):
+        """Verificar que las respuestas JSON no llevan headers solo de HTML."""
+        response = self._apply('/api/v2/practices/', JsonResponse({'ok': True}))
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertFalse(response.has_header('X-XSS-Protection'))
+        self.assertFalse(response.has_header('Permissions-Policy'))
+
+    def test_docs_con_politica_completa(self):
+        """Verificar que Scalar recibe la CSP con los CDNs de los visores."""
+        response = self._apply('/api/scalar/', HttpResponse('<html></html>'))
+        csp = response.get('Content-Security-Policy') or response.get('Content-Security-Policy-Report-Only')
+        self.assertIn('https://cdn.jsdelivr.net', csp)
+        self.assertEqual(response['X-XSS-Protection'], '1; mode=block')
+
+    def test_graphiql_usa_el_bundle_html(self):
+        """Verificar que GraphiQL y los visores comparten el bundle HTML."""
+        self.assertEqual(set(self.middleware.bundles), {'html', 'api', 'download'})
+        response = self._apply('/graphql/', HttpResponse('<html></html>'))
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertEqual(response['Permissions-Policy'], self.middleware.bundles['html'].headers['Permissions-Policy'])
+
+    def test_bundle_sobrescribe_headers_existentes(self):
+        """Verificar que el bundle reemplaza un header previo sin duplicarlo."""
+        response = HttpResponse('<html></html>')
+        response['x-frame-options'] = 'SAMEORIGIN'
+        response = self._apply('/admin/', response)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertEqual(
+            [name for name, _ in response.items() if name.lower() == 'x-frame-options'],
+            ['X-Frame-Options'],
+        )
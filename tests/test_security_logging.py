@@ -0,0 +1,55 @@
+"""
+Tests del pipeline de logging de seguridad.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from src.infrastructure.security.log_handlers import AsyncSecurityFileHandler
+from src.infrastructure.security.logging import security_event_logger, security_logger
+
+
+class AsyncSecurityFileHandlerTest(SimpleTestCase):
+    """Tests para el handler asíncrono con formato JSON."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        self.handler = AsyncSecurityFileHandler(self.path)
+        self.handler.setLevel(logging.INFO)
+        self.original = (security_logger.handlers[:], security_logger.level)
+        security_logger.handlers = [self.handler]
+        security_logger.setLevel(logging.INFO)
+        self.addCleanup(self._restore)
+
+    def _restore(self):
+        self.handler.close()
+        security_logger.handlers, level = self.original
+        security_logger.setLevel(level)
+
+    def _lines(self):
+        self.handler.stop()
+        with open(self.path, encoding='utf-8') as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+
+    def test_evento_en_json_con_campos_extra(self):
+        """Verificar que el hilo escritor emite una línea JSON con los campos del evento."""
+        security_event_logger.log_security_event(
+            'permission_denied', 'Acceso denegado', user_id='7',
+            severity='WARNING', extra_data={'ip_address': '10.0.0.1'},
+        )
+        [line] = self._lines()
+        self.assertEqual(line['event_type'], 'permission_denied')
+        self.assertEqual(line['ip_address'], '10.0.0.1')
+        self.assertEqual(line['level'], 'WARNING')
+
+    @override_settings(SECURITY_LOG_SAMPLE_RATES={'jwt_session_created': 0.0})
+    def test_muestreo_descarta_eventos(self):
+        """Verificar que una tasa de muestreo 0 suprime el evento."""
+        security_event_logger.log_security_event('jwt_session_created', 'New JWT session created')
+        self.assertEqual(self._lines(), [])
@@ -0,0 +1,59 @@
+"""
+Tests del canal de tokens JWT por request.
+"""
+
+import contextlib
+import io
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from src.infrastructure.security.token_channel import (
+    apply_token_cookies,
+    publish_clear,
+    publish_tokens,
+    set_access_cookie,
+)
+
+
+class TokenChannelTest(SimpleTestCase):
+    """Tests para la publicación y aplicación de cookies."""
+
+    def setUp(self):
+        self.request = RequestFactory().post('/graphql/')
+        self.access_cookie = settings.SIMPLE_JWT.get('AUTH_COOKIE', 'djgredis_session')
+        self.refresh_cookie = settings.SIMPLE_JWT.get('AUTH_COOKIE_REFRESH', 'djgredis_auth')
+
+    def test_sin_publicacion_no_escribe_cookies(self):
+        """Verificar que sin tokens publicados la respuesta no cambia."""
+        response = HttpResponse('{"data": {}}')
+        self.assertFalse(apply_token_cookies(self.request, response))
+        self.assertEqual(len(response.cookies), 0)
+
+    def test_tokens_publicados_se_aplican_una_vez(self):
+        """Verificar que login publica ambas cookies y no se duplican."""
+        publish_tokens(self.request, access='a.b.c', refresh='d.e.f')
+        response = HttpResponse()
+        self.assertTrue(apply_token_cookies(self.request, response))
+        self.assertEqual(response.cookies[self.access_cookie].value, 'a.b.c')
+        self.assertEqual(response.cookies[self.refresh_cookie].value, 'd.e.f')
+        self.assertFalse(apply_token_cookies(self.request, HttpResponse()))
+
+    def test_logout_limpia_cookies(self):
+        """Verificar que logout expira las cookies JWT."""
+        publish_clear(self.request)
+        response = HttpResponse()
+        apply_token_cookies(self.request, response)
+        self.assertEqual(response.cookies[self.access_cookie]['max-age'], 0)
+
+    def test_cookie_de_access_es_evento_de_seguridad(self):
+        """Verificar el evento 'jwt_cookie_set' en el logger security (sin token ni stdout)."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertLogs('security', level='DEBUG') as logs:
+            set_access_cookie(HttpResponse(), 'a.b.c')
+        self.assertEqual(stdout.getvalue(), '')
+        [record] = logs.records
+        self.assertEqual(record.event_type, 'jwt_cookie_set')
+        self.assertEqual(record.cookie_name, self.access_cookie)
+        self.assertNotIn('a.b.c', repr(record.__dict__))
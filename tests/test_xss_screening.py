@@ -0,0 +1,56 @@
+"""
+Tests del motor de detección XSS.
+"""
+
+from django.test import RequestFactory, SimpleTestCase
+
+from src.infrastructure.security.xss_screening import (
+    find_suspicious,
+    screen_headers,
+    screen_query_params,
+)
+
+
+class FindSuspiciousTest(SimpleTestCase):
+    """Tests para la detección por valor."""
+
+    def test_detecta_patrones_de_ambos_escaneres(self):
+        """Verificar los patrones heredados de los dos middlewares anteriores."""
+        payloads = [
+            '<ScRiPt>alert(1)</script>', '< iframe src=x>', 'JavaScript:void(0)',
+            'vbscript:msgbox', 'data:text/html;base64,AAA', '"><img onerror = x>',
+            'x;eval(atob(y))', 'confirm (1)',
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertIsNotNone(find_suspicious(payload))
+
+    def test_valores_legitimos(self):
+        """Verificar que texto normal no se marca (incluye 'condition=' y 'retrieval(')."""
+        values = [
+            'ingeniería de sistemas', 'condition=1', 'retrieval(x)',
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+            'text/html,application/xhtml+xml;q=0.9', 'https://upeu.edu.pe/a?b=c',
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertIsNone(find_suspicious(value))
+
+    def test_longitud_maxima(self):
+        """Verificar que solo se analizan los primeros max_length caracteres."""
+        value = 'a' * 100 + '<script>'
+        self.assertIsNone(find_suspicious(value, max_length=50))
+        self.assertIsNotNone(find_suspicious(value, max_length=200))
+
+
+class ScreenRequestTest(SimpleTestCase):
+    """Tests para el análisis de headers y parámetros."""
+
+    def test_headers_y_parametros(self):
+        """Verificar que se reportan el header y el parámetro sospechosos."""
+        request = RequestFactory().get(
+            '/api/', {'q': '<svg onload=alert(1)>', 'page': '2'},
+            HTTP_REFERER='javascript:alert(1)',
+        )
+        self.assertEqual(list(screen_headers(request)), ['HTTP_REFERER'])
+        self.assertEqual(list(screen_query_params(request)), ['q'])